@@ -1,5 +1,15 @@
-from hvac.v1 import Client
+"""HashiCorp Vault API client.
+
+The client and its submodules are imported when first accessed, keeping `import hvac` itself cheap.
+"""
+from hvac import utils
 
 __all__ = (
     'Client',
 )
+
+utils.install_lazy_imports(
+    __name__,
+    attributes={'Client': 'hvac.v1.Client'},
+    submodules=['adapters', 'api', 'aws_utils', 'v1'],
+)
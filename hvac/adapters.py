@@ -3,22 +3,39 @@
 HTTP Client Library Adapters
 
 """
+import itertools
+import re
+import threading
+import time
 from abc import ABCMeta, abstractmethod
 
 import requests
+import requests.adapters
 import requests.exceptions
+from urllib3.exceptions import NewConnectionError
 
-from hvac import utils
+from hvac import exceptions, utils
+from hvac.instrumentation import TimedHTTPAdapter
+from hvac.json_codec import get_codec
+from hvac.middleware import RequestContext, build_chain
 
 DEFAULT_BASE_URI = 'http://localhost:8200'
+DEFAULT_POOLSIZE = requests.adapters.DEFAULT_POOLSIZE
+DUPLICATE_SLASHES_RE = re.compile('/{2,}')
 
 
 class Adapter(object):
     """Abstract base class used when constructing adapters for use with the Client class."""
     __metaclass__ = ABCMeta
 
+    # Whether request methods return awaitables rather than responses, see hvac.aio.
+    is_async = False
+
     def __init__(self, base_uri=DEFAULT_BASE_URI, token=None, cert=None, verify=True, timeout=30, proxies=None,
-                 allow_redirects=True, session=None, namespace=None, ignore_exceptions=False):
+                 allow_redirects=True, session=None, namespace=None, ignore_exceptions=False,
+                 pool_connections=DEFAULT_POOLSIZE, pool_maxsize=DEFAULT_POOLSIZE,
+                 pool_block=False, keep_alive_timeout=None, retry_policy=None, circuit_breaker=None,
+                 middleware=None, json_codec=None):
         """Create a new request adapter instance.
 
         :param base_uri: Base URL for the Vault instance being addressed.
@@ -45,10 +62,67 @@ class Adapter(object):
         :param ignore_exceptions: If True, _always_ return the response object for a given request. I.e., don't raise an exception
             based on response status code, etc.
         :type ignore_exceptions: bool
+        :param pool_connections: The number of connection pools (i.e., distinct hosts) to cache. Only applied to
+            sessions created by this adapter.
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of connections to keep open per host. Should be at least the number of
+            threads sharing this adapter to avoid discarding connections. Only applied to sessions created by this
+            adapter.
+        :type pool_maxsize: int
+        :param pool_block: Whether requests should block waiting for a free connection once pool_maxsize connections
+            are in use, rather than opening (and then discarding) additional connections.
+        :type pool_block: bool
+        :param keep_alive_timeout: Optional number of seconds pooled connections may sit idle before being closed
+            rather than reused. Useful when the Vault server or a load balancer drops idle connections.
+        :type keep_alive_timeout: int | float
+        :param retry_policy: Optional policy controlling whether and when failed requests are retried. Requests are not
+            retried if not provided.
+        :type retry_policy: hvac.retry.RetryPolicy
+        :param circuit_breaker: Optional circuit breaker used to fail fast while the Vault server is unreachable. May
+            be shared between adapters.
+        :type circuit_breaker: hvac.circuit_breaker.CircuitBreaker
+        :param middleware: Optional middleware to pass each request through, outermost first.
+        :type middleware: list[hvac.middleware.Middleware]
+        :param json_codec: Codec used to encode request bodies passed via the "json" keyword argument and, for
+            JSONAdapter, to decode responses. Either a hvac.json_codec.JSONCodec instance, the name of a codec ("json",
+            "orjson" or "ujson"), or "auto" to use the fastest one installed. Defaults to the stdlib json module.
+        :type json_codec: hvac.json_codec.JSONCodec | str
         """
         if not session:
             session = requests.Session()
+            for prefix in ('https://', 'http://'):
+                session.mount(prefix, TimedHTTPAdapter(
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    pool_block=pool_block,
+                ))
+
+        self._init_state(
+            base_uri=base_uri,
+            token=token,
+            namespace=namespace,
+            session=session,
+            allow_redirects=allow_redirects,
+            ignore_exceptions=ignore_exceptions,
+            keep_alive_timeout=keep_alive_timeout,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            middleware=middleware,
+            json_codec=json_codec,
+        )
+        self._kwargs = {
+            'cert': cert,
+            'verify': verify,
+            'timeout': timeout,
+            'proxies': proxies,
+        }
+
+    def _init_state(self, base_uri, token, namespace, session, allow_redirects, ignore_exceptions, keep_alive_timeout,
+                    retry_policy, circuit_breaker, middleware, json_codec):
+        """Set the attributes shared by all adapters, regardless of the HTTP library they send requests with.
 
+        See :py:meth:`__init__` for a description of each parameter.
+        """
         self.base_uri = base_uri
         self.token = token
         self.namespace = namespace
@@ -56,12 +130,62 @@ class Adapter(object):
         self.allow_redirects = allow_redirects
         self.ignore_exceptions = ignore_exceptions
 
-        self._kwargs = {
-            'cert': cert,
-            'verify': verify,
-            'timeout': timeout,
-            'proxies': proxies,
-        }
+        self.keep_alive_timeout = keep_alive_timeout
+        self._last_request_time = None
+        self._pool_lock = threading.Lock()
+
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.middleware = []
+        for layer in middleware or []:
+            self.add_middleware(layer)
+        self.json_codec = get_codec(json_codec)
+
+    @property
+    def base_uri(self):
+        return self._base_uri
+
+    @base_uri.setter
+    def base_uri(self, base_uri):
+        self._base_uri = base_uri
+        # Precomputed so requests only need to append their (normalized) path.
+        self._base_url = str(base_uri).strip('/')
+
+    @property
+    def token(self):
+        return self._token
+
+    @token.setter
+    def token(self, token):
+        self._token = token
+        self._static_headers = None
+
+    @property
+    def namespace(self):
+        return self._namespace
+
+    @namespace.setter
+    def namespace(self, namespace):
+        self._namespace = namespace
+        self._static_headers = None
+
+    def get_static_headers(self):
+        """Retrieve the headers sent with every request, built from the adapter's token and namespace.
+
+        The returned dict is cached until the token or namespace change and must not be modified.
+
+        :return: The headers.
+        :rtype: dict
+        """
+        static_headers = self._static_headers
+        if static_headers is None:
+            static_headers = {}
+            if self._token:
+                static_headers['X-Vault-Token'] = self._token
+            if self._namespace:
+                static_headers['X-Vault-Namespace'] = self._namespace
+            self._static_headers = static_headers
+        return static_headers
 
     @staticmethod
     def urljoin(*args):
@@ -80,6 +204,86 @@ class Adapter(object):
         """
         self.session.close()
 
+    def expire_idle_connections(self):
+        """Close idle pooled connections if no request has been sent within the configured keep_alive_timeout.
+
+        Called before each request; a no-op unless keep_alive_timeout is set. Only connections sitting in a pool are
+        closed, connections checked out by requests in flight on other threads are left alone.
+        """
+        if self.keep_alive_timeout is None:
+            return
+        with self._pool_lock:
+            now = time.time()
+            last_request_time, self._last_request_time = self._last_request_time, now
+            if last_request_time is None or now - last_request_time <= self.keep_alive_timeout:
+                return
+            for http_adapter in set(self.session.adapters.values()):
+                pool_manager = getattr(http_adapter, 'poolmanager', None)
+                if pool_manager is None:
+                    continue
+                for pool_key in list(pool_manager.pools.keys()):
+                    pool = pool_manager.pools.get(pool_key)
+                    if pool is None or pool.pool is None:
+                        continue
+                    # Holding the queue's mutex keeps other threads from checking out a connection while it is closed;
+                    # closed connections stay queued and reconnect on their next use.
+                    with pool.pool.mutex:
+                        for conn in pool.pool.queue:
+                            if conn is not None:
+                                conn.close()
+
+    def add_middleware(self, middleware):
+        """Register middleware to pass each subsequent request through, inside of any already registered.
+
+        :param middleware: The middleware to register.
+        :type middleware: hvac.middleware.Middleware
+        """
+        self.middleware.append(middleware)
+
+    def get_middleware(self):
+        """Assemble the middleware requests are passed through.
+
+        :return: The registered middleware followed by the adapter's retry policy and circuit breaker, if set.
+        :rtype: list[hvac.middleware.Middleware]
+        """
+        chain = list(self.middleware)
+        if self.retry_policy is not None:
+            chain.append(self.retry_policy)
+        if self.circuit_breaker is not None:
+            chain.append(self.circuit_breaker)
+        return chain
+
+    def pool_stats(self):
+        """Report the occupancy of the connection pools held by the underlying Requests session.
+
+        :return: Mapping of "scheme://host:port" to a dict with the pool's "maxsize" and its current number of "in_use"
+            and "idle" connections, as well as the total "num_connections" opened and "num_requests" sent through it.
+        :rtype: dict
+        """
+        stats = {}
+        for http_adapter in set(self.session.adapters.values()):
+            pool_manager = getattr(http_adapter, 'poolmanager', None)
+            if pool_manager is None:
+                continue
+            for pool_key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(pool_key)
+                if pool is None or pool.pool is None:
+                    continue
+                queued = list(pool.pool.queue)
+                pool_address = '{scheme}://{host}:{port}'.format(
+                    scheme=pool.scheme,
+                    host=pool.host,
+                    port=pool.port,
+                )
+                stats[pool_address] = {
+                    'maxsize': pool.pool.maxsize,
+                    'in_use': max(pool.pool.maxsize - len(queued), 0),
+                    'idle': sum(1 for conn in queued if conn is not None),
+                    'num_connections': pool.num_connections,
+                    'num_requests': pool.num_requests,
+                }
+        return stats
+
     def get(self, url, **kwargs):
         """Performs a GET request.
 
@@ -232,6 +436,23 @@ class RawAdapter(Adapter):
     but always returns Response objects for requests.
     """
 
+    def send(self, request):
+        """Send a request with the underlying Requests session, bypassing any middleware.
+
+        :param request: The request to send.
+        :type request: hvac.middleware.RequestContext
+        :return: The response of the request.
+        :rtype: requests.Response
+        """
+        self.expire_idle_connections()
+        return self.session.request(
+            method=request.method,
+            url=request.url,
+            headers=request.headers,
+            allow_redirects=self.allow_redirects,
+            **request.kwargs
+        )
+
     def get_login_token(self, response):
         """Extracts the client token from a login response.
 
@@ -256,43 +477,78 @@ class RawAdapter(Adapter):
         :param raise_exception: If True, raise an exception via utils.raise_for_error(). Set this parameter to False to
             bypass this functionality.
         :type raise_exception: bool
-        :param kwargs: Additional keyword arguments to include in the requests call.
+        :param kwargs: Additional keyword arguments to include in the requests call. A "base_uri" keyword argument
+            overrides the instance's base_uri attribute for this request only.
         :type kwargs: dict
         :return: The response of the request.
         :rtype: requests.Response
         """
-        while '//' in url:
+        if '//' in url:
             # Vault CLI treats a double forward slash ('//') as a single forward slash for a given path.
             # To avoid issues with the requests module's redirection logic, we perform the same translation here.
-            url = url.replace('//', '/')
-
-        url = self.urljoin(self.base_uri, url)
-
-        if not headers:
-            headers = {}
+            url = DUPLICATE_SLASHES_RE.sub('/', url)
+        path = url.strip('/')
 
-        if self.token:
-            headers['X-Vault-Token'] = self.token
-
-        if self.namespace:
-            headers['X-Vault-Namespace'] = self.namespace
+        base_uri = kwargs.pop('base_uri', None)
+        if base_uri is None:
+            base_uri = self._base_uri
+            url = self._base_url + '/' + path
+        else:
+            url = str(base_uri).strip('/') + '/' + path
 
         wrap_ttl = kwargs.pop('wrap_ttl', None)
-        if wrap_ttl:
-            headers['X-Vault-Wrap-TTL'] = str(wrap_ttl)
-
-        _kwargs = self._kwargs.copy()
-        _kwargs.update(kwargs)
-
-        response = self.session.request(
-            method=method,
-            url=url,
-            headers=headers,
-            allow_redirects=self.allow_redirects,
-            **_kwargs
-        )
+        idempotent = kwargs.pop('idempotent', False)
+        has_middleware = self.middleware or self.retry_policy is not None or self.circuit_breaker is not None
+
+        json_body = kwargs.pop('json', None)
+        if json_body is not None and kwargs.get('data') is None:
+            kwargs['data'] = self.json_codec.dumps(json_body)
+        else:
+            json_body = None
+
+        # The static headers and default keyword arguments are only copied when they need to be added to, or could
+        # be modified by middleware.
+        static_headers = self.get_static_headers()
+        if headers or wrap_ttl or json_body is not None or has_middleware:
+            headers = dict(headers) if headers else {}
+            headers.update(static_headers)
+            if wrap_ttl:
+                headers['X-Vault-Wrap-TTL'] = str(wrap_ttl)
+            if json_body is not None:
+                headers.setdefault('Content-Type', 'application/json')
+        else:
+            headers = static_headers
+
+        if kwargs or has_middleware:
+            _kwargs = self._kwargs.copy()
+            _kwargs.update(kwargs)
+        else:
+            _kwargs = self._kwargs
+
+        if has_middleware:
+            request = RequestContext(
+                method=method,
+                url=url,
+                path=path,
+                base_uri=base_uri,
+                headers=headers,
+                kwargs=_kwargs,
+                raise_exception=raise_exception,
+                idempotent=idempotent,
+            )
+            response = build_chain(self.get_middleware(), self.send)(request)
+            method, url = request.method, request.url
+        else:
+            self.expire_idle_connections()
+            response = self.session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                allow_redirects=self.allow_redirects,
+                **_kwargs
+            )
 
-        if not response.ok and (raise_exception and not self.ignore_exceptions):
+        if response.status_code >= 400 and (raise_exception and not self.ignore_exceptions):
             text = errors = None
             if response.headers.get('Content-Type') == 'application/json':
                 try:
@@ -336,18 +592,252 @@ class JSONAdapter(RawAdapter):
         :type args: list
         :param kwargs: Keyword arguments to pass to RawAdapter.request.
         :type kwargs: dict
-        :return: Dict on HTTP 200 with JSON body, otherwise the response object.
+        :return: Dict on HTTP 200 with JSON body (unless the request is streamed), otherwise the response object.
         :rtype: dict | requests.Response
         """
         response = super(JSONAdapter, self).request(*args, **kwargs)
-        if response.status_code == 200:
+        if response.status_code == 200 and not kwargs.get('stream'):
+            # Streamed responses (e.g. raft snapshots) are left for the caller to consume.
             try:
-                return response.json()
+                return self.json_codec.loads(response.content)
             except ValueError:
                 pass
 
         return response
 
 
+class HARawAdapter(RawAdapter):
+    """
+    The HARawAdapter adapter class.
+    This adapter works just like the RawAdapter adapter, but spreads requests across the nodes of a Vault HA cluster.
+    The role of each node is discovered via its unauthenticated sys/health endpoint, after which writes are sent
+    directly to the active node (avoiding the extra hop of standby request forwarding) and, if enabled, reads are sent
+    to performance standby nodes. Requests that fail to connect, or that reach a sealed node, are immediately retried
+    against the next candidate node.
+    """
+
+    ACTIVE = 'active'
+    PERFORMANCE_STANDBY = 'performance_standby'
+    STANDBY = 'standby'
+    UNAVAILABLE = 'unavailable'
+
+    HEALTH_STATUS_ROLES = {
+        200: ACTIVE,
+        429: STANDBY,
+        473: PERFORMANCE_STANDBY,
+    }
+    READ_METHODS = frozenset(['GET', 'LIST', 'HEAD'])
+
+    def __init__(self, base_uri=DEFAULT_BASE_URI, nodes=None, read_from_standbys=False, discovery_interval=10,
+                 probe_timeout=2, **kwargs):
+        """Create a new HA request adapter instance.
+
+        :param base_uri: Base URL of the Vault cluster, used as its only node if nodes is not provided.
+        :type base_uri: str
+        :param nodes: Base URLs of each node in the Vault cluster.
+        :type nodes: list[str]
+        :param read_from_standbys: Whether to send GET, LIST and HEAD requests to performance standby nodes. As these
+            nodes replicate writes asynchronously, reads sent shortly after a write may not yet observe it.
+        :type read_from_standbys: bool
+        :param discovery_interval: Number of seconds after which the role of each node is rediscovered.
+        :type discovery_interval: int | float
+        :param probe_timeout: The timeout value for health requests sent while discovering node roles.
+        :type probe_timeout: int | float
+        :param kwargs: Additional parameters to pass to the RawAdapter constructor.
+        :type kwargs: dict
+        """
+        self.nodes = list(nodes or [base_uri])
+        super(HARawAdapter, self).__init__(base_uri=self.nodes[0], **kwargs)
+
+        self.read_from_standbys = read_from_standbys
+        self.discovery_interval = discovery_interval
+        self.probe_timeout = probe_timeout
+
+        self._roles = dict.fromkeys(self.nodes)
+        self._discovered_at = None
+        self._discovery_lock = threading.Lock()
+        self._read_counter = itertools.count()
+
+    @property
+    def roles(self):
+        """The most recently discovered role of each node.
+
+        :return: Mapping of node URL to one of "active", "performance_standby", "standby" or "unavailable", or None if
+            the node's role has not been discovered yet.
+        :rtype: dict
+        """
+        return dict(self._roles)
+
+    def probe_node(self, node):
+        """Discover the role of a single node from its health status.
+
+        :param node: Base URL of the node.
+        :type node: str
+        :return: The node's role.
+        :rtype: str
+        """
+        try:
+            response = self.session.request(
+                method='GET',
+                url=self.urljoin(node, '/v1/sys/health'),
+                timeout=self.probe_timeout,
+                verify=self._kwargs['verify'],
+                cert=self._kwargs['cert'],
+                proxies=self._kwargs['proxies'],
+                allow_redirects=False,
+            )
+        except requests.exceptions.RequestException:
+            return self.UNAVAILABLE
+        response.close()
+        return self.HEALTH_STATUS_ROLES.get(response.status_code, self.UNAVAILABLE)
+
+    def discover(self, block=True):
+        """Discover the role of every node, probing the nodes concurrently.
+
+        :param block: Whether to wait for a discovery already running in another thread rather than returning
+            immediately.
+        :type block: bool
+        :return: The discovered role of each node.
+        :rtype: dict
+        """
+        if not self._discovery_lock.acquire(block):
+            return self.roles
+        try:
+            results = utils.map_concurrently(
+                func=self.probe_node,
+                items=self.nodes,
+                max_workers=len(self.nodes),
+            )
+            self._roles = {
+                node: self.UNAVAILABLE if isinstance(role, Exception) else role
+                for node, role in results.items()
+            }
+            active_nodes = [node for node in self.nodes if self._roles[node] == self.ACTIVE]
+            if active_nodes:
+                self.base_uri = active_nodes[0]
+            self._discovered_at = time.time()
+        finally:
+            self._discovery_lock.release()
+        return self.roles
+
+    def mark_unavailable(self, node):
+        """Record that a node could not serve a request so that it is tried last until the next discovery.
+
+        :param node: Base URL of the node.
+        :type node: str
+        """
+        roles = dict(self._roles)
+        roles[node] = self.UNAVAILABLE
+        self._roles = roles
+        # Rediscover on the next request to learn of any newly elected active node.
+        self._discovered_at = 0
+
+    def get_candidate_nodes(self, method):
+        """Order the cluster's nodes by preference for serving a request.
+
+        :param method: HTTP method of the request.
+        :type method: str
+        :return: Base URLs of every node, most preferred first.
+        :rtype: list[str]
+        """
+        roles = self._roles
+        by_role = {}
+        for node in self.nodes:
+            by_role.setdefault(roles[node], []).append(node)
+
+        preferred_roles = [self.ACTIVE, None, self.PERFORMANCE_STANDBY, self.STANDBY, self.UNAVAILABLE]
+        if self.read_from_standbys and method.upper() in self.READ_METHODS:
+            performance_standbys = by_role.get(self.PERFORMANCE_STANDBY, [])
+            if performance_standbys:
+                # Rotate through performance standbys to share reads between them.
+                offset = next(self._read_counter) % len(performance_standbys)
+                by_role[self.PERFORMANCE_STANDBY] = performance_standbys[offset:] + performance_standbys[:offset]
+            preferred_roles = [self.PERFORMANCE_STANDBY, self.ACTIVE, None, self.STANDBY, self.UNAVAILABLE]
+
+        return [node for role in preferred_roles for node in by_role.get(role, [])]
+
+    def request(self, method, url, headers=None, raise_exception=True, **kwargs):
+        """Send a request to the most suitable node of the cluster, failing over to the remaining nodes.
+
+        :param method: HTTP method to use with the request. E.g., GET, POST, etc.
+        :type method: str
+        :param url: Partial URL path to send the request to.
+        :type url: str | unicode
+        :param headers: Additional headers to include with the request.
+        :type headers: dict
+        :param raise_exception: If True, raise an exception via utils.raise_for_error(). Set this parameter to False to
+            bypass this functionality.
+        :type raise_exception: bool
+        :param kwargs: Additional keyword arguments to include in the requests call.
+        :type kwargs: dict
+        :return: The response of the request.
+        :rtype: requests.Response
+        """
+        if self._discovered_at is None:
+            self.discover()
+        elif time.time() - self._discovered_at >= self.discovery_interval:
+            self.discover(block=False)
+
+        # Only requests that may be safely repeated fail over once a request may have been sent, as a write may have
+        # been applied. Other requests fail over only if the node was never reached.
+        repeatable = method.upper() in self.READ_METHODS or kwargs.get('idempotent')
+        if repeatable:
+            failover_exceptions = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, exceptions.VaultDown)
+        else:
+            failover_exceptions = (requests.exceptions.ConnectTimeout, exceptions.VaultDown)
+
+        # A streamed body has been (partially) consumed by the first attempt, it is only resent if it can be rewound.
+        data = kwargs.get('data')
+        body_position = None
+        body_replayable = True
+        if hasattr(data, 'read') or hasattr(data, '__next__') or hasattr(data, 'next'):
+            try:
+                body_position = data.tell()
+            except (AttributeError, IOError, OSError):
+                body_replayable = False
+
+        candidates = self.get_candidate_nodes(method)
+        for node in candidates:
+            if body_position is not None and node != candidates[0]:
+                data.seek(body_position)
+            try:
+                return super(HARawAdapter, self).request(
+                    method,
+                    url,
+                    headers=dict(headers) if headers else None,
+                    raise_exception=raise_exception,
+                    base_uri=node,
+                    **kwargs
+                )
+            except (requests.exceptions.RequestException, exceptions.VaultDown) as error:
+                if not (isinstance(error, failover_exceptions) or self._is_connect_error(error)):
+                    raise
+                self.mark_unavailable(node)
+                if node == candidates[-1] or not body_replayable:
+                    raise
+
+    @staticmethod
+    def _is_connect_error(error):
+        """Determine whether a request failed while establishing its connection, before anything was sent.
+
+        :param error: The exception raised by Requests.
+        :type error: requests.exceptions.RequestException
+        :return: True if the node could not be connected to.
+        :rtype: bool
+        """
+        if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+            return False
+        reason = getattr(error.args[0], 'reason', error.args[0])
+        return isinstance(reason, NewConnectionError)
+
+
+class HAJSONAdapter(JSONAdapter, HARawAdapter):
+    """
+    The HAJSONAdapter adapter class.
+    This adapter works just like the HARawAdapter adapter except that HTTP 200 responses are returned as JSON dicts.
+    All non-200 responses are returned as Response objects.
+    """
+
+
 # Retaining the legacy name
 Request = RawAdapter
@@ -0,0 +1,471 @@
+# coding=utf-8
+"""
+asyncio Support
+
+Adapters and a client class for using hvac from within an asyncio event loop. Requests are sent with aiohttp, which
+must be installed separately (e.g. `pip install hvac[aiohttp]`).
+
+"""
+import inspect
+import ssl
+
+from hvac import adapters, exceptions, utils
+from hvac.middleware import Middleware, RequestContext
+from hvac.v1 import Client
+
+try:
+    import aiohttp
+    has_aiohttp = True
+except ImportError:
+    has_aiohttp = False
+
+
+async def apply_after_await(awaitable, func):
+    """Await the result of a request and apply a function to it, see :py:func:`hvac.utils.apply_to_response`.
+
+    :param awaitable: The result of an asyncio adapter's request method.
+    :type awaitable: collections.abc.Awaitable
+    :param func: Callable accepting the response. Its return value is awaited in turn if awaitable, e.g. for
+        aiohttp.ClientResponse.json.
+    :type func: callable
+    :return: The value returned by func.
+    :rtype: object
+    """
+    result = func(await awaitable)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class AsyncRawAdapter(adapters.Adapter):
+    """
+    The AsyncRawAdapter adapter class.
+    This adapter mirrors the RawAdapter adapter, but its request methods are coroutines that send requests with an
+    aiohttp session. The bodies of responses are read before they are returned so they may be consumed after the
+    underlying connection has been released back to the pool.
+    """
+    is_async = True
+
+    def __init__(self, base_uri=adapters.DEFAULT_BASE_URI, token=None, cert=None, verify=True, timeout=30,
+                 proxies=None, allow_redirects=True, session=None, namespace=None, ignore_exceptions=False,
+                 pool_connections=adapters.DEFAULT_POOLSIZE, pool_maxsize=adapters.DEFAULT_POOLSIZE, pool_block=False,
+                 keep_alive_timeout=None, middleware=None, json_codec=None):
+        """Create a new asyncio request adapter instance.
+
+        :param base_uri: Base URL for the Vault instance being addressed.
+        :type base_uri: str
+        :param token: Authentication token to include in requests sent to Vault.
+        :type token: str
+        :param cert: Certificates for use in requests sent to the Vault instance. This should be a tuple with the
+            certificate and then key.
+        :type cert: tuple
+        :param verify: Either a boolean to indicate whether TLS verification should be performed when sending requests
+            to Vault, or a string pointing at the CA bundle to use for verification.
+        :type verify: Union[bool,str]
+        :param timeout: The timeout value for requests sent to Vault.
+        :type timeout: int
+        :param proxies: Proxies to use when preforming requests, keyed by URL scheme.
+        :type proxies: dict
+        :param allow_redirects: Whether to follow redirects when sending requests to Vault.
+        :type allow_redirects: bool
+        :param session: Optional session object to use when performing request. If not provided, a session is
+            created on the first request so that it is bound to the running event loop.
+        :type session: aiohttp.ClientSession
+        :param namespace: Optional Vault Namespace.
+        :type namespace: str
+        :param ignore_exceptions: If True, _always_ return the response object for a given request. I.e., don't raise
+            an exception based on response status code, etc.
+        :type ignore_exceptions: bool
+        :param pool_connections: The number of distinct hosts to keep connections open to. Only applied to sessions
+            created by this adapter.
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of connections to open per host. Only applied to sessions created by
+            this adapter.
+        :type pool_maxsize: int
+        :param pool_block: Accepted for parity with :py:class:`hvac.adapters.Adapter`; aiohttp always waits for a
+            free connection once the pool is exhausted.
+        :type pool_block: bool
+        :param keep_alive_timeout: Optional number of seconds pooled connections may sit idle before being closed.
+            aiohttp's default is used if not provided.
+        :type keep_alive_timeout: int | float
+        :param middleware: Optional middleware to pass each request through, outermost first. Only middleware
+            implementing the before_request, after_response and on_error hooks is supported, see
+            :py:meth:`add_middleware`.
+        :type middleware: list[hvac.middleware.Middleware]
+        :param json_codec: Codec used to encode request bodies passed via the "json" keyword argument and, for
+            AsyncJSONAdapter, to decode responses. Accepts the same values as :py:class:`hvac.adapters.Adapter`.
+        :type json_codec: hvac.json_codec.JSONCodec | str
+        """
+        if not has_aiohttp:
+            raise ImportError('aiohttp is required to use {cls}'.format(cls=self.__class__.__name__))
+
+        # Retries and circuit breaking block the calling thread and so are not supported by this adapter.
+        self._init_state(
+            base_uri=base_uri,
+            token=token,
+            namespace=namespace,
+            session=session,
+            allow_redirects=allow_redirects,
+            ignore_exceptions=ignore_exceptions,
+            keep_alive_timeout=keep_alive_timeout,
+            retry_policy=None,
+            circuit_breaker=None,
+            middleware=middleware,
+            json_codec=json_codec,
+        )
+        self._kwargs = {
+            'ssl': self.build_ssl_context(cert=cert, verify=verify),
+            'timeout': aiohttp.ClientTimeout(total=timeout),
+        }
+        self._proxies = proxies or {}
+        self._connector_kwargs = {
+            'limit': pool_connections * pool_maxsize,
+            'limit_per_host': pool_maxsize,
+        }
+        if keep_alive_timeout is not None:
+            self._connector_kwargs['keepalive_timeout'] = keep_alive_timeout
+
+    @staticmethod
+    def build_ssl_context(cert=None, verify=True):
+        """Translate requests-style "cert" and "verify" arguments into a value for aiohttp's "ssl" argument.
+
+        :param cert: Client certificate and key tuple.
+        :type cert: tuple
+        :param verify: TLS verification flag or path to a CA bundle.
+        :type verify: Union[bool,str]
+        :return: An SSL context, False to disable verification, or None to use aiohttp's defaults.
+        :rtype: ssl.SSLContext | bool | None
+        """
+        if verify is False and not cert:
+            return False
+        if verify is True and not cert:
+            return None
+        cafile = verify if isinstance(verify, str) else None
+        context = ssl.create_default_context(cafile=cafile)
+        if verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if cert:
+            context.load_cert_chain(*cert)
+        return context
+
+    @staticmethod
+    def normalize_params(params):
+        """Convert query parameters into values accepted by aiohttp.
+
+        requests silently drops None values and stringifies booleans, while aiohttp rejects both.
+
+        :param params: Query parameters for a request.
+        :type params: dict
+        :return: Query parameters with None values removed and booleans converted to "true" / "false".
+        :rtype: dict
+        """
+        return {
+            key: str(value).lower() if isinstance(value, bool) else value
+            for key, value in utils.remove_nones(params).items()
+        }
+
+    def add_middleware(self, middleware):
+        """Register middleware to pass each subsequent request through, inside of any already registered.
+
+        The middleware's before_request, after_response and on_error hooks are called around each request as with
+        :py:class:`hvac.adapters.Adapter`, with responses being aiohttp.ClientResponse objects. Middleware overriding
+        :py:meth:`hvac.middleware.Middleware.handle`, such as :py:class:`hvac.retry.RetryPolicy` or
+        :py:class:`hvac.circuit_breaker.CircuitBreaker`, sends requests synchronously and is rejected.
+
+        :param middleware: The middleware to register.
+        :type middleware: hvac.middleware.Middleware
+        """
+        if type(middleware).handle is not Middleware.handle:
+            raise exceptions.ParamValidationError('{middleware} overrides handle and is not supported by {cls}'.format(
+                middleware=type(middleware).__name__,
+                cls=self.__class__.__name__,
+            ))
+        self.middleware.append(middleware)
+
+    def expire_idle_connections(self):
+        """No-op; aiohttp closes connections that have been idle for keep_alive_timeout seconds itself."""
+
+    def pool_stats(self):
+        """Report the occupancy of the connection pool held by the underlying aiohttp session.
+
+        :return: Mapping of "scheme://host:port" to a dict with the pool's "maxsize" and its current number of "in_use"
+            and "idle" connections. "num_connections" and "num_requests" are always None as aiohttp does not track them.
+        :rtype: dict
+        """
+        connector = getattr(self.session, 'connector', None)
+        if connector is None:
+            return {}
+        idle = getattr(connector, '_conns', {})
+        in_use = getattr(connector, '_acquired_per_host', {})
+        stats = {}
+        for key in set(idle) | set(in_use):
+            pool_address = '{scheme}://{host}:{port}'.format(
+                scheme='https' if key.is_ssl else 'http',
+                host=key.host,
+                port=key.port,
+            )
+            stats[pool_address] = {
+                'maxsize': connector.limit_per_host or connector.limit,
+                'in_use': len(in_use.get(key, ())),
+                'idle': len(idle.get(key, ())),
+                'num_connections': None,
+                'num_requests': None,
+            }
+        return stats
+
+    async def close(self):
+        """Close the underlying aiohttp session.
+        """
+        if self.session is not None:
+            await self.session.close()
+
+    async def login(self, url, use_token=True, **kwargs):
+        """Perform a login request.
+
+        :param url: Path to send the authentication request to.
+        :type url: str | unicode
+        :param use_token: if True, uses the token in the response received from the auth request to set the "token"
+            attribute on the the adapter instance.
+        :type use_token: bool
+        :param kwargs: Additional keyword arguments to include in the params sent with the request.
+        :type kwargs: dict
+        :return: The response of the auth request.
+        :rtype: aiohttp.ClientResponse | dict
+        """
+        response = await self.post(url, **kwargs)
+
+        if use_token:
+            self.token = await self.get_login_token(response)
+
+        return response
+
+    async def get_login_token(self, response):
+        """Extracts the client token from a login response.
+
+        :param response: The response object returned by the login method.
+        :type response: aiohttp.ClientResponse
+        :return: A client token.
+        :rtype: str
+        """
+        response_json = await response.json()
+        return response_json['auth']['client_token']
+
+    async def send(self, request):
+        """Send a request with the underlying aiohttp session, bypassing any middleware.
+
+        :param request: The request to send.
+        :type request: hvac.middleware.RequestContext
+        :return: The response of the request, with its body already read.
+        :rtype: aiohttp.ClientResponse
+        """
+        if self.session is None:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(**self._connector_kwargs))
+
+        async with self.session.request(
+            method=request.method.upper(),
+            url=request.url,
+            headers=request.headers,
+            allow_redirects=self.allow_redirects,
+            **request.kwargs
+        ) as response:
+            await response.read()
+        return response
+
+    async def _handle(self, middleware, request):
+        # Mirrors Middleware.handle, awaiting the rest of the chain in place of calling it.
+        if not middleware:
+            return await self.send(request)
+        layer = middleware[0]
+        response = layer.before_request(request)
+        if response is None:
+            try:
+                response = await self._handle(middleware[1:], request)
+            except Exception as error:
+                response = layer.on_error(request, error)
+                if response is None:
+                    raise
+        return layer.after_response(request, response)
+
+    async def request(self, method, url, headers=None, raise_exception=True, **kwargs):
+        """Main method for routing HTTP requests to the configured Vault base_uri.
+
+        :param method: HTTP method to use with the request. E.g., GET, POST, etc.
+        :type method: str
+        :param url: Partial URL path to send the request to. This will be joined to the end of the instance's base_uri
+            attribute.
+        :type url: str | unicode
+        :param headers: Additional headers to include with the request.
+        :type headers: dict
+        :param raise_exception: If True, raise an exception via utils.raise_for_error(). Set this parameter to False to
+            bypass this functionality.
+        :type raise_exception: bool
+        :param kwargs: Additional keyword arguments to include in the aiohttp call.
+        :type kwargs: dict
+        :return: The response of the request.
+        :rtype: aiohttp.ClientResponse
+        """
+        while '//' in url:
+            # Vault CLI treats a double forward slash ('//') as a single forward slash for a given path.
+            url = url.replace('//', '/')
+
+        path = url.strip('/')
+        url = self.urljoin(self.base_uri, url)
+
+        if not headers:
+            headers = {}
+
+        if self.token:
+            headers['X-Vault-Token'] = self.token
+
+        if self.namespace:
+            headers['X-Vault-Namespace'] = self.namespace
+
+        wrap_ttl = kwargs.pop('wrap_ttl', None)
+        idempotent = kwargs.pop('idempotent', False)
+        if wrap_ttl:
+            headers['X-Vault-Wrap-TTL'] = str(wrap_ttl)
+
+        # aiohttp responses are always streamed; the body is read in full below.
+        kwargs.pop('stream', None)
+        json_body = kwargs.pop('json', None)
+        if json_body is not None:
+            kwargs['data'] = self.json_codec.dumps(json_body)
+            headers.setdefault('Content-Type', 'application/json')
+        if kwargs.get('params'):
+            kwargs['params'] = self.normalize_params(kwargs['params'])
+
+        _kwargs = self._kwargs.copy()
+        _kwargs.update(kwargs)
+
+        proxy = self._proxies.get(url.split(':', 1)[0])
+        if proxy:
+            _kwargs.setdefault('proxy', proxy)
+
+        request = RequestContext(
+            method=method,
+            url=url,
+            path=path,
+            base_uri=self.base_uri,
+            headers=headers,
+            kwargs=_kwargs,
+            raise_exception=raise_exception,
+            idempotent=idempotent,
+        )
+        response = await self._handle(self.get_middleware(), request)
+        method, url = request.method, request.url
+
+        if response.status >= 400 and (raise_exception and not self.ignore_exceptions):
+            text = errors = None
+            if response.content_type == 'application/json':
+                try:
+                    errors = (await response.json()).get('errors')
+                except Exception:
+                    pass
+            if errors is None:
+                text = await response.text()
+            utils.raise_for_error(
+                method,
+                url,
+                response.status,
+                text,
+                errors=errors
+            )
+
+        return response
+
+
+class AsyncJSONAdapter(AsyncRawAdapter):
+    """
+    The AsyncJSONAdapter adapter class.
+    This adapter works just like the AsyncRawAdapter adapter except that HTTP 200 responses are returned as JSON dicts.
+    All non-200 responses are returned as aiohttp.ClientResponse objects.
+    """
+
+    async def get_login_token(self, response):
+        """Extracts the client token from a login response.
+
+        :param response: The response object returned by the login method.
+        :type response: dict | aiohttp.ClientResponse
+        :return: A client token.
+        :rtype: str
+        """
+        return response['auth']['client_token']
+
+    async def request(self, *args, **kwargs):
+        """Main method for routing HTTP requests to the configured Vault base_uri.
+
+        :param args: Positional arguments to pass to AsyncRawAdapter.request.
+        :type args: list
+        :param kwargs: Keyword arguments to pass to AsyncRawAdapter.request.
+        :type kwargs: dict
+        :return: Dict on HTTP 200 with JSON body, otherwise the response object.
+        :rtype: dict | aiohttp.ClientResponse
+        """
+        response = await super(AsyncJSONAdapter, self).request(*args, **kwargs)
+        if response.status == 200:
+            try:
+                return await response.json(content_type=None, loads=self.json_codec.loads)
+            except ValueError:
+                pass
+
+        return response
+
+
+class AsyncClient(Client):
+    """The hvac Client class for use within an asyncio event loop.
+
+    Methods exposed under the auth, secrets and sys attributes return coroutines when used with this class, e.g.:
+    ``await client.secrets.kv.v2.read_secret_version(path='hvac')``, including those processing the response before
+    returning it (e.g. :py:meth:`hvac.api.auth_methods.Aws.read_config` or
+    :py:meth:`hvac.api.SystemBackend.is_sealed`).
+
+    Methods sending several requests, each depending on the result of the last, raise NotImplementedError:
+
+    * :py:meth:`hvac.api.secrets_engines.KvV1.read_secrets` and :py:meth:`hvac.api.secrets_engines.KvV1.walk`
+    * :py:meth:`hvac.api.secrets_engines.KvV1.create_or_update_secret` unless its method argument is provided
+    * :py:meth:`hvac.api.secrets_engines.KvV2.read_secrets`, :py:meth:`hvac.api.secrets_engines.KvV2.walk` and
+      :py:meth:`hvac.api.secrets_engines.KvV2.patch`
+    * :py:meth:`hvac.api.SystemBackend.submit_unseal_keys`, :py:meth:`hvac.api.SystemBackend.rekey_multi` and
+      :py:meth:`hvac.api.SystemBackend.rekey_verify_multi`
+    * :py:meth:`hvac.api.SystemBackend.save_raft_snapshot` and :py:meth:`hvac.api.SystemBackend.restore_raft_snapshot_from`
+
+    The legacy methods defined directly on :py:class:`hvac.v1.Client` (such as ``is_authenticated``) are not supported.
+    """
+
+    def __init__(self, url=None, token=None, cert=None, verify=True, timeout=30, proxies=None,
+                 allow_redirects=True, session=None, adapter=AsyncJSONAdapter, namespace=None,
+                 pool_connections=adapters.DEFAULT_POOLSIZE, pool_maxsize=adapters.DEFAULT_POOLSIZE, pool_block=False,
+                 keep_alive_timeout=None, **kwargs):
+        """Creates a new hvac asyncio client instance.
+
+        Accepts the same arguments as :py:class:`hvac.v1.Client`, but defaults to the
+        :py:class:`hvac.aio.AsyncJSONAdapter` adapter class.
+        """
+        super(AsyncClient, self).__init__(
+            url=url,
+            token=token,
+            cert=cert,
+            verify=verify,
+            timeout=timeout,
+            proxies=proxies,
+            allow_redirects=allow_redirects,
+            session=session,
+            adapter=adapter,
+            namespace=namespace,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive_timeout=keep_alive_timeout,
+            **kwargs
+        )
+
+    async def close(self):
+        """Close the underlying adapter's session."""
+        await self._adapter.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -1,19 +1,11 @@
-"""Collection of classes for various Vault auth methods."""
+"""Collection of classes for various Vault auth methods.
+
+The modules implementing each auth method are only imported when their class is first accessed.
+"""
 
 import warnings
 
-from hvac.api.auth_methods.azure import Azure
-from hvac.api.auth_methods.gcp import Gcp
-from hvac.api.auth_methods.github import Github
-from hvac.api.auth_methods.jwt import JWT
-from hvac.api.auth_methods.kubernetes import Kubernetes
-from hvac.api.auth_methods.ldap import Ldap
-from hvac.api.auth_methods.userpass import Userpass
-from hvac.api.auth_methods.mfa import Mfa
-from hvac.api.auth_methods.oidc import OIDC
-from hvac.api.auth_methods.okta import Okta
-from hvac.api.auth_methods.radius import Radius
-from hvac.api.auth_methods.aws import Aws
+from hvac import utils
 from hvac.api.vault_api_category import VaultApiCategory
 from hvac.utils import generate_method_deprecation_message
 
@@ -36,19 +28,19 @@ __all__ = (
 
 class AuthMethods(VaultApiCategory):
     """Auth Methods."""
-    implemented_classes = [
-        Azure,
-        Github,
-        Gcp,
-        JWT,
-        Kubernetes,
-        Ldap,
-        Userpass,
-        Mfa,
-        OIDC,
-        Okta,
-        Radius,
-        Aws,
+    implemented_class_paths = [
+        'hvac.api.auth_methods.azure.Azure',
+        'hvac.api.auth_methods.github.Github',
+        'hvac.api.auth_methods.gcp.Gcp',
+        'hvac.api.auth_methods.jwt.JWT',
+        'hvac.api.auth_methods.kubernetes.Kubernetes',
+        'hvac.api.auth_methods.ldap.Ldap',
+        'hvac.api.auth_methods.userpass.Userpass',
+        'hvac.api.auth_methods.mfa.Mfa',
+        'hvac.api.auth_methods.oidc.OIDC',
+        'hvac.api.auth_methods.okta.Okta',
+        'hvac.api.auth_methods.radius.Radius',
+        'hvac.api.auth_methods.aws.Aws',
     ]
     unimplemented_classes = [
         'AppId',
@@ -79,3 +71,8 @@ class AuthMethods(VaultApiCategory):
         warnings.simplefilter('default', DeprecationWarning)
 
         return self._adapter.login(*args, **kwargs)
+
+
+utils.install_lazy_imports(__name__, attributes={
+    path.rsplit('.', 1)[1]: path for path in AuthMethods.implemented_class_paths
+})
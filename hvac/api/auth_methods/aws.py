@@ -95,7 +95,7 @@ class Aws(VaultApiBase):
         response = self._adapter.get(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_config(self, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Delete previously configured AWS access credentials,
@@ -178,7 +178,7 @@ class Aws(VaultApiBase):
         response = self._adapter.get(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def create_certificate_configuration(self, cert_name, aws_public_cert, document_type=None, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Register AWS public key to be used to verify the instance identity documents.
@@ -233,7 +233,7 @@ class Aws(VaultApiBase):
         response = self._adapter.get(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_certificate_configuration(self, cert_name, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Remove previously configured AWS public key.
@@ -268,7 +268,7 @@ class Aws(VaultApiBase):
         response = self._adapter.list(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def create_sts_role(self, account_id, sts_role, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Allow the explicit association of STS roles to satellite AWS accounts (i.e. those which are not the
@@ -315,7 +315,7 @@ class Aws(VaultApiBase):
         response = self._adapter.get(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def list_sts_roles(self, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """List AWS Account IDs for which an STS role is registered.
@@ -329,7 +329,7 @@ class Aws(VaultApiBase):
         response = self._adapter.list(
             url=api_path
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_sts_role(self, account_id, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Delete a previously configured AWS account/STS role association.
@@ -381,7 +381,7 @@ class Aws(VaultApiBase):
         response = self._adapter.get(
             url=api_path
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_identity_whitelist_tidy(self, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Delete previously configured periodic whitelist tidying settings.
@@ -432,7 +432,7 @@ class Aws(VaultApiBase):
         response = self._adapter.get(
             url=api_path
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_role_tag_blacklist_tidy(self, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Delete previously configured periodic blacklist tidying settings.
@@ -528,7 +528,7 @@ class Aws(VaultApiBase):
         response = self._adapter.get(
             url=api_path
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def list_roles(self, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Lists all the roles that are registered with the method
@@ -542,7 +542,7 @@ class Aws(VaultApiBase):
         response = self._adapter.list(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_role(self, role, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Deletes the previously registered role
@@ -716,7 +716,7 @@ class Aws(VaultApiBase):
         response = self._adapter.get(
             url=api_path
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def list_blacklist_tags(self, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Lists all the role tags that are blacklisted
@@ -730,7 +730,7 @@ class Aws(VaultApiBase):
         response = self._adapter.list(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_blacklist_tags(self, role_tag, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Deletes a blacklisted role tag
@@ -777,7 +777,7 @@ class Aws(VaultApiBase):
         response = self._adapter.get(
             url=api_path
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def list_identity_whitelist(self, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Lists all the instance IDs that are in the whitelist of successful logins
@@ -791,7 +791,7 @@ class Aws(VaultApiBase):
         response = self._adapter.list(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_identity_whitelist_entries(self, instance_id, mount_point=AWS_DEFAULT_MOUNT_POINT):
         """Deletes a cache of the successful login from an instance
@@ -81,7 +81,7 @@ class Azure(VaultApiBase):
         response = self._adapter.get(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_config(self, mount_point=DEFAULT_MOUNT_POINT):
         """Delete the previously configured Azure config and credentials.
@@ -194,7 +194,7 @@ class Azure(VaultApiBase):
         response = self._adapter.get(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def list_roles(self, mount_point=DEFAULT_MOUNT_POINT):
         """List all the roles that are registered with the plugin.
@@ -212,7 +212,7 @@ class Azure(VaultApiBase):
         response = self._adapter.list(
             url=api_path
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_role(self, name, mount_point=DEFAULT_MOUNT_POINT):
         """Delete the previously registered role.
@@ -67,7 +67,7 @@ class Gcp(VaultApiBase):
         response = self._adapter.get(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_config(self, mount_point=DEFAULT_MOUNT_POINT):
         """Delete all GCP configuration data. This operation is idempotent.
@@ -334,7 +334,7 @@ class Gcp(VaultApiBase):
             url=api_path,
             json=params,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def list_roles(self, mount_point=DEFAULT_MOUNT_POINT):
         """List all the roles that are registered with the plugin.
@@ -352,7 +352,7 @@ class Gcp(VaultApiBase):
         response = self._adapter.list(
             url=api_path,
         )
-        return response.get('data')
+        return utils.apply_to_response(response, lambda response: response.get('data'))
 
     def delete_role(self, role, mount_point=DEFAULT_MOUNT_POINT):
         """Delete the previously registered role.
@@ -1,18 +1,8 @@
-"""Vault secrets engines endpoints"""
-from hvac.api.secrets_engines.active_directory import ActiveDirectory
-from hvac.api.secrets_engines.aws import Aws
-from hvac.api.secrets_engines.azure import Azure
-from hvac.api.secrets_engines.consul import Consul
-from hvac.api.secrets_engines.database import Database
-from hvac.api.secrets_engines.gcp import Gcp
-from hvac.api.secrets_engines.identity import Identity
-from hvac.api.secrets_engines.kv import Kv
-from hvac.api.secrets_engines.kv_v1 import KvV1
-from hvac.api.secrets_engines.kv_v2 import KvV2
-from hvac.api.secrets_engines.pki import Pki
-from hvac.api.secrets_engines.rabbitmq import RabbitMQ
-from hvac.api.secrets_engines.transform import Transform
-from hvac.api.secrets_engines.transit import Transit
+"""Vault secrets engines endpoints
+
+The modules implementing each secrets engine are only imported when their class is first accessed.
+"""
+from hvac import utils
 from hvac.api.vault_api_category import VaultApiCategory
 
 __all__ = (
@@ -36,19 +26,19 @@ __all__ = (
 class SecretsEngines(VaultApiCategory):
     """Secrets Engines."""
 
-    implemented_classes = [
-        Aws,
-        Azure,
-        Gcp,
-        ActiveDirectory,
-        Identity,
-        Kv,
-        Pki,
-        Transform,
-        Transit,
-        Database,
-        Consul,
-        RabbitMQ,
+    implemented_class_paths = [
+        'hvac.api.secrets_engines.aws.Aws',
+        'hvac.api.secrets_engines.azure.Azure',
+        'hvac.api.secrets_engines.gcp.Gcp',
+        'hvac.api.secrets_engines.active_directory.ActiveDirectory',
+        'hvac.api.secrets_engines.identity.Identity',
+        'hvac.api.secrets_engines.kv.Kv',
+        'hvac.api.secrets_engines.pki.Pki',
+        'hvac.api.secrets_engines.transform.Transform',
+        'hvac.api.secrets_engines.transit.Transit',
+        'hvac.api.secrets_engines.database.Database',
+        'hvac.api.secrets_engines.consul.Consul',
+        'hvac.api.secrets_engines.rabbitmq.RabbitMQ',
     ]
     unimplemented_classes = [
         'AliCloud',
@@ -63,3 +53,11 @@ class SecretsEngines(VaultApiCategory):
         'MySql',
         'PostgreSql',
     ]
+
+
+_lazy_attributes = {path.rsplit('.', 1)[1]: path for path in SecretsEngines.implemented_class_paths}
+_lazy_attributes.update(
+    KvV1='hvac.api.secrets_engines.kv_v1.KvV1',
+    KvV2='hvac.api.secrets_engines.kv_v2.KvV2',
+)
+utils.install_lazy_imports(__name__, attributes=_lazy_attributes)
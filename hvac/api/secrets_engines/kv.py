@@ -27,8 +27,29 @@ class Kv(VaultApiBase):
         super(Kv, self).__init__(adapter=adapter)
         self._default_kv_version = default_kv_version
 
-        self._kv_v1 = kv_v1.KvV1(adapter=self._adapter)
-        self._kv_v2 = kv_v2.KvV2(adapter=self._adapter)
+        self._kv_v1 = None
+        self._kv_v2 = None
+
+    @property
+    def adapter(self):
+        """Retrieve the adapter instance under the "_adapter" property in use by this class.
+
+        :return: The adapter instance in use by this class.
+        :rtype: hvac.adapters.Adapter
+        """
+        return self._adapter
+
+    @adapter.setter
+    def adapter(self, adapter):
+        """Sets the adapter instance under the "_adapter" property in use by this class and its KvV1/KvV2 instances.
+
+        :param adapter: New adapter instance to set for this class.
+        :type adapter: hvac.adapters.Adapter
+        """
+        self._adapter = adapter
+        for kv_instance in (self._kv_v1, self._kv_v2):
+            if kv_instance is not None:
+                kv_instance.adapter = adapter
 
     @property
     def v1(self):
@@ -37,6 +58,8 @@ class Kv(VaultApiBase):
         :return: This Kv instance's associated KvV1 instance.
         :rtype: hvac.api.secrets_engines.kv_v1.KvV1
         """
+        if self._kv_v1 is None:
+            self._kv_v1 = kv_v1.KvV1(adapter=self._adapter)
         return self._kv_v1
 
     @property
@@ -46,6 +69,8 @@ class Kv(VaultApiBase):
         :return: This Kv instance's associated KvV2 instance.
         :rtype: hvac.api.secrets_engines.kv_v2.KvV2
         """
+        if self._kv_v2 is None:
+            self._kv_v2 = kv_v2.KvV2(adapter=self._adapter)
         return self._kv_v2
 
     @property
@@ -71,8 +96,8 @@ class Kv(VaultApiBase):
         :rtype: hvac.api.vault_api_base.VaultApiBase
         """
         if self.default_kv_version == '1':
-            return getattr(self._kv_v1, item)
+            return getattr(self.v1, item)
         elif self.default_kv_version == '2':
-            return getattr(self._kv_v2, item)
+            return getattr(self.v2, item)
 
         raise AttributeError
@@ -13,6 +13,22 @@ class KvV1(VaultApiBase):
     Reference: https://www.vaultproject.io/api/secrets/kv/kv-v1.html
     """
 
+    def __init__(self, adapter, cache=None):
+        """Create a new KvV1 instance.
+
+        :param adapter: Instance of :py:class:`hvac.adapters.Adapter`; used for performing HTTP requests.
+        :type adapter: hvac.adapters.Adapter
+        :param cache: Optional cache used to serve repeated read_secret calls. Entries are retained for the cache's
+            default_ttl and invalidated by any write or delete of the same path through this instance.
+        :type cache: hvac.cache.TTLCache
+        """
+        super(KvV1, self).__init__(adapter=adapter)
+        self.cache = cache
+
+    @staticmethod
+    def _cache_key(path, mount_point):
+        return utils.normalize_path(mount_point), utils.normalize_path(path)
+
     def read_secret(self, path, mount_point=DEFAULT_MOUNT_POINT):
         """Retrieve the secret at the specified location.
 
@@ -27,10 +43,69 @@ class KvV1(VaultApiBase):
         :return: The JSON response of the read_secret request.
         :rtype: dict
         """
+        cache_key = self._cache_key(path=path, mount_point=mount_point)
+        if self.cache is not None:
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                return cached_response
+            generation = self.cache.generation
+
         api_path = utils.format_url('/v1/{mount_point}/{path}', mount_point=mount_point, path=path)
-        return self._adapter.get(
+        response = self._adapter.get(
             url=api_path,
         )
+        if self.cache is not None and isinstance(response, dict):
+            # The response's lease_duration is only a refresh hint (32 days by default), not an expiry.
+            self.cache.set(cache_key, response, generation=generation)
+        return response
+
+    @utils.synchronous_only
+    def read_secrets(self, paths, mount_point=DEFAULT_MOUNT_POINT, max_workers=utils.DEFAULT_MAX_WORKERS):
+        """Retrieve many secrets concurrently.
+
+        Each path is read via :py:meth:`read_secret` on a bounded pool of worker threads sharing this instance's
+        adapter. The adapter's pool_maxsize should be at least max_workers to allow connections to be reused.
+
+        :param paths: The paths of the secrets to read.
+        :type paths: list
+        :param mount_point: The "path" the secret engine was mounted on.
+        :type mount_point: str | unicode
+        :param max_workers: The maximum number of requests to have in flight at once.
+        :type max_workers: int
+        :return: Mapping of each path to the JSON response of its read, or the exception raised when reading it.
+        :rtype: dict
+        """
+        return utils.map_concurrently(
+            func=lambda path: self.read_secret(path=path, mount_point=mount_point),
+            items=paths,
+            max_workers=max_workers,
+        )
+
+    @utils.synchronous_only
+    def walk(self, path='', mount_point=DEFAULT_MOUNT_POINT, max_depth=None, max_workers=utils.DEFAULT_MAX_WORKERS):
+        """Recursively list the key names under the specified location.
+
+        Folders (keys suffixed with /) are descended into via :py:meth:`list_secrets`, with sibling folders listed in
+        parallel on a bounded pool of worker threads. Results are yielded as each folder is listed rather than
+        collected up front, so arbitrarily large trees may be walked in constant memory.
+
+        :param path: Specifies the folder to start walking from. Defaults to the root of the mount.
+        :type path: str | unicode
+        :param mount_point: The "path" the secret engine was mounted on.
+        :type mount_point: str | unicode
+        :param max_depth: Optional number of folder levels below path to descend. 0 lists path only.
+        :type max_depth: int
+        :param max_workers: The maximum number of list requests to have in flight at once.
+        :type max_workers: int
+        :return: Generator of (folder path, keys) tuples, one per folder listed. Folder paths end with /.
+        :rtype: collections.abc.Iterator[tuple]
+        """
+        return utils.walk_concurrently(
+            list_keys=lambda folder: self.list_secrets(path=folder, mount_point=mount_point)['data']['keys'],
+            path=path,
+            max_depth=max_depth,
+            max_workers=max_workers,
+        )
 
     def list_secrets(self, path, mount_point=DEFAULT_MOUNT_POINT):
         """Return a list of key names at the specified location.
@@ -81,6 +156,8 @@ class KvV1(VaultApiBase):
         :rtype: requests.Response
         """
         if method is None:
+            if getattr(self._adapter, 'is_async', False) is True:
+                raise NotImplementedError('method must be provided to create_or_update_secret with asyncio adapters')
             # If no method was selected by the caller, use the result of a `read_secret()` call to determine if we need
             # to perform an update (PUT) or creation (POST) request.
             try:
@@ -94,14 +171,14 @@ class KvV1(VaultApiBase):
 
         if method == 'POST':
             api_path = utils.format_url('/v1/{mount_point}/{path}', mount_point=mount_point, path=path)
-            return self._adapter.post(
+            response = self._adapter.post(
                 url=api_path,
                 json=secret,
             )
 
         elif method == 'PUT':
             api_path = utils.format_url('/v1/{mount_point}/{path}', mount_point=mount_point, path=path)
-            return self._adapter.post(
+            response = self._adapter.post(
                 url=api_path,
                 json=secret,
             )
@@ -110,6 +187,10 @@ class KvV1(VaultApiBase):
             error_message = '"method" parameter provided invalid value; POST or PUT allowed, "{method}" provided'.format(method=method)
             raise exceptions.ParamValidationError(error_message)
 
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_key(path=path, mount_point=mount_point))
+        return response
+
     def delete_secret(self, path, mount_point=DEFAULT_MOUNT_POINT):
         """Delete the secret at the specified location.
 
@@ -126,6 +207,9 @@ class KvV1(VaultApiBase):
         :rtype: requests.Response
         """
         api_path = utils.format_url('/v1/{mount_point}/{path}', mount_point=mount_point, path=path)
-        return self._adapter.delete(
+        response = self._adapter.delete(
             url=api_path,
         )
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_key(path=path, mount_point=mount_point))
+        return response
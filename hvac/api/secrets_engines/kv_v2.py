@@ -13,6 +13,27 @@ class KvV2(VaultApiBase):
     Reference: https://www.vaultproject.io/api/secret/kv/kv-v2.html
     """
 
+    def __init__(self, adapter, cache=None):
+        """Create a new KvV2 instance.
+
+        :param adapter: Instance of :py:class:`hvac.adapters.Adapter`; used for performing HTTP requests.
+        :type adapter: hvac.adapters.Adapter
+        :param cache: Optional cache used to serve repeated read_secret_version calls. Entries are retained for the
+            cache's default_ttl and invalidated by any write, delete or destroy of the same path through this instance.
+        :type cache: hvac.cache.TTLCache
+        """
+        super(KvV2, self).__init__(adapter=adapter)
+        self.cache = cache
+
+    @staticmethod
+    def _cache_key(path, mount_point, version=None):
+        return utils.normalize_path(mount_point), utils.normalize_path(path), version
+
+    def _invalidate_cached_versions(self, path, mount_point):
+        if self.cache is not None:
+            path_key = self._cache_key(path=path, mount_point=mount_point)[:2]
+            self.cache.invalidate_matching(lambda key: key[:2] == path_key)
+
     def configure(self, max_versions=10, cas_required=None, mount_point=DEFAULT_MOUNT_POINT):
         """Configure backend level settings that are applied to every key in the key-value store.
 
@@ -76,14 +97,47 @@ class KvV2(VaultApiBase):
         :return: The JSON response of the request.
         :rtype: dict
         """
+        cache_key = self._cache_key(path=path, mount_point=mount_point, version=version)
+        if self.cache is not None:
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                return cached_response
+            generation = self.cache.generation
+
         params = {}
         if version is not None:
             params['version'] = version
         api_path = utils.format_url('/v1/{mount_point}/data/{path}', mount_point=mount_point, path=path)
-        return self._adapter.get(
+        response = self._adapter.get(
             url=api_path,
             params=params,
         )
+        if self.cache is not None and isinstance(response, dict):
+            self.cache.set(cache_key, response, generation=generation)
+        return response
+
+    @utils.synchronous_only
+    def read_secrets(self, paths, mount_point=DEFAULT_MOUNT_POINT, max_workers=utils.DEFAULT_MAX_WORKERS):
+        """Retrieve the latest version of many secrets concurrently.
+
+        Each path is read via :py:meth:`read_secret_version` on a bounded pool of worker threads sharing this
+        instance's adapter. The adapter's pool_maxsize should be at least max_workers to allow connections to be
+        reused.
+
+        :param paths: The paths of the secrets to read.
+        :type paths: list
+        :param mount_point: The "path" the secret engine was mounted on.
+        :type mount_point: str | unicode
+        :param max_workers: The maximum number of requests to have in flight at once.
+        :type max_workers: int
+        :return: Mapping of each path to the JSON response of its read, or the exception raised when reading it.
+        :rtype: dict
+        """
+        return utils.map_concurrently(
+            func=lambda path: self.read_secret_version(path=path, mount_point=mount_point),
+            items=paths,
+            max_workers=max_workers,
+        )
 
     def create_or_update_secret(self, path, secret, cas=None, mount_point=DEFAULT_MOUNT_POINT):
         """Create a new version of a secret at the specified location.
@@ -116,11 +170,14 @@ class KvV2(VaultApiBase):
             params['options']['cas'] = cas
 
         api_path = utils.format_url('/v1/{mount_point}/data/{path}', mount_point=mount_point, path=path)
-        return self._adapter.post(
+        response = self._adapter.post(
             url=api_path,
             json=params,
         )
+        self._invalidate_cached_versions(path=path, mount_point=mount_point)
+        return response
 
+    @utils.synchronous_only
     def patch(self, path, secret, mount_point=DEFAULT_MOUNT_POINT):
         """Set or update data in the KV store without overwriting.
 
@@ -133,7 +190,8 @@ class KvV2(VaultApiBase):
         :return: The JSON response of the create_or_update_secret request.
         :rtype: dict
         """
-        # First, do a read.
+        # First, do a read; bypassing any cached copy so the check-and-set below uses the current version.
+        self._invalidate_cached_versions(path=path, mount_point=mount_point)
         try:
             current_secret_version = self.read_secret_version(
                 path=path,
@@ -172,9 +230,11 @@ class KvV2(VaultApiBase):
         :rtype: requests.Response
         """
         api_path = utils.format_url('/v1/{mount_point}/data/{path}', mount_point=mount_point, path=path)
-        return self._adapter.delete(
+        response = self._adapter.delete(
             url=api_path,
         )
+        self._invalidate_cached_versions(path=path, mount_point=mount_point)
+        return response
 
     def delete_secret_versions(self, path, versions, mount_point=DEFAULT_MOUNT_POINT):
         """Issue a soft delete of the specified versions of the secret.
@@ -206,10 +266,12 @@ class KvV2(VaultApiBase):
             'versions': versions,
         }
         api_path = utils.format_url('/v1/{mount_point}/delete/{path}', mount_point=mount_point, path=path)
-        return self._adapter.post(
+        response = self._adapter.post(
             url=api_path,
             json=params,
         )
+        self._invalidate_cached_versions(path=path, mount_point=mount_point)
+        return response
 
     def undelete_secret_versions(self, path, versions, mount_point=DEFAULT_MOUNT_POINT):
         """Undelete the data for the provided version and path in the key-value store.
@@ -239,10 +301,12 @@ class KvV2(VaultApiBase):
             'versions': versions,
         }
         api_path = utils.format_url('/v1/{mount_point}/undelete/{path}', mount_point=mount_point, path=path)
-        return self._adapter.post(
+        response = self._adapter.post(
             url=api_path,
             json=params,
         )
+        self._invalidate_cached_versions(path=path, mount_point=mount_point)
+        return response
 
     def destroy_secret_versions(self, path, versions, mount_point=DEFAULT_MOUNT_POINT):
         """Permanently remove the specified version data and numbers for the provided path from the key-value store.
@@ -271,10 +335,38 @@ class KvV2(VaultApiBase):
             'versions': versions,
         }
         api_path = utils.format_url('/v1/{mount_point}/destroy/{path}', mount_point=mount_point, path=path)
-        return self._adapter.post(
+        response = self._adapter.post(
             url=api_path,
             json=params,
         )
+        self._invalidate_cached_versions(path=path, mount_point=mount_point)
+        return response
+
+    @utils.synchronous_only
+    def walk(self, path='', mount_point=DEFAULT_MOUNT_POINT, max_depth=None, max_workers=utils.DEFAULT_MAX_WORKERS):
+        """Recursively list the key names under the specified location.
+
+        Folders (keys suffixed with /) are descended into via :py:meth:`list_secrets`, with sibling folders listed in
+        parallel on a bounded pool of worker threads. Results are yielded as each folder is listed rather than
+        collected up front, so arbitrarily large trees may be walked in constant memory.
+
+        :param path: Specifies the folder to start walking from. Defaults to the root of the mount.
+        :type path: str | unicode
+        :param mount_point: The "path" the secret engine was mounted on.
+        :type mount_point: str | unicode
+        :param max_depth: Optional number of folder levels below path to descend. 0 lists path only.
+        :type max_depth: int
+        :param max_workers: The maximum number of list requests to have in flight at once.
+        :type max_workers: int
+        :return: Generator of (folder path, keys) tuples, one per folder listed. Folder paths end with /.
+        :rtype: collections.abc.Iterator[tuple]
+        """
+        return utils.walk_concurrently(
+            list_keys=lambda folder: self.list_secrets(path=folder, mount_point=mount_point)['data']['keys'],
+            path=path,
+            max_depth=max_depth,
+            max_workers=max_workers,
+        )
 
     def list_secrets(self, path, mount_point=DEFAULT_MOUNT_POINT):
         """Return a list of key names at the specified location.
@@ -370,6 +462,8 @@ class KvV2(VaultApiBase):
         :rtype: requests.Response
         """
         api_path = utils.format_url('/v1/{mount_point}/metadata/{path}', mount_point=mount_point, path=path)
-        return self._adapter.delete(
+        response = self._adapter.delete(
             url=api_path,
         )
+        self._invalidate_cached_versions(path=path, mount_point=mount_point)
+        return response
@@ -102,9 +102,10 @@ class RabbitMQ(VaultApiBase):
         :rtype: requests.Response
         """
         api_path = utils.format_url("/v1/{}/roles/{}", mount_point, name)
-        return self._adapter.get(
+        response = self._adapter.get(
             url=api_path,
-        ).json()
+        )
+        return utils.apply_to_response(response, lambda response: response.json())
 
     def delete_role(self, name, mount_point=DEFAULT_MOUNT_POINT):
         """This endpoint deletes the role definition.
@@ -133,6 +134,7 @@ class RabbitMQ(VaultApiBase):
         :rtype: requests.Response
         """
         api_path = utils.format_url("/v1/{}/creds/{}", mount_point, name)
-        return self._adapter.get(
+        response = self._adapter.get(
             url=api_path,
-        ).json()
+        )
+        return utils.apply_to_response(response, lambda response: response.json())
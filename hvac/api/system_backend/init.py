@@ -1,3 +1,4 @@
+from hvac import utils
 from hvac.api.system_backend.system_backend_mixin import SystemBackendMixin
 from hvac.exceptions import ParamValidationError
 
@@ -25,7 +26,7 @@ class Init(SystemBackendMixin):
         :rtype: bool
         """
         status = self.read_init_status()
-        return status['initialized']
+        return utils.apply_to_response(status, lambda status: status['initialized'])
 
     def initialize(self, secret_shares=5, secret_threshold=3, pgp_keys=None, root_token_pgp_key=None,
                    stored_shares=None, recovery_shares=None, recovery_threshold=None, recovery_pgp_keys=None):
@@ -1,3 +1,4 @@
+from hvac import utils
 from hvac.api.system_backend.system_backend_mixin import SystemBackendMixin
 from hvac.exceptions import ParamValidationError
 
@@ -263,6 +264,7 @@ class Key(SystemBackendMixin):
             json=params,
         )
 
+    @utils.synchronous_only
     def rekey_multi(self, keys, nonce=None, recovery_key=False):
         """Enter multiple recovery key shares to progress the rekey of the Vault.
 
@@ -356,6 +358,7 @@ class Key(SystemBackendMixin):
             json=params,
         )
 
+    @utils.synchronous_only
     def rekey_verify_multi(self, keys, nonce):
         """Enter multiple new recovery key shares to progress the rekey verification of the Vault.
         If the threshold number of new recovery key shares is reached, Vault will complete the
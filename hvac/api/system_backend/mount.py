@@ -17,12 +17,14 @@ class Mount(SystemBackendMixin):
 
     def retrieve_mount_option(self, mount_point, option_name, default_value=None):
         secrets_engine_path = '{mount_point}/'.format(mount_point=mount_point)
-        secrets_engines_list = self.list_mounted_secrets_engines()['data']
-        mount_options = secrets_engines_list[secrets_engine_path].get('options')
-        if mount_options is None:
-            return default_value
 
-        return mount_options.get(option_name, default_value)
+        def get_option(response):
+            mount_options = response['data'][secrets_engine_path].get('options')
+            if mount_options is None:
+                return default_value
+            return mount_options.get(option_name, default_value)
+
+        return utils.apply_to_response(self.list_mounted_secrets_engines(), get_option)
 
     def enable_secrets_engine(self, backend_type, path=None, description=None, config=None, plugin_name=None,
                               options=None, local=False, seal_wrap=False, **kwargs):
@@ -1,7 +1,88 @@
 #!/usr/bin/env python
 """Raft methods module."""
+import hashlib
+import os
+
 from hvac.api.system_backend.system_backend_mixin import SystemBackendMixin
-from hvac import utils
+from hvac import exceptions, utils
+
+DEFAULT_SNAPSHOT_CHUNK_SIZE = 1024 * 1024
+
+
+class SnapshotReader(object):
+    """File-like wrapper streaming a snapshot to Vault in bounded chunks.
+
+    Each chunk read is optionally fed to a hash and reported to a progress callback. If an expected checksum is
+    provided and does not match once the end of the snapshot is reached, an exception is raised before the request
+    body is completed so that Vault never installs the snapshot.
+    """
+
+    def __init__(self, fileobj, chunk_size=DEFAULT_SNAPSHOT_CHUNK_SIZE, checksum_algorithm=None,
+                 expected_checksum=None, progress_callback=None):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.hash = hashlib.new(checksum_algorithm) if checksum_algorithm else None
+        self.expected_checksum = expected_checksum
+        self.progress_callback = progress_callback
+        self.bytes_read = 0
+        self._next_chunk = None
+        try:
+            self.total_size = os.fstat(fileobj.fileno()).st_size - fileobj.tell()
+        except (AttributeError, OSError, IOError, ValueError):
+            self.total_size = None
+
+    def __len__(self):
+        # Requests sends a Content-Length header for non-zero lengths, and falls back to a chunked upload otherwise.
+        return self.total_size or 0
+
+    def __iter__(self):
+        while True:
+            chunk = self.read()
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        """Read the next chunk of the snapshot.
+
+        The size argument is ignored; chunks are always up to chunk_size bytes. One chunk is read ahead so that the
+        expected checksum can be verified before the final chunk is handed over.
+        """
+        if self._next_chunk is None:
+            self._next_chunk = self._read_chunk()
+        chunk = self._next_chunk
+        self._next_chunk = self._read_chunk() if chunk else b''
+        if chunk and not self._next_chunk:
+            self.verify_checksum()
+        if chunk and self.progress_callback is not None:
+            self.progress_callback(self.bytes_read - len(self._next_chunk), self.total_size)
+        return chunk
+
+    def _read_chunk(self):
+        chunk = self.fileobj.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        if self.hash is not None:
+            self.hash.update(chunk)
+        return chunk
+
+    def verify_checksum(self):
+        """Compare the checksum of the snapshot against the expected checksum, if any.
+
+        :raises: hvac.exceptions.ParamValidationError if the checksums do not match.
+        """
+        if self.expected_checksum is not None and self.hexdigest() != self.expected_checksum.lower():
+            raise exceptions.ParamValidationError('snapshot checksum {actual} does not match expected {expected}'.format(
+                actual=self.hexdigest(),
+                expected=self.expected_checksum,
+            ))
+
+    def hexdigest(self):
+        """Retrieve the checksum of the data read so far, if computed.
+
+        :return: The hex digest, or None if no checksum_algorithm was provided.
+        :rtype: str | None
+        """
+        return self.hash.hexdigest() if self.hash is not None else None
 
 
 class Raft(SystemBackendMixin):
@@ -141,3 +222,95 @@ class Raft(SystemBackendMixin):
             url=api_path,
             data=snapshot,
         )
+
+    @utils.synchronous_only
+    def save_raft_snapshot(self, path_or_fileobj, chunk_size=DEFAULT_SNAPSHOT_CHUNK_SIZE, checksum_algorithm=None,
+                           progress_callback=None):
+        """Stream a snapshot of the current state of the raft cluster into a file.
+
+        The snapshot is written chunk by chunk as it is received, so it is never held in memory in full.
+
+        Supported methods:
+            GET: /sys/storage/raft/snapshot.
+
+        :param path_or_fileobj: Path of the file to write the snapshot to, or a binary file object open for writing.
+        :type path_or_fileobj: str | file
+        :param chunk_size: Maximum number of bytes to read from the response and write to the file at a time.
+        :type chunk_size: int
+        :param checksum_algorithm: Optional name of a hashlib algorithm (e.g. "sha256") used to compute a checksum of
+            the snapshot while it is written.
+        :type checksum_algorithm: str
+        :param progress_callback: Optional callable invoked after each chunk with the number of bytes written so far and
+            the snapshot's total size (None if unknown).
+        :type progress_callback: callable
+        :return: The "size" of the snapshot in bytes and its "checksum" (None unless checksum_algorithm is provided).
+        :rtype: dict
+        """
+        snapshot_hash = hashlib.new(checksum_algorithm) if checksum_algorithm else None
+        response = self.take_raft_snapshot()
+        try:
+            total_size = response.headers.get('Content-Length')
+            total_size = int(total_size) if total_size else None
+            size = 0
+            with utils.open_file(path_or_fileobj, 'wb') as fileobj:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    fileobj.write(chunk)
+                    size += len(chunk)
+                    if snapshot_hash is not None:
+                        snapshot_hash.update(chunk)
+                    if progress_callback is not None:
+                        progress_callback(size, total_size)
+        finally:
+            response.close()
+
+        return {
+            'size': size,
+            'checksum': snapshot_hash.hexdigest() if snapshot_hash is not None else None,
+        }
+
+    @utils.synchronous_only
+    def restore_raft_snapshot_from(self, path_or_fileobj, force=False, chunk_size=DEFAULT_SNAPSHOT_CHUNK_SIZE,
+                                   checksum_algorithm=None, expected_checksum=None, progress_callback=None):
+        """Install a snapshot streamed from a file, returning the cluster to the state defined in it.
+
+        The snapshot is uploaded chunk by chunk as it is read, so it is never held in memory in full.
+
+        Supported methods:
+            POST: /sys/storage/raft/snapshot.
+            POST: /sys/storage/raft/snapshot-force.
+
+        :param path_or_fileobj: Path of the snapshot file, or a binary file object open for reading.
+        :type path_or_fileobj: str | file
+        :param force: If True, install the snapshot via snapshot-force, bypassing checks ensuring the Autounseal or
+            shamir keys are consistent with the snapshot data.
+        :type force: bool
+        :param chunk_size: Maximum number of bytes to read from the file and send at a time.
+        :type chunk_size: int
+        :param checksum_algorithm: Optional name of a hashlib algorithm (e.g. "sha256") used to compute a checksum of
+            the snapshot while it is uploaded.
+        :type checksum_algorithm: str
+        :param expected_checksum: Optional hex digest the snapshot must match. The upload is aborted before completing
+            if it does not, so the snapshot is not installed.
+        :type expected_checksum: str
+        :param progress_callback: Optional callable invoked after each chunk with the number of bytes read so far and the
+            snapshot's total size (None if unknown).
+        :type progress_callback: callable
+        :return: The response of the restore request.
+        :rtype: requests.Response
+        """
+        if expected_checksum is not None and checksum_algorithm is None:
+            raise exceptions.ParamValidationError('checksum_algorithm is required when expected_checksum is provided')
+
+        api_path = '/v1/sys/storage/raft/snapshot-force' if force else '/v1/sys/storage/raft/snapshot'
+        with utils.open_file(path_or_fileobj, 'rb') as fileobj:
+            reader = SnapshotReader(
+                fileobj=fileobj,
+                chunk_size=chunk_size,
+                checksum_algorithm=checksum_algorithm,
+                expected_checksum=expected_checksum,
+                progress_callback=progress_callback,
+            )
+            return self._adapter.post(
+                url=api_path,
+                data=reader,
+            )
@@ -1,3 +1,4 @@
+from hvac import utils
 from hvac.api.system_backend.system_backend_mixin import SystemBackendMixin
 
 
@@ -10,7 +11,7 @@ class Seal(SystemBackendMixin):
         :rtype: bool
         """
         seal_status = self.read_seal_status()
-        return seal_status['sealed']
+        return utils.apply_to_response(seal_status, lambda seal_status: seal_status['sealed'])
 
     def read_seal_status(self):
         """Read the seal status of the Vault.
@@ -81,6 +82,7 @@ class Seal(SystemBackendMixin):
             json=params,
         )
 
+    @utils.synchronous_only
     def submit_unseal_keys(self, keys, migrate=False):
         """Enter multiple master key share to progress the unsealing of the Vault.
 
@@ -17,3 +17,21 @@ class VaultApiBase(object):
         :type adapter: hvac.adapters.Adapter
         """
         self._adapter = adapter
+
+    @property
+    def adapter(self):
+        """Retrieve the adapter instance under the "_adapter" property in use by this class.
+
+        :return: The adapter instance in use by this class.
+        :rtype: hvac.adapters.Adapter
+        """
+        return self._adapter
+
+    @adapter.setter
+    def adapter(self, adapter):
+        """Sets the adapter instance under the "_adapter" property in use by this class.
+
+        :param adapter: New adapter instance to set for this class.
+        :type adapter: hvac.adapters.Adapter
+        """
+        self._adapter = adapter
@@ -1,7 +1,11 @@
 """Base class used by all hvac api "category" classes."""
 import logging
-from abc import ABCMeta, abstractproperty
+from abc import ABCMeta
+from collections import OrderedDict
 
+import six
+
+from hvac import utils
 from hvac.api.vault_api_base import VaultApiBase
 
 logger = logging.getLogger(__name__)
@@ -11,33 +15,48 @@ class VaultApiCategory(VaultApiBase):
     """Base class for API categories."""
     __metaclass__ = ABCMeta
 
+    #: Dotted paths of the implemented classes under this category, e.g. "hvac.api.auth_methods.azure.Azure". Categories
+    #: listing their classes here rather than overriding implemented_classes only import a class's module when the
+    #: class is first accessed.
+    implemented_class_paths = None
+
     def __init__(self, adapter):
         """API Category class constructor.
 
+        Instances of the implemented classes are created on first access rather than here, keeping construction cheap
+        for clients that only use a few of them.
+
         :param adapter: Instance of :py:class:`hvac.adapters.Adapter`; used for performing HTTP requests.
         :type adapter: hvac.adapters.Adapter
         """
-        self._adapter = adapter
-        self.implemented_class_names = []
-        for implemented_class in self.implemented_classes:
-            class_name = implemented_class.__name__.lower()
-            self.implemented_class_names.append(class_name)
-            auth_method_instance = implemented_class(adapter=adapter)
-            setattr(self, self.get_private_attr_name(class_name), auth_method_instance)
+        self._implemented_classes_by_name = self.get_implemented_classes_by_name()
+        self.implemented_class_names = list(self._implemented_classes_by_name)
 
         super(VaultApiCategory, self).__init__(adapter=adapter)
 
     def __getattr__(self, item):
         """Get an instance of an class instance in this category where available.
 
+        The instance is created, with this category's current adapter, the first time it is requested.
+
         :param item: Name of the class being requested.
         :type item: str | unicode
         :return: The requested class instance where available.
         :rtype: hvac.api.VaultApiBase
         """
-        if item in self.implemented_class_names:
-            private_attr_name = self.get_private_attr_name(item)
-            return getattr(self, private_attr_name)
+        # Looked up via __dict__ to avoid recursing into __getattr__ before __init__ has run.
+        implemented_classes_by_name = self.__dict__.get('_implemented_classes_by_name', {})
+        class_name = item[1:] if item.startswith('_') else item
+        if class_name in implemented_classes_by_name:
+            private_attr_name = self.get_private_attr_name(class_name)
+            instance = self.__dict__.get(private_attr_name)
+            if instance is None:
+                implemented_class = implemented_classes_by_name[class_name]
+                if isinstance(implemented_class, six.string_types):
+                    implemented_class = utils.import_string(implemented_class)
+                instance = implemented_class(adapter=self._adapter)
+                setattr(self, private_attr_name, instance)
+            return instance
         if item in [u.lower() for u in self.unimplemented_classes]:
             raise NotImplementedError('"%s" auth method class not currently implemented.')
         raise AttributeError
@@ -55,24 +74,55 @@ class VaultApiCategory(VaultApiBase):
     def adapter(self, adapter):
         """Sets the adapter instance under the "_adapter" property in use by this class.
 
-        Also sets the adapter property for all implemented classes under this category.
+        Also sets the adapter property for all implemented classes under this category. Classes not yet instantiated
+        pick up the new adapter when first accessed.
 
         :param adapter: New adapter instance to set for this class and all implemented classes under this category.
         :type adapter: hvac.adapters.Adapter
         """
         self._adapter = adapter
-        for implemented_class in self.implemented_classes:
-            class_name = implemented_class.__name__.lower()
-            getattr(self, self.get_private_attr_name(class_name)).adapter = adapter
+        for class_name in self.__dict__.get('_implemented_classes_by_name', {}):
+            instance = self.__dict__.get(self.get_private_attr_name(class_name))
+            if instance is not None:
+                instance.adapter = adapter
+
+    def get_implemented_classes_by_name(self):
+        """Map the lowercased name of each implemented class under this category to the class, or to its dotted path
+        when listed in implemented_class_paths.
 
-    @abstractproperty
+        The mapping is computed once per category class.
+
+        :return: Mapping of lowercased class names to classes or dotted paths.
+        :rtype: collections.OrderedDict
+        """
+        cls = type(self)
+        implemented_classes_by_name = cls.__dict__.get('_implemented_classes_cache')
+        if implemented_classes_by_name is None:
+            if self.implemented_class_paths is not None:
+                implemented_classes_by_name = OrderedDict(
+                    (path.rsplit('.', 1)[1].lower(), path) for path in self.implemented_class_paths
+                )
+            else:
+                implemented_classes_by_name = OrderedDict(
+                    (implemented_class.__name__.lower(), implemented_class)
+                    for implemented_class in self.implemented_classes
+                )
+            cls._implemented_classes_cache = implemented_classes_by_name
+        return implemented_classes_by_name
+
+    @property
     def implemented_classes(self):
         """List of implemented classes under this category.
 
+        Categories must either override this property or set implemented_class_paths, in which case the classes are
+        imported when this property is accessed.
+
         :return: List of implemented classes under this category.
         :rtype: List[hvac.api.VaultApiBase]
         """
-        raise NotImplementedError
+        if self.implemented_class_paths is None:
+            raise NotImplementedError
+        return [utils.import_string(path) for path in self.implemented_class_paths]
 
     @property
     def unimplemented_classes(self):
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Client-side caching helpers."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache(object):
+    """A thread-safe, size-bounded LRU cache whose entries expire after a per-entry TTL.
+
+    Values are deep-copied on the way in and out so callers are free to mutate the results they are handed.
+
+    The cache's generation is incremented whenever entries are invalidated. Callers fetching a value to cache can read
+    the generation beforehand and pass it to :py:meth:`set`, so that a value fetched before an invalidation (e.g. a
+    read racing a write) is not stored after it. Entries are otherwise retained for the cache's default_ttl, which
+    callers should prefer over response lease durations that are merely refresh hints, such as KV's.
+    """
+
+    def __init__(self, maxsize=1024, default_ttl=300, max_ttl=None):
+        """Create a new cache instance.
+
+        :param maxsize: Maximum number of entries to hold. The least recently used entry is evicted when exceeded.
+        :type maxsize: int
+        :param default_ttl: Number of seconds entries are retained when no TTL is provided for them.
+        :type default_ttl: int | float
+        :param max_ttl: Optional upper bound, in seconds, applied to every entry's TTL.
+        :type max_ttl: int | float
+        """
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Retrieve a cached value.
+
+        :param key: The key the value was stored under.
+        :type key: collections.abc.Hashable
+        :return: A copy of the cached value, or None if there is no unexpired entry for the key.
+        :rtype: object
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] <= time.time():
+                self.misses += 1
+                return None
+            # Re-insert the entry to mark it as the most recently used.
+            self._entries[key] = entry
+            self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def set(self, key, value, ttl=None, generation=None):
+        """Store a value.
+
+        :param key: The key to store the value under.
+        :type key: collections.abc.Hashable
+        :param value: The value to cache.
+        :type value: object
+        :param ttl: Number of seconds to retain the value for. The cache's default_ttl is used if not set (or zero).
+        :type ttl: int | float
+        :param generation: Optional generation of the cache read before the value was fetched. The value is not stored
+            if any entries have been invalidated since.
+        :type generation: int
+        """
+        ttl = ttl or self.default_ttl
+        if self.max_ttl is not None:
+            ttl = min(ttl, self.max_ttl)
+        if not ttl or ttl <= 0:
+            return
+        entry = (time.time() + ttl, copy.deepcopy(value))
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Remove a single entry from the cache, if present.
+
+        :param key: The key to remove.
+        :type key: collections.abc.Hashable
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self.generation += 1
+
+    def invalidate_matching(self, predicate):
+        """Remove all entries whose key satisfies the provided predicate.
+
+        :param predicate: Callable accepting a key and returning True if the entry should be removed.
+        :type predicate: callable
+        """
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+            self.generation += 1
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Capabilities Cache
+
+Caches the capabilities tokens hold on paths, as reported by :py:meth:`hvac.api.system_backend.Capabilities.get_capabilities`,
+so that repeated authorization checks do not each cost a request to Vault.
+
+"""
+import hashlib
+import re
+import time
+
+from hvac.cache import TTLCache
+from hvac.middleware import Middleware
+
+POLICY_PATH_RE = re.compile(r'^v1/sys/(?:policy|policies/acl)/(?P<name>.+)$')
+
+
+class CapabilitiesCache(Middleware):
+    """Cache of token capabilities keyed by token accessor and path.
+
+    Entries expire after max_ttl seconds, or when the token they were looked up for expires if sooner. The first check
+    for a given token looks the token up to learn its accessor, TTL and policies.
+
+    The cache registers itself as middleware on the client's adapter (unless watch_policy_changes is False) so that
+    writing or deleting an ACL policy through that client, e.g. via
+    :py:meth:`hvac.api.system_backend.Policy.create_or_update_policy`, invalidates the cached capabilities of every
+    token holding the policy. Changes made by other clients are only picked up once entries expire.
+    """
+
+    def __init__(self, client, max_ttl=300, maxsize=10000, watch_policy_changes=True):
+        """Create a new capabilities cache.
+
+        :param client: Client used to look up tokens and query capabilities.
+        :type client: hvac.v1.Client
+        :param max_ttl: Maximum number of seconds capabilities are cached for.
+        :type max_ttl: int | float
+        :param maxsize: Maximum number of (accessor, path) entries to cache.
+        :type maxsize: int
+        :param watch_policy_changes: Whether to register with the client's adapter to invalidate entries when policies
+            are written or deleted.
+        :type watch_policy_changes: bool
+        """
+        self.client = client
+        self.max_ttl = max_ttl
+        self._capabilities = TTLCache(maxsize=maxsize, default_ttl=max_ttl, max_ttl=max_ttl)
+        self._tokens = TTLCache(maxsize=maxsize, default_ttl=max_ttl, max_ttl=max_ttl)
+        if watch_policy_changes:
+            client.adapter.add_middleware(self)
+
+    @staticmethod
+    def _token_key(token):
+        # Tokens are only held in memory as digests.
+        return 'token', hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get_token_info(self, token=None, accessor=None):
+        """Look up, or retrieve from the cache, the accessor, policies and expiry of a token.
+
+        :param token: The token to look up. The client's own token is used if neither token nor accessor is provided.
+        :type token: str
+        :param accessor: The accessor of the token to look up.
+        :type accessor: str
+        :return: The token's "accessor", "policies" (including identity policies) and "expires_at" (None if the token
+            does not expire).
+        :rtype: dict
+        """
+        if accessor:
+            key = ('accessor', accessor)
+        else:
+            key = self._token_key(token or self.client.token or '')
+
+        info = self._tokens.get(key)
+        if info is not None:
+            return info
+
+        if accessor:
+            data = self.client.lookup_token(accessor, accessor=True)['data']
+        else:
+            data = self.client.lookup_token(token)['data']
+        ttl = data.get('ttl') or 0
+        info = {
+            'accessor': data['accessor'],
+            'policies': sorted(set(data.get('policies') or []) | set(data.get('identity_policies') or [])),
+            'expires_at': time.time() + ttl if ttl else None,
+        }
+        self._tokens.set(key, info, ttl=ttl or None)
+        if not accessor:
+            self._tokens.set(('accessor', info['accessor']), info, ttl=ttl or None)
+        return info
+
+    def prefetch(self, paths, token=None, accessor=None):
+        """Retrieve a token's capabilities on several paths, querying Vault for all uncached paths in a single request.
+
+        :param paths: Paths to retrieve capabilities for.
+        :type paths: list[str]
+        :param token: The token to check. The client's own token is used if neither token nor accessor is provided.
+        :type token: str
+        :param accessor: The accessor of the token to check.
+        :type accessor: str
+        :return: Mapping of each path to the list of capabilities the token holds on it.
+        :rtype: dict
+        """
+        info = self.get_token_info(token=token, accessor=accessor)
+        capabilities = {}
+        missing_paths = []
+        for path in paths:
+            path_capabilities = self._capabilities.get((info['accessor'], path))
+            if path_capabilities is None:
+                missing_paths.append(path)
+            else:
+                capabilities[path] = path_capabilities
+
+        if missing_paths:
+            response = self.client.sys.get_capabilities(paths=missing_paths, token=token, accessor=accessor)
+            results = response.get('data') or response
+            ttl = None
+            if info['expires_at'] is not None:
+                ttl = info['expires_at'] - time.time()
+            for path in missing_paths:
+                capabilities[path] = results.get(path, results.get('capabilities', []))
+                if ttl is None or ttl > 0:
+                    self._capabilities.set((info['accessor'], path), capabilities[path], ttl=ttl)
+        return capabilities
+
+    def get_capabilities(self, path, token=None, accessor=None):
+        """Retrieve a token's capabilities on a path.
+
+        :param path: The path to retrieve capabilities for.
+        :type path: str
+        :param token: The token to check. The client's own token is used if neither token nor accessor is provided.
+        :type token: str
+        :param accessor: The accessor of the token to check.
+        :type accessor: str
+        :return: The capabilities the token holds on the path, e.g. ["read", "list"].
+        :rtype: list[str]
+        """
+        return self.prefetch([path], token=token, accessor=accessor)[path]
+
+    def has_capability(self, path, capability, token=None, accessor=None):
+        """Check whether a token holds a capability on a path.
+
+        :param path: The path to check.
+        :type path: str
+        :param capability: The capability to check for, e.g. "read".
+        :type capability: str
+        :param token: The token to check. The client's own token is used if neither token nor accessor is provided.
+        :type token: str
+        :param accessor: The accessor of the token to check.
+        :type accessor: str
+        :return: True if the token holds the capability (or "root") on the path.
+        :rtype: bool
+        """
+        capabilities = self.get_capabilities(path, token=token, accessor=accessor)
+        if 'deny' in capabilities:
+            return False
+        return capability in capabilities or 'root' in capabilities
+
+    def invalidate_policy(self, name):
+        """Remove the cached capabilities of all tokens holding a policy.
+
+        Capabilities of tokens whose policies are no longer cached are removed as well.
+
+        :param name: The name of the policy.
+        :type name: str
+        """
+        def holds_policy(key):
+            info = self._tokens.get(('accessor', key[0]))
+            return info is None or name in info['policies']
+
+        self._capabilities.invalidate_matching(holds_policy)
+
+    def clear(self):
+        """Remove all cached tokens and capabilities."""
+        self._capabilities.clear()
+        self._tokens.clear()
+
+    def after_response(self, request, response):
+        """Invalidate cached capabilities when a policy is written or deleted through the adapter."""
+        if request.method.upper() in ('POST', 'PUT', 'DELETE') and response.status_code < 400:
+            match = POLICY_PATH_RE.match(request.path)
+            if match:
+                self.invalidate_policy(match.group('name'))
+        return response
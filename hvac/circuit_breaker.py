@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Circuit breaker for failing fast while a Vault endpoint is unreachable."""
+import threading
+import time
+
+from hvac import exceptions
+from hvac.middleware import Middleware
+from hvac.retry import RETRYABLE_EXCEPTIONS
+
+DEFAULT_FAILURE_STATUS_CODES = frozenset([502, 503, 504])
+
+
+class CircuitBreaker(Middleware):
+    """Track the health of each endpoint requests are sent to, rejecting requests to endpoints that keep failing.
+
+    Each endpoint's circuit starts out "closed", letting requests through. After failure_threshold consecutive
+    failures (connection errors, timeouts or one of the failure status codes) the circuit "opens" and requests are
+    rejected immediately with :py:class:`hvac.exceptions.CircuitBreakerOpen` rather than waiting on the network. Once
+    recovery_timeout seconds have passed the circuit becomes "half_open": a limited number of trial requests are let
+    through, closing the circuit again if they succeed or re-opening it if they fail.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30, half_open_max_calls=1,
+                 failure_status_codes=DEFAULT_FAILURE_STATUS_CODES):
+        """Create a new circuit breaker.
+
+        :param failure_threshold: Number of consecutive failures after which an endpoint's circuit opens.
+        :type failure_threshold: int
+        :param recovery_timeout: Number of seconds an open circuit rejects requests before trial requests are allowed.
+        :type recovery_timeout: int | float
+        :param half_open_max_calls: Maximum number of trial requests in flight while a circuit is half open.
+        :type half_open_max_calls: int
+        :param failure_status_codes: Response status codes counted as failures.
+        :type failure_status_codes: collections.abc.Iterable[int]
+        """
+        if failure_threshold < 1:
+            raise exceptions.ParamValidationError('failure_threshold must be at least 1, "{threshold}" provided'.format(
+                threshold=failure_threshold,
+            ))
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_status_codes = frozenset(failure_status_codes)
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _get_circuit(self, endpoint):
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = {
+                'state': self.CLOSED,
+                'failures': 0,
+                'opened_at': None,
+                'trials': 0,
+            }
+        elif circuit['state'] == self.OPEN and time.time() - circuit['opened_at'] >= self.recovery_timeout:
+            circuit['state'] = self.HALF_OPEN
+            circuit['trials'] = 0
+        return circuit
+
+    def state(self, endpoint):
+        """Retrieve the state of an endpoint's circuit.
+
+        :param endpoint: The endpoint, e.g. "https://127.0.0.1:8200".
+        :type endpoint: str
+        :return: One of "closed", "open" or "half_open".
+        :rtype: str
+        """
+        with self._lock:
+            return self._get_circuit(endpoint)['state']
+
+    def check_endpoint(self, endpoint):
+        """Check that a request may be sent to an endpoint.
+
+        :param endpoint: The endpoint the request will be sent to.
+        :type endpoint: str
+        :raises: hvac.exceptions.CircuitBreakerOpen if the endpoint's circuit is open, or half open with the maximum
+            number of trial requests already in flight.
+        """
+        with self._lock:
+            circuit = self._get_circuit(endpoint)
+            if circuit['state'] == self.CLOSED:
+                return
+            if circuit['state'] == self.HALF_OPEN and circuit['trials'] < self.half_open_max_calls:
+                circuit['trials'] += 1
+                return
+            retry_in = max(circuit['opened_at'] + self.recovery_timeout - time.time(), 0)
+        raise exceptions.CircuitBreakerOpen(
+            'circuit open after repeated failures, retrying in {retry_in:.1f}s'.format(retry_in=retry_in),
+            url=endpoint,
+        )
+
+    def is_failure(self, response=None, error=None):
+        """Determine whether the outcome of a request counts as a failure of its endpoint.
+
+        :param response: The response received for the request, if any.
+        :type response: requests.Response
+        :param error: The exception raised while sending the request, if any.
+        :type error: Exception
+        :rtype: bool
+        """
+        if error is not None:
+            return isinstance(error, RETRYABLE_EXCEPTIONS)
+        return response is not None and response.status_code in self.failure_status_codes
+
+    def record(self, endpoint, response=None, error=None):
+        """Record the outcome of a request to an endpoint.
+
+        :param endpoint: The endpoint the request was sent to.
+        :type endpoint: str
+        :param response: The response received for the request, if any.
+        :type response: requests.Response
+        :param error: The exception raised while sending the request, if any.
+        :type error: Exception
+        """
+        if self.is_failure(response=response, error=error):
+            self.record_failure(endpoint)
+        else:
+            self.record_success(endpoint)
+
+    def handle(self, request, send):
+        """Send a request unless its endpoint's circuit is open, recording the outcome.
+
+        :param request: The request to send.
+        :type request: hvac.middleware.RequestContext
+        :param send: Callable sending the request through the remaining middleware.
+        :type send: callable
+        :return: The response of the request.
+        :rtype: requests.Response
+        """
+        self.check_endpoint(request.base_uri)
+        try:
+            response = send(request)
+        except Exception as error:
+            self.record(request.base_uri, error=error)
+            raise
+        self.record(request.base_uri, response=response)
+        return response
+
+    def record_success(self, endpoint):
+        """Record a request to an endpoint that did not fail, closing its circuit.
+
+        :param endpoint: The endpoint the request was sent to.
+        :type endpoint: str
+        """
+        with self._lock:
+            circuit = self._get_circuit(endpoint)
+            circuit['state'] = self.CLOSED
+            circuit['failures'] = 0
+            circuit['opened_at'] = None
+
+    def record_failure(self, endpoint):
+        """Record a failed request to an endpoint, opening its circuit once the failure threshold is reached.
+
+        :param endpoint: The endpoint the request was sent to.
+        :type endpoint: str
+        """
+        with self._lock:
+            circuit = self._get_circuit(endpoint)
+            circuit['failures'] += 1
+            if circuit['state'] == self.HALF_OPEN or circuit['failures'] >= self.failure_threshold:
+                circuit['state'] = self.OPEN
+                circuit['opened_at'] = time.time()
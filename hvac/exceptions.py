@@ -55,3 +55,7 @@ class BadGateway(VaultError):
 
 class ParamValidationError(VaultError):
     pass
+
+
+class CircuitBreakerOpen(VaultDown):
+    pass
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""In-process index of Identity secrets engine entities and groups, serving lookups from memory."""
+import logging
+import threading
+import time
+
+from hvac import exceptions, utils
+from hvac.api.secrets_engines.identity import DEFAULT_MOUNT_POINT
+from hvac.cache import TTLCache
+from hvac.identity_sync import list_identity_objects
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 60
+DEFAULT_DETAIL_TTL = 5 * DEFAULT_REFRESH_INTERVAL
+DEFAULT_NEGATIVE_TTL = 5
+
+
+class _ObjectIndex(object):
+    """Entities or groups indexed by ID, name, alias ID and (alias name, mount accessor)."""
+
+    def __init__(self):
+        self.by_id = {}
+        self.ids_by_name = {}
+        self.ids_by_alias_id = {}
+        self.ids_by_alias = {}
+        self.read_at = {}
+
+    def add(self, data, read_at):
+        object_id = data['id']
+        previous = self.by_id.get(object_id)
+        if previous is not None and previous['name'] != data['name'] and self.ids_by_name.get(previous['name']) == object_id:
+            # The object was renamed.
+            del self.ids_by_name[previous['name']]
+        self.by_id[object_id] = data
+        self.read_at[object_id] = read_at
+        self.ids_by_name[data['name']] = object_id
+        aliases = data.get('aliases') or []
+        if data.get('alias'):
+            aliases = [data['alias']]
+        for alias in aliases:
+            self.ids_by_alias_id[alias['id']] = object_id
+            self.ids_by_alias[(alias['name'], alias['mount_accessor'])] = object_id
+
+    def remove(self, object_id):
+        data = self.by_id.pop(object_id, None)
+        self.read_at.pop(object_id, None)
+        if data is not None and self.ids_by_name.get(data['name']) == object_id:
+            del self.ids_by_name[data['name']]
+
+    def set_aliases(self, aliases):
+        self.ids_by_alias_id = {alias_id: info['canonical_id'] for alias_id, info in aliases.items()}
+        self.ids_by_alias = {
+            (info['name'], info['mount_accessor']): info['canonical_id'] for info in aliases.values()
+        }
+
+    def get(self, object_id=None, name=None, alias_id=None, alias_name=None, alias_mount_accessor=None):
+        if object_id is None:
+            if name is not None:
+                object_id = self.ids_by_name.get(name)
+            elif alias_id is not None:
+                object_id = self.ids_by_alias_id.get(alias_id)
+            else:
+                object_id = self.ids_by_alias.get((alias_name, alias_mount_accessor))
+        return self.by_id.get(object_id)
+
+
+class IdentityIndex(object):
+    """Serve lookups of Identity secrets engine entities and groups from an in-process index.
+
+    All entities and groups are loaded when the index is started, via LIST requests and concurrent reads of each
+    object, and indexed by ID, name, alias ID and (alias name, mount accessor). A background thread then refreshes the
+    index every refresh_interval seconds: objects are listed again, new objects are read, deleted objects are dropped
+    and the alias indexes are rebuilt from LIST requests on the entity-alias and group-alias endpoints. Objects already
+    indexed are read again once their details are older than detail_ttl seconds, picking up any changes to their names,
+    policies or metadata.
+
+    Lookups missing the index fall back to :py:meth:`hvac.api.secrets_engines.Identity.lookup_entity` and
+    :py:meth:`hvac.api.secrets_engines.Identity.lookup_group`. Objects found this way are added to the index, while
+    lookups finding nothing are remembered for negative_ttl seconds.
+
+    The dicts returned by lookups are shared with the index and must not be modified.
+    """
+
+    def __init__(self, client, mount_point=DEFAULT_MOUNT_POINT, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 detail_ttl=DEFAULT_DETAIL_TTL, fallback=True, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 max_workers=utils.DEFAULT_MAX_WORKERS):
+        """Create a new identity index.
+
+        :param client: Client used to load the index and for fallback lookups.
+        :type client: hvac.v1.Client
+        :param mount_point: The "path" the Identity secrets engine was mounted on.
+        :type mount_point: str | unicode
+        :param refresh_interval: Number of seconds between refreshes of the index.
+        :type refresh_interval: int | float
+        :param detail_ttl: Number of seconds after which indexed objects are read again when the index is refreshed.
+            Objects are only read when first indexed if None.
+        :type detail_ttl: int | float
+        :param fallback: Whether lookups missing the index are sent to Vault.
+        :type fallback: bool
+        :param negative_ttl: Number of seconds fallback lookups finding nothing are remembered for.
+        :type negative_ttl: int | float
+        :param max_workers: The maximum number of reads to have in flight at once while refreshing the index.
+        :type max_workers: int
+        """
+        self.client = client
+        self.mount_point = mount_point
+        self.refresh_interval = refresh_interval
+        self.detail_ttl = detail_ttl
+        self.fallback = fallback
+        self.max_workers = max_workers
+        self.refreshed_at = None
+
+        self._entities = _ObjectIndex()
+        self._groups = _ObjectIndex()
+        self._misses = TTLCache(maxsize=10000, default_ttl=negative_ttl)
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def identity(self):
+        return self.client.secrets.identity
+
+    def start(self):
+        """Load the index and start the background refresh thread."""
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='hvac-identity-index')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as error:
+                logger.warning('unable to refresh identity index: %s', error)
+
+    def _list(self, list_method):
+        return list_identity_objects(list_method, mount_point=self.mount_point)
+
+    def _refresh_index(self, index, list_method, list_aliases_method, read_method):
+        listed = self._list(list_method)
+        aliases = self._list(list_aliases_method)
+        now = time.time()
+        stale_before = now - self.detail_ttl if self.detail_ttl is not None else None
+        to_read = [
+            object_id for object_id in listed
+            if object_id not in index.by_id or (stale_before is not None and index.read_at[object_id] <= stale_before)
+        ]
+        results = utils.map_concurrently(
+            func=lambda object_id: read_method(object_id, mount_point=self.mount_point)['data'],
+            items=to_read,
+            max_workers=self.max_workers,
+        )
+
+        with self._lock:
+            for object_id in [object_id for object_id in index.by_id if object_id not in listed]:
+                index.remove(object_id)
+            for object_id, result in results.items():
+                if isinstance(result, Exception):
+                    logger.debug('unable to read identity object %s: %s', object_id, result)
+                    continue
+                index.add(result, read_at=now)
+            index.set_aliases(aliases)
+
+    def refresh(self):
+        """Bring the index up to date with Vault. Called by the background thread."""
+        self._refresh_index(
+            index=self._entities,
+            list_method=self.identity.list_entities,
+            list_aliases_method=self.identity.list_entity_aliases,
+            read_method=self.identity.read_entity,
+        )
+        self._refresh_index(
+            index=self._groups,
+            list_method=self.identity.list_groups,
+            list_aliases_method=self.identity.list_group_aliases,
+            read_method=self.identity.read_group,
+        )
+        with self._lock:
+            self._misses.clear()
+            self._generation += 1
+        self.refreshed_at = time.time()
+
+    def _get(self, kind, index, object_id, name, alias_id, alias_name, alias_mount_accessor):
+        if object_id is None and name is None and alias_id is None and (alias_name is None or alias_mount_accessor is None):
+            raise exceptions.ParamValidationError(
+                'an ID, name, alias ID or alias name and mount accessor is required to look up an {kind}'.format(
+                    kind=kind,
+                )
+            )
+        data = index.get(object_id, name, alias_id, alias_name, alias_mount_accessor)
+        if data is not None or not self.fallback:
+            return data
+
+        miss_key = (kind, object_id, name, alias_id, alias_name, alias_mount_accessor)
+        with self._lock:
+            if self._misses.get(miss_key) is not None:
+                return None
+            generation = self._generation
+        lookup_kwargs = {
+            'name': name,
+            'alias_id': alias_id,
+            'alias_name': alias_name,
+            'alias_mount_accessor': alias_mount_accessor,
+            '{kind}_id'.format(kind=kind): object_id,
+        }
+        lookup_method = getattr(self.identity, 'lookup_{kind}'.format(kind=kind))
+        response = lookup_method(mount_point=self.mount_point, **lookup_kwargs)
+        if not isinstance(response, dict):
+            with self._lock:
+                # Lookups started before a refresh must not re-add a miss the refresh has cleared.
+                if generation == self._generation:
+                    self._misses.set(miss_key, True)
+            return None
+        data = response['data']
+        with self._lock:
+            index.add(data, read_at=time.time())
+        return data
+
+    def get_entity(self, entity_id=None, name=None, alias_id=None, alias_name=None, alias_mount_accessor=None):
+        """Look up an entity by its ID, its name, the ID of one of its aliases or the name and mount accessor of one of
+        its aliases.
+
+        :param entity_id: ID of the entity.
+        :type entity_id: str | unicode
+        :param name: Name of the entity.
+        :type name: str | unicode
+        :param alias_id: ID of an alias of the entity.
+        :type alias_id: str | unicode
+        :param alias_name: Name of an alias of the entity; requires alias_mount_accessor.
+        :type alias_name: str | unicode
+        :param alias_mount_accessor: Accessor of the mount the alias belongs to.
+        :type alias_mount_accessor: str | unicode
+        :return: The entity, as in the "data" of :py:meth:`hvac.api.secrets_engines.Identity.read_entity`, or None if
+            no entity is found.
+        :rtype: dict | None
+        """
+        return self._get(
+            'entity', self._entities, entity_id, name, alias_id, alias_name, alias_mount_accessor,
+        )
+
+    def get_group(self, group_id=None, name=None, alias_id=None, alias_name=None, alias_mount_accessor=None):
+        """Look up a group by its ID, its name, the ID of its alias or the name and mount accessor of its alias.
+
+        :param group_id: ID of the group.
+        :type group_id: str | unicode
+        :param name: Name of the group.
+        :type name: str | unicode
+        :param alias_id: ID of the group's alias.
+        :type alias_id: str | unicode
+        :param alias_name: Name of the group's alias; requires alias_mount_accessor.
+        :type alias_name: str | unicode
+        :param alias_mount_accessor: Accessor of the mount the alias belongs to.
+        :type alias_mount_accessor: str | unicode
+        :return: The group, as in the "data" of :py:meth:`hvac.api.secrets_engines.Identity.read_group`, or None if no
+            group is found.
+        :rtype: dict | None
+        """
+        return self._get(
+            'group', self._groups, group_id, name, alias_id, alias_name, alias_mount_accessor,
+        )
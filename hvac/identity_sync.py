@@ -0,0 +1,485 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Bulk reconciliation of Identity secrets engine entities, entity aliases and groups against a desired state."""
+import logging
+
+import six
+
+from hvac import exceptions, utils
+from hvac.api.secrets_engines.identity import DEFAULT_MOUNT_POINT
+
+logger = logging.getLogger(__name__)
+
+ENTITY_FIELDS = ('policies', 'metadata', 'disabled')
+GROUP_FIELDS = ('policies', 'metadata')
+
+
+def normalize_field(field, value):
+    """Normalize an entity or group field so that desired and current values compare equal when equivalent.
+
+    :param field: The field name, e.g. "policies".
+    :type field: str
+    :param value: The field value, as provided or as returned by Vault.
+    :type value: object
+    :return: The normalized value.
+    :rtype: object
+    """
+    if field == 'policies':
+        if isinstance(value, six.string_types):
+            value = utils.comma_delimited_to_list(value)
+        return sorted(set(value or []))
+    if field == 'metadata':
+        return dict(value or {})
+    if field == 'disabled':
+        return bool(value)
+    return value
+
+
+def list_identity_objects(list_method, mount_point=DEFAULT_MOUNT_POINT):
+    """List Identity secrets engine objects along with the key_info returned for each.
+
+    :param list_method: The Identity method listing the objects, e.g.
+        :py:meth:`hvac.api.secrets_engines.Identity.list_entities`.
+    :type list_method: callable
+    :param mount_point: The "path" the Identity secrets engine was mounted on.
+    :type mount_point: str | unicode
+    :return: Mapping of object IDs to their key_info, empty if there are no objects.
+    :rtype: dict
+    """
+    try:
+        data = list_method(method='LIST', mount_point=mount_point)['data']
+    except exceptions.InvalidPath:
+        # Vault responds with a 404 when there is nothing to list.
+        return {}
+    key_info = data.get('key_info') or {}
+    return {key: key_info.get(key) or {} for key in data.get('keys') or []}
+
+
+class IdentitySyncPlan(object):
+    """Changes required to bring the Identity secrets engine in line with a desired state, as computed by
+    :py:meth:`IdentitySync.plan`.
+
+    Entity and group writes are keyed by name and map to the fields to send. Member entities and groups are referred to
+    by name and resolved to IDs when the plan is applied, as entities and groups created by the plan have no ID before
+    then.
+    """
+
+    def __init__(self):
+        # name -> fields to write
+        self.entity_writes = {}
+        # (alias name, mount accessor) -> (entity name, ID of an existing alias to move or None to create one)
+        self.entity_alias_writes = {}
+        self.entity_alias_deletes = set()
+        # Lists of {name: fields} dicts; the groups of each level only have member groups written by earlier levels.
+        self.group_write_levels = []
+        # name -> (alias name, mount accessor, ID of the group's existing alias or None)
+        self.group_alias_writes = {}
+        # Groups whose type changed, which Vault does not allow updating; they are deleted before being recreated.
+        self.group_replacements = {}
+        self.group_deletes = {}
+        self.entity_deletes = {}
+        # Name -> ID of every entity and group that exists before the plan is applied.
+        self.entity_ids = {}
+        self.group_ids = {}
+
+    def summary(self):
+        """Count the changes in the plan by kind.
+
+        :return: Mapping of change kinds to the number of changes of that kind.
+        :rtype: dict
+        """
+        return {
+            'entity_writes': len(self.entity_writes),
+            'entity_alias_writes': len(self.entity_alias_writes),
+            'entity_alias_deletes': len(self.entity_alias_deletes),
+            'group_writes': sum(len(level) for level in self.group_write_levels),
+            'group_alias_writes': len(self.group_alias_writes),
+            'group_replacements': len(self.group_replacements),
+            'group_deletes': len(self.group_deletes),
+            'entity_deletes': len(self.entity_deletes),
+        }
+
+    def __len__(self):
+        return sum(self.summary().values())
+
+    def __repr__(self):
+        return '<IdentitySyncPlan {summary}>'.format(summary=self.summary())
+
+
+class IdentitySync(object):
+    """Reconcile Identity secrets engine entities, entity aliases and groups against a desired state.
+
+    The current state is fetched with a handful of LIST requests plus detail reads of the desired entities and groups
+    that already exist, done concurrently. The differences are computed locally and only the required changes are
+    sent, again concurrently. Desired entities and groups are matched to existing ones by name and only the fields
+    they specify are managed:
+
+    - Entities: "name", plus optionally "policies", "metadata", "disabled" and "aliases" (a list of dicts holding the
+      "name" and "mount_accessor" of each alias). Where aliases are given, the entity's other aliases are deleted.
+    - Groups: "name", plus optionally "type" (internal by default), "policies", "metadata", "member_entity_names" and
+      "member_group_names" (internal groups) or "alias" (a dict holding the "name" and "mount_accessor" of the alias of
+      an external group).
+
+    Entities and groups not in the desired state are only deleted when delete_missing is enabled.
+    """
+
+    def __init__(self, client, mount_point=DEFAULT_MOUNT_POINT, max_workers=utils.DEFAULT_MAX_WORKERS,
+                 delete_missing=False):
+        """Create a new identity sync engine.
+
+        :param client: Client used to read and write identities. Its adapter's pool_maxsize should be at least
+            max_workers to allow connections to be reused.
+        :type client: hvac.v1.Client
+        :param mount_point: The "path" the Identity secrets engine was mounted on.
+        :type mount_point: str | unicode
+        :param max_workers: The maximum number of requests to have in flight at once.
+        :type max_workers: int
+        :param delete_missing: Whether to delete entities and groups that are not part of the desired state.
+        :type delete_missing: bool
+        """
+        self.client = client
+        self.mount_point = mount_point
+        self.max_workers = max_workers
+        self.delete_missing = delete_missing
+
+    @property
+    def identity(self):
+        return self.client.secrets.identity
+
+    def _list(self, list_method):
+        return list_identity_objects(list_method, mount_point=self.mount_point)
+
+    def _read_all(self, read_method, ids):
+        results = utils.map_concurrently(
+            func=lambda object_id: read_method(object_id, mount_point=self.mount_point)['data'],
+            items=ids,
+            max_workers=self.max_workers,
+        )
+        for result in results.values():
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def fetch_state(self, entity_names=None, group_names=None):
+        """Fetch the current entities, entity aliases and groups.
+
+        :param entity_names: Names of the entities to read in detail. All entities are read if not provided.
+        :type entity_names: collections.abc.Iterable
+        :param group_names: Names of the groups to read in detail. All groups are read if not provided.
+        :type group_names: collections.abc.Iterable
+        :return: Dict holding "entities" and "groups" (mapping names to IDs), "entity_details" and "group_details"
+            (mapping the names of the entities and groups read in detail to their normalized fields) and
+            "entity_aliases" (mapping (name, mount accessor) pairs to the alias's "id" and "canonical_id").
+        :rtype: dict
+        """
+        entities = {info.get('name'): entity_id for entity_id, info in self._list(self.identity.list_entities).items()}
+        groups = {info.get('name'): group_id for group_id, info in self._list(self.identity.list_groups).items()}
+        entity_aliases = {
+            (info.get('name'), info.get('mount_accessor')): {'id': alias_id, 'canonical_id': info.get('canonical_id')}
+            for alias_id, info in self._list(self.identity.list_entity_aliases).items()
+        }
+
+        if entity_names is not None:
+            entity_names = [name for name in entity_names if name in entities]
+        else:
+            entity_names = list(entities)
+        if group_names is not None:
+            group_names = [name for name in group_names if name in groups]
+        else:
+            group_names = list(groups)
+        entity_reads = self._read_all(self.identity.read_entity, [entities[name] for name in entity_names])
+        group_reads = self._read_all(self.identity.read_group, [groups[name] for name in group_names])
+
+        entity_details = {}
+        for name in entity_names:
+            data = entity_reads[entities[name]]
+            entity_details[name] = {field: normalize_field(field, data.get(field)) for field in ENTITY_FIELDS}
+        group_details = {}
+        for name in group_names:
+            data = group_reads[groups[name]]
+            details = {field: normalize_field(field, data.get(field)) for field in GROUP_FIELDS}
+            alias = data.get('alias') or {}
+            details.update({
+                'type': data.get('type') or 'internal',
+                'member_entity_ids': sorted(data.get('member_entity_ids') or []),
+                'member_group_ids': sorted(data.get('member_group_ids') or []),
+                'alias': (alias['id'], alias.get('name'), alias.get('mount_accessor')) if alias.get('id') else None,
+            })
+            group_details[name] = details
+
+        return {
+            'entities': entities,
+            'groups': groups,
+            'entity_aliases': entity_aliases,
+            'entity_details': entity_details,
+            'group_details': group_details,
+        }
+
+    @staticmethod
+    def _index_by_name(objects, kind):
+        indexed = {}
+        for obj in objects:
+            if obj['name'] in indexed:
+                raise exceptions.ParamValidationError('duplicate {kind} name "{name}" in desired state'.format(
+                    kind=kind,
+                    name=obj['name'],
+                ))
+            indexed[obj['name']] = obj
+        return indexed
+
+    def plan(self, entities=(), groups=(), state=None):
+        """Compute the changes required to reach a desired state.
+
+        :param entities: The desired entities, as dicts described in the class docstring.
+        :type entities: list[dict]
+        :param groups: The desired groups, as dicts described in the class docstring.
+        :type groups: list[dict]
+        :param state: The current state, as returned by :py:meth:`fetch_state`. Fetched if not provided.
+        :type state: dict
+        :return: The changes to apply.
+        :rtype: IdentitySyncPlan
+        """
+        desired_entities = self._index_by_name(entities, 'entity')
+        desired_groups = self._index_by_name(groups, 'group')
+        if state is None:
+            state = self.fetch_state(entity_names=desired_entities, group_names=desired_groups)
+
+        plan = IdentitySyncPlan()
+        plan.entity_ids = dict(state['entities'])
+        plan.group_ids = dict(state['groups'])
+        self._plan_entities(plan, state, desired_entities)
+        self._plan_groups(plan, state, desired_entities, desired_groups)
+
+        if self.delete_missing:
+            plan.group_deletes = {
+                name: group_id for name, group_id in state['groups'].items() if name not in desired_groups
+            }
+            plan.entity_deletes = {
+                name: entity_id for name, entity_id in state['entities'].items() if name not in desired_entities
+            }
+        return plan
+
+    def _plan_entities(self, plan, state, desired_entities):
+        aliases_by_entity_id = {}
+        for key, alias in state['entity_aliases'].items():
+            aliases_by_entity_id.setdefault(alias['canonical_id'], {})[key] = alias['id']
+
+        for name, desired in desired_entities.items():
+            current = state['entity_details'].get(name)
+            changes = {}
+            for field in ENTITY_FIELDS:
+                if field in desired:
+                    value = normalize_field(field, desired[field])
+                    if current is None or current[field] != value:
+                        changes[field] = value
+            if current is None or changes:
+                plan.entity_writes[name] = changes
+
+            if 'aliases' not in desired:
+                continue
+            entity_id = state['entities'].get(name)
+            desired_aliases = {(alias['name'], alias['mount_accessor']) for alias in desired['aliases']}
+            for key in desired_aliases:
+                if key in plan.entity_alias_writes:
+                    raise exceptions.ParamValidationError('alias "{alias}" desired for more than one entity'.format(
+                        alias=key[0],
+                    ))
+                alias = state['entity_aliases'].get(key)
+                if alias is None:
+                    plan.entity_alias_writes[key] = (name, None)
+                elif entity_id is None or alias['canonical_id'] != entity_id:
+                    plan.entity_alias_writes[key] = (name, alias['id'])
+            if entity_id is not None:
+                for key, alias_id in aliases_by_entity_id.get(entity_id, {}).items():
+                    if key not in desired_aliases:
+                        plan.entity_alias_deletes.add(alias_id)
+
+        # Aliases moving to another entity are updated in place rather than deleted from their current entity.
+        plan.entity_alias_deletes -= {alias_id for _, alias_id in plan.entity_alias_writes.values()}
+
+    def _plan_groups(self, plan, state, desired_entities, desired_groups):
+        entity_names_by_id = {entity_id: name for name, entity_id in state['entities'].items()}
+        group_names_by_id = {group_id: name for name, group_id in state['groups'].items()}
+
+        for name, desired in desired_groups.items():
+            current = state['group_details'].get(name)
+            if current is not None and current['type'] != desired.get('type', 'internal'):
+                plan.group_replacements[name] = state['groups'][name]
+
+        group_writes = {}
+        for name, desired in desired_groups.items():
+            group_type = desired.get('type', 'internal')
+            current = None if name in plan.group_replacements else state['group_details'].get(name)
+
+            changes = {}
+            for field in GROUP_FIELDS:
+                if field in desired:
+                    value = normalize_field(field, desired[field])
+                    if current is None or current[field] != value:
+                        changes[field] = value
+            for field, known_names, names_by_id in (
+                ('member_entity_names', set(desired_entities) | set(state['entities']), entity_names_by_id),
+                ('member_group_names', set(desired_groups) | set(state['groups']), group_names_by_id),
+            ):
+                if field not in desired:
+                    continue
+                if group_type == 'external':
+                    raise exceptions.ParamValidationError('{field} cannot be set for external group "{name}"'.format(
+                        field=field,
+                        name=name,
+                    ))
+                value = sorted(set(desired[field]))
+                unknown = [member for member in value if member not in known_names]
+                if unknown:
+                    raise exceptions.ParamValidationError('unknown {field} for group "{name}": {unknown}'.format(
+                        field=field,
+                        name=name,
+                        unknown=', '.join(unknown),
+                    ))
+                current_ids = current[field.replace('_names', '_ids')] if current is not None else []
+                current_names = sorted(names_by_id.get(member_id, member_id) for member_id in current_ids)
+                # Replaced groups lose their memberships, so groups they belong to must be written again.
+                if current_names != value or any(member in plan.group_replacements for member in value):
+                    changes[field] = value
+            if current is None or changes:
+                changes['type'] = group_type
+                group_writes[name] = changes
+
+            if desired.get('alias'):
+                if group_type != 'external':
+                    raise exceptions.ParamValidationError('alias can only be set for external group "{name}"'.format(
+                        name=name,
+                    ))
+                alias_key = (desired['alias']['name'], desired['alias']['mount_accessor'])
+                current_alias = current['alias'] if current is not None else None
+                if current_alias is None or current_alias[1:] != alias_key:
+                    plan.group_alias_writes[name] = alias_key + (current_alias[0] if current_alias else None,)
+
+        # Groups are written in levels so that member groups created by the plan have IDs by the time they are needed.
+        pending = dict(group_writes)
+        created = set(name for name in group_writes if name not in state['groups'] or name in plan.group_replacements)
+        while pending:
+            level = {
+                name: changes for name, changes in pending.items()
+                if not any(member in created and member in pending for member in changes.get('member_group_names', []))
+            }
+            if not level:
+                raise exceptions.ParamValidationError('cyclic group membership between new groups: {names}'.format(
+                    names=', '.join(sorted(pending)),
+                ))
+            plan.group_write_levels.append(level)
+            for name in level:
+                del pending[name]
+
+    def apply(self, plan):
+        """Apply the changes of a plan.
+
+        Changes are sent concurrently in dependency order: replaced groups are deleted, then entities are written, then
+        entity aliases are written and deleted, then groups are written level by level, then group aliases are written
+        and finally missing groups and entities are deleted. A failed change does not stop the others, although changes
+        depending on an entity or group that failed to be written are skipped.
+
+        :param plan: The changes to apply, as returned by :py:meth:`plan`.
+        :type plan: IdentitySyncPlan
+        :return: Dict holding the number of changes "applied" and "errors" mapping (change kind, name) pairs to the
+            exception raised by each failed or skipped change.
+        :rtype: dict
+        """
+        errors = {}
+        applied = [0]
+        entity_ids = dict(plan.entity_ids)
+        group_ids = dict(plan.group_ids)
+        identity = self.identity
+        mount_point = self.mount_point
+
+        def run(kind, func, items):
+            results = utils.map_concurrently(func=func, items=items, max_workers=self.max_workers)
+            for item, result in results.items():
+                if isinstance(result, Exception):
+                    errors[(kind, item)] = result
+                else:
+                    applied[0] += 1
+            return results
+
+        def created_id(response, read_by_name, name):
+            if isinstance(response, dict) and (response.get('data') or {}).get('id'):
+                return response['data']['id']
+            return read_by_name(name=name, mount_point=mount_point)['data']['id']
+
+        def require(ids, kind, name):
+            if name not in ids:
+                raise exceptions.ParamValidationError('{kind} "{name}" was not written'.format(kind=kind, name=name))
+            return ids[name]
+
+        run('delete_group', lambda name: identity.delete_group(plan.group_replacements[name], mount_point=mount_point),
+            plan.group_replacements)
+        for name in plan.group_replacements:
+            group_ids.pop(name, None)
+
+        def write_entity(name):
+            response = identity.create_or_update_entity_by_name(name=name, mount_point=mount_point,
+                                                                **plan.entity_writes[name])
+            if name not in entity_ids:
+                entity_ids[name] = created_id(response, identity.read_entity_by_name, name)
+
+        run('write_entity', write_entity, plan.entity_writes)
+
+        def write_entity_alias(key):
+            entity_name, alias_id = plan.entity_alias_writes[key]
+            canonical_id = require(entity_ids, 'entity', entity_name)
+            if alias_id is None:
+                identity.create_or_update_entity_alias(name=key[0], canonical_id=canonical_id, mount_accessor=key[1],
+                                                       mount_point=mount_point)
+            else:
+                identity.update_entity_alias(alias_id=alias_id, name=key[0], canonical_id=canonical_id,
+                                             mount_accessor=key[1], mount_point=mount_point)
+
+        run('write_entity_alias', write_entity_alias, plan.entity_alias_writes)
+        run('delete_entity_alias', lambda alias_id: identity.delete_entity_alias(alias_id, mount_point=mount_point),
+            plan.entity_alias_deletes)
+
+        def write_group(level, name):
+            changes = dict(level[name])
+            if 'member_entity_names' in changes:
+                changes['member_entity_ids'] = [
+                    require(entity_ids, 'entity', member) for member in changes.pop('member_entity_names')
+                ]
+            if 'member_group_names' in changes:
+                changes['member_group_ids'] = [
+                    require(group_ids, 'group', member) for member in changes.pop('member_group_names')
+                ]
+            response = identity.create_or_update_group_by_name(name=name, group_type=changes.pop('type'),
+                                                               mount_point=mount_point, **changes)
+            if name not in group_ids:
+                group_ids[name] = created_id(response, identity.read_group_by_name, name)
+
+        for level in plan.group_write_levels:
+            run('write_group', lambda name, level=level: write_group(level, name), level)
+
+        def write_group_alias(name):
+            alias_name, mount_accessor, alias_id = plan.group_alias_writes[name]
+            identity.create_or_update_group_alias(name=alias_name, alias_id=alias_id, mount_accessor=mount_accessor,
+                                                  canonical_id=require(group_ids, 'group', name),
+                                                  mount_point=mount_point)
+
+        run('write_group_alias', write_group_alias, plan.group_alias_writes)
+        run('delete_group', lambda name: identity.delete_group(plan.group_deletes[name], mount_point=mount_point),
+            plan.group_deletes)
+        run('delete_entity', lambda name: identity.delete_entity(plan.entity_deletes[name], mount_point=mount_point),
+            plan.entity_deletes)
+
+        if errors:
+            logger.warning('%d of %d identity changes failed', len(errors), len(errors) + applied[0])
+        return {'applied': applied[0], 'errors': errors}
+
+    def sync(self, entities=(), groups=()):
+        """Compute and apply the changes required to reach a desired state.
+
+        :param entities: The desired entities, as dicts described in the class docstring.
+        :type entities: list[dict]
+        :param groups: The desired groups, as dicts described in the class docstring.
+        :type groups: list[dict]
+        :return: The result of :py:meth:`apply`.
+        :rtype: dict
+        """
+        return self.apply(self.plan(entities=entities, groups=groups))
@@ -0,0 +1,446 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Request Instrumentation
+
+Middleware recording the latency and size of each request sent by an adapter, along with sinks exporting these
+measurements as in-memory histograms, Prometheus text or log records.
+
+"""
+import logging
+import re
+import threading
+import time
+from collections import namedtuple
+
+import requests.adapters
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from hvac.middleware import Middleware
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Path segments following a secrets engine's mount that name an operation (KV v2, Transit, PKI, Database, SSH, TOTP
+# and the cloud credential engines), as opposed to being part of a caller chosen secret path such as a KV v1 key.
+SECRETS_ENGINE_OPERATIONS = (
+    'data', 'metadata', 'delete', 'undelete', 'destroy', 'subkeys', 'config',
+    'keys', 'encrypt', 'decrypt', 'rewrap', 'datakey', 'random', 'hash', 'hmac', 'sign', 'verify', 'export', 'backup',
+    'restore', 'cache-config',
+    'issue', 'sign-verbatim', 'sign-self-issued', 'revoke', 'roles', 'cert', 'certs', 'ca', 'ca_chain', 'crl', 'root',
+    'intermediate', 'tidy', 'issuer', 'issuers', 'key',
+    'creds', 'static-creds', 'static-roles', 'rotate-root', 'rotate-role', 'reset', 'sts', 'roleset', 'rolesets',
+    'static-account', 'static-accounts', 'token', 'lookup', 'code',
+)
+_OPERATIONS_PATTERN = '|'.join(re.escape(operation) for operation in SECRETS_ENGINE_OPERATIONS)
+
+# Ordered (pattern, template) pairs mapping the path of a request to a low-cardinality template. Templates are expanded
+# with re.Match.expand, so may refer to the pattern's groups. Paths below a mount are only kept up to a known operation
+# segment, so that secret paths never end up in metric labels.
+DEFAULT_PATH_TEMPLATES = [
+    (r'^v1/sys/leases/(lookup|renew|revoke|revoke-force|revoke-prefix|tidy)(?:/.*)?$', r'/v1/sys/leases/\1'),
+    (r'^v1/sys/(policy|policies/acl|policies/password|policies/rgp|policies/egp|mounts|auth|audit|namespaces'
+     r'|plugins/catalog(?:/[^/]+)?|quotas/rate-limit|raw|wrapping/lookup)/.+$', r'/v1/sys/\1/{name}'),
+    (r'^v1/sys/(.+)$', r'/v1/sys/\1'),
+    (r'^v1/identity/(entity|entity-alias|group|group-alias)/(id|name)/.+$', r'/v1/identity/\1/\2/{id}'),
+    (r'^v1/identity/(.+)$', r'/v1/identity/\1'),
+    (r'^v1/auth/token/(lookup-self|renew-self|revoke-self|lookup-accessor|lookup|renew-accessor|renew'
+     r'|revoke-accessor|revoke-orphan|revoke|create-orphan|create|tidy|accessors|roles)(?:/.*)?$', r'/v1/auth/token/\1'),
+    (r'^v1/auth/.+?/login(?:/.*)?$', r'/v1/auth/{mount}/login'),
+    (r'^v1/auth/[^/]+/([^/]+)/.+$', r'/v1/auth/{mount}/\1/{name}'),
+    (r'^v1/auth/[^/]+/([^/]+)$', r'/v1/auth/{mount}/\1'),
+    (r'^v1/[^/]+/(' + _OPERATIONS_PATTERN + r')/.+$', r'/v1/{mount}/\1/{path}'),
+    (r'^v1/[^/]+/(' + _OPERATIONS_PATTERN + r')$', r'/v1/{mount}/\1'),
+    (r'^v1/[^/]+/.+$', r'/v1/{mount}/{path}'),
+    (r'^v1/[^/]+$', r'/v1/{mount}'),
+]
+
+_connect_timings = threading.local()
+
+RequestSample = namedtuple('RequestSample', [
+    'method',
+    'path',
+    'status',
+    'connect_time',
+    'ttfb',
+    'total_time',
+    'request_bytes',
+    'response_bytes',
+])
+RequestSample.__doc__ = """Measurements of a single request.
+
+The status is the response's status code, or the name of the exception raised if no response was received. The
+connect_time is None if the request reused an already open connection. All times are in seconds.
+"""
+
+
+class _TimedConnectionMixin(object):
+    """Record the time spent opening connections for the current thread."""
+
+    def connect(self):
+        started_at = time.time()
+        try:
+            super(_TimedConnectionMixin, self).connect()
+        finally:
+            _connect_timings.seconds = (getattr(_connect_timings, 'seconds', None) or 0) + time.time() - started_at
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(requests.adapters.HTTPAdapter):
+    """A transport adapter for Requests sessions whose connections record how long they took to open.
+
+    Mounted on the sessions created by :py:class:`hvac.adapters.Adapter` so that
+    :py:class:`InstrumentationMiddleware` can report connect times.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(TimedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class PathTemplater(object):
+    """Map request paths to templates, e.g. "v1/secret/data/my/app" to "/v1/{mount}/data/{path}"."""
+
+    def __init__(self, templates=None):
+        """Create a new path templater.
+
+        :param templates: Additional (pattern, template) pairs, tried before DEFAULT_PATH_TEMPLATES.
+        :type templates: list[tuple[str, str]]
+        """
+        self.templates = [
+            (re.compile(pattern), template)
+            for pattern, template in list(templates or []) + DEFAULT_PATH_TEMPLATES
+        ]
+
+    def __call__(self, path):
+        """Determine the template of a request path.
+
+        :param path: The partial URL path of a request.
+        :type path: str
+        :return: The path's template, or the path itself if no template matches.
+        :rtype: str
+        """
+        path = path.split('?', 1)[0].strip('/')
+        for pattern, template in self.templates:
+            match = pattern.match(path)
+            if match:
+                return match.expand(template)
+        return '/' + path
+
+
+class InstrumentationMiddleware(Middleware):
+    """Middleware measuring each request and passing the resulting :py:class:`RequestSample` to a set of sinks.
+
+    Connect times are only measured for sessions created by hvac; a session passed in by the caller always reports a
+    connect_time of None.
+    """
+
+    def __init__(self, sinks, templates=None):
+        """Create a new instrumentation middleware.
+
+        :param sinks: Objects with a record(sample) method, e.g. HistogramSink, PrometheusSink or LoggingSink.
+        :type sinks: list
+        :param templates: Additional (pattern, template) pairs used to template request paths.
+        :type templates: list[tuple[str, str]]
+        """
+        self.sinks = list(sinks)
+        self.template_path = PathTemplater(templates=templates)
+
+    def handle(self, request, send):
+        """Send a request, recording its measurements with each sink.
+
+        :param request: The request to send.
+        :type request: hvac.middleware.RequestContext
+        :param send: Callable sending the request through the remaining middleware.
+        :type send: callable
+        :return: The response of the request.
+        :rtype: requests.Response
+        """
+        _connect_timings.seconds = None
+        started_at = time.time()
+        try:
+            response = send(request)
+        except Exception as error:
+            self.record(request, status=error.__class__.__name__, total_time=time.time() - started_at)
+            raise
+
+        total_time = time.time() - started_at
+        if request.kwargs.get('stream'):
+            response_bytes = int(response.headers.get('Content-Length') or 0)
+        else:
+            response_bytes = len(response.content or b'')
+        self.record(
+            request,
+            status=response.status_code,
+            total_time=total_time,
+            ttfb=response.elapsed.total_seconds(),
+            request_bytes=self.get_body_size(getattr(response.request, 'body', None)),
+            response_bytes=response_bytes,
+        )
+        return response
+
+    @staticmethod
+    def get_body_size(body):
+        """Determine the size of a prepared request body.
+
+        :param body: The body of a prepared request.
+        :type body: bytes | str | None
+        :return: Size of the body in bytes, or 0 if unknown (e.g. streamed file bodies).
+        :rtype: int
+        """
+        if isinstance(body, bytes):
+            return len(body)
+        if isinstance(body, str):
+            return len(body.encode('utf-8'))
+        return 0
+
+    def record(self, request, status, total_time, ttfb=None, request_bytes=0, response_bytes=0):
+        """Build a sample from a request's measurements and pass it to each sink."""
+        sample = RequestSample(
+            method=request.method.upper(),
+            path=self.template_path(request.path),
+            status=status,
+            connect_time=getattr(_connect_timings, 'seconds', None),
+            ttfb=ttfb,
+            total_time=total_time,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+        )
+        for sink in self.sinks:
+            try:
+                sink.record(sample)
+            except Exception:
+                logger.exception('Error recording request sample with %r', sink)
+
+
+class Histogram(object):
+    """A cumulative histogram of observed values."""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        """Create a new histogram.
+
+        :param buckets: Upper bounds of the histogram's buckets, in ascending order.
+        :type buckets: collections.abc.Sequence[float]
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """Record an observed value.
+
+        :param value: The value observed.
+        :type value: int | float
+        """
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self):
+        """Export the histogram.
+
+        :return: The histogram's cumulative "buckets" as (upper bound, count) pairs, its "sum" and its "count".
+        :rtype: dict
+        """
+        return {
+            'buckets': list(zip(self.buckets, self.counts)),
+            'sum': self.sum,
+            'count': self.count,
+        }
+
+
+class HistogramSink(object):
+    """Aggregate request samples into in-memory histograms, grouped by method, templated path and status."""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        """Create a new histogram sink.
+
+        :param buckets: Upper bounds, in seconds, of the latency histograms' buckets.
+        :type buckets: collections.abc.Sequence[float]
+        """
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, sample):
+        """Add a sample to the histograms.
+
+        :param sample: The sample to add.
+        :type sample: RequestSample
+        """
+        key = (sample.method, sample.path, str(sample.status))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    'total_time': Histogram(self.buckets),
+                    'ttfb': Histogram(self.buckets),
+                    'connect_time': Histogram(self.buckets),
+                    'request_bytes': 0,
+                    'response_bytes': 0,
+                }
+            series['total_time'].observe(sample.total_time)
+            if sample.ttfb is not None:
+                series['ttfb'].observe(sample.ttfb)
+            if sample.connect_time is not None:
+                series['connect_time'].observe(sample.connect_time)
+            series['request_bytes'] += sample.request_bytes
+            series['response_bytes'] += sample.response_bytes
+
+    def snapshot(self):
+        """Export the current state of every histogram.
+
+        :return: Mapping of (method, path, status) to a dict with "total_time", "ttfb" and "connect_time" histograms
+            (see Histogram.to_dict) and the "request_bytes" and "response_bytes" sent and received.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                key: {
+                    name: value.to_dict() if isinstance(value, Histogram) else value
+                    for name, value in series.items()
+                }
+                for key, series in self._series.items()
+            }
+
+    def reset(self):
+        """Discard all recorded samples."""
+        with self._lock:
+            self._series.clear()
+
+
+class PrometheusSink(HistogramSink):
+    """A HistogramSink able to render its histograms in the Prometheus text exposition format."""
+
+    METRICS = [
+        ('total_time', 'request_duration_seconds', 'Total time taken by requests to Vault.'),
+        ('ttfb', 'request_ttfb_seconds', 'Time until the response headers of requests to Vault were received.'),
+        ('connect_time', 'request_connect_seconds', 'Time spent opening connections to Vault.'),
+    ]
+    COUNTERS = [
+        ('request_bytes', 'request_bytes_total', 'Bytes sent in the bodies of requests to Vault.'),
+        ('response_bytes', 'response_bytes_total', 'Bytes received in the bodies of responses from Vault.'),
+    ]
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS, prefix='hvac'):
+        """Create a new Prometheus sink.
+
+        :param buckets: Upper bounds, in seconds, of the latency histograms' buckets.
+        :type buckets: collections.abc.Sequence[float]
+        :param prefix: Prefix of each metric's name.
+        :type prefix: str
+        """
+        super(PrometheusSink, self).__init__(buckets=buckets)
+        self.prefix = prefix
+
+    @staticmethod
+    def format_labels(method, path, status, le=None):
+        """Format and escape the labels of a metric."""
+        labels = [('method', method), ('path', path), ('status', status)]
+        if le is not None:
+            labels.append(('le', le))
+        return ','.join(
+            '{name}="{value}"'.format(
+                name=name,
+                value=str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'),
+            )
+            for name, value in labels
+        )
+
+    def render(self):
+        """Render the recorded metrics.
+
+        :return: The metrics in the Prometheus text exposition format.
+        :rtype: str
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for field, name, description in self.METRICS:
+            metric = '{prefix}_{name}'.format(prefix=self.prefix, name=name)
+            lines.append('# HELP {metric} {description}'.format(metric=metric, description=description))
+            lines.append('# TYPE {metric} histogram'.format(metric=metric))
+            for (method, path, status), series in sorted(snapshot.items()):
+                histogram = series[field]
+                for upper_bound, count in histogram['buckets'] + [('+Inf', histogram['count'])]:
+                    lines.append('{metric}_bucket{{{labels}}} {count}'.format(
+                        metric=metric,
+                        labels=self.format_labels(method=method, path=path, status=status, le=upper_bound),
+                        count=count,
+                    ))
+                labels = self.format_labels(method=method, path=path, status=status)
+                lines.append('{metric}_sum{{{labels}}} {value}'.format(metric=metric, labels=labels, value=histogram['sum']))
+                lines.append('{metric}_count{{{labels}}} {value}'.format(metric=metric, labels=labels, value=histogram['count']))
+        for field, name, description in self.COUNTERS:
+            metric = '{prefix}_{name}'.format(prefix=self.prefix, name=name)
+            lines.append('# HELP {metric} {description}'.format(metric=metric, description=description))
+            lines.append('# TYPE {metric} counter'.format(metric=metric))
+            for (method, path, status), series in sorted(snapshot.items()):
+                lines.append('{metric}{{{labels}}} {value}'.format(
+                    metric=metric,
+                    labels=self.format_labels(method=method, path=path, status=status),
+                    value=series[field],
+                ))
+        return '\n'.join(lines) + '\n'
+
+
+class LoggingSink(object):
+    """Pass each request sample to a callback, or log it if no callback is provided."""
+
+    def __init__(self, callback=None, logger=logger, level=logging.DEBUG):
+        """Create a new logging sink.
+
+        :param callback: Optional callable accepting each RequestSample.
+        :type callback: callable
+        :param logger: Logger samples are logged with when no callback is provided.
+        :type logger: logging.Logger
+        :param level: Level samples are logged at when no callback is provided.
+        :type level: int
+        """
+        self.callback = callback
+        self.logger = logger
+        self.level = level
+
+    def record(self, sample):
+        """Handle a request sample.
+
+        :param sample: The sample to handle.
+        :type sample: RequestSample
+        """
+        if self.callback is not None:
+            self.callback(sample)
+            return
+        self.logger.log(
+            self.level,
+            '%s %s %s total=%.6fs ttfb=%s connect=%s sent=%dB received=%dB',
+            sample.method,
+            sample.path,
+            sample.status,
+            sample.total_time,
+            'n/a' if sample.ttfb is None else '{0:.6f}s'.format(sample.ttfb),
+            'n/a' if sample.connect_time is None else '{0:.6f}s'.format(sample.connect_time),
+            sample.request_bytes,
+            sample.response_bytes,
+        )
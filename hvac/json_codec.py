@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+JSON Codecs
+
+Codecs used by adapters to encode request bodies and decode response bodies. The stdlib json module is always
+available, while the faster orjson and ujson codecs can be used when the corresponding package is installed (e.g.
+`pip install hvac[orjson]`). These packages are only imported once a codec using them is created.
+
+"""
+import json
+
+from hvac import exceptions
+
+
+def _is_installed(module_name):
+    """Determine whether a module can be imported, without importing it."""
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        # Python 2
+        import imp
+        try:
+            imp.find_module(module_name)
+        except ImportError:
+            return False
+        return True
+    return find_spec(module_name) is not None
+
+
+has_orjson = _is_installed('orjson')
+has_ujson = _is_installed('ujson')
+
+
+class JSONCodec(object):
+    """Base class for JSON codecs. Subclasses encode to and decode from UTF-8 encoded bytes."""
+
+    name = None
+
+    def dumps(self, obj):
+        """Encode an object as JSON.
+
+        :param obj: The object to encode.
+        :type obj: object
+        :return: The UTF-8 encoded JSON document.
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def loads(self, data):
+        """Decode a JSON document.
+
+        :param data: The UTF-8 encoded JSON document.
+        :type data: bytes
+        :return: The decoded object.
+        :rtype: object
+        :raises: ValueError if the document is not valid JSON.
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return '<{cls}>'.format(cls=self.__class__.__name__)
+
+
+class StdlibJSONCodec(JSONCodec):
+    """Codec using the standard library's json module, matching the encoding performed by Requests."""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj, allow_nan=False).encode('utf-8')
+
+    def loads(self, data):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec using orjson."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError:
+            raise ImportError('orjson is required to use {cls}'.format(cls=self.__class__.__name__))
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class UjsonCodec(JSONCodec):
+    """Codec using ujson."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        try:
+            import ujson
+        except ImportError:
+            raise ImportError('ujson is required to use {cls}'.format(cls=self.__class__.__name__))
+        self._ujson = ujson
+        self.loads = ujson.loads
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+CODECS = {
+    StdlibJSONCodec.name: StdlibJSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+}
+
+
+def get_codec(codec=None):
+    """Resolve a JSON codec.
+
+    :param codec: A codec instance, the name of a codec ("json", "orjson" or "ujson"), or "auto" to use the fastest
+        codec installed. The stdlib json codec is used if not provided.
+    :type codec: JSONCodec | str | None
+    :return: The codec.
+    :rtype: JSONCodec
+    """
+    if codec is None:
+        return StdlibJSONCodec()
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec == 'auto':
+        for codec_class in (OrjsonCodec, UjsonCodec):
+            try:
+                return codec_class()
+            except ImportError:
+                pass
+        return StdlibJSONCodec()
+    if codec not in CODECS:
+        raise exceptions.ParamValidationError('unsupported JSON codec "{codec}", expected one of: auto, {names}'.format(
+            codec=codec,
+            names=', '.join(sorted(CODECS)),
+        ))
+    return CODECS[codec]()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Background renewal of tokens and leases."""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from hvac import exceptions, utils
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RENEW_FRACTION = 2.0 / 3.0
+DEFAULT_RETRY_INTERVAL = 5
+DEFAULT_BATCH_WINDOW = 1
+
+
+class TokenLifecycleManager(object):
+    """Keep a client's token valid by renewing it, or logging in again, on a background thread.
+
+    The token's remaining TTL is looked up when the manager is started. Once renew_fraction of the TTL has elapsed, the
+    token is renewed via :py:meth:`hvac.v1.Client.renew_self_token`. If the token is not renewable, a renewal fails, or
+    a renewal no longer extends the token's TTL (i.e., it is approaching its max TTL), the login callable is invoked to
+    obtain a new token instead. Failed attempts are retried every retry_interval seconds until the token expires.
+    Tokens without a TTL (e.g. root tokens) are left alone.
+    """
+
+    def __init__(self, client, login=None, renew_fraction=DEFAULT_RENEW_FRACTION, increment=None,
+                 retry_interval=DEFAULT_RETRY_INTERVAL, on_error=None):
+        """Create a new token lifecycle manager.
+
+        :param client: The client whose token is to be managed.
+        :type client: hvac.v1.Client
+        :param login: Optional callable accepting the client and logging it in, e.g.
+            ``lambda client: client.auth.kubernetes.login(role='hvac', jwt=jwt)``. The callable is expected to set the
+            client's token, which auth method login methods do by default.
+        :type login: callable
+        :param renew_fraction: The fraction of the token's TTL to wait before renewing it.
+        :type renew_fraction: float
+        :param increment: Optional TTL increment to request when renewing the token.
+        :type increment: str | int
+        :param retry_interval: The number of seconds to wait between failed renewal or login attempts.
+        :type retry_interval: int | float
+        :param on_error: Optional callable invoked with any exception raised while renewing the token or logging in.
+        :type on_error: callable
+        """
+        if not 0 < renew_fraction < 1:
+            raise exceptions.ParamValidationError('renew_fraction must be between 0 and 1, "{fraction}" provided'.format(
+                fraction=renew_fraction,
+            ))
+        self.client = client
+        self.login = login
+        self.renew_fraction = renew_fraction
+        self.increment = increment
+        self.retry_interval = retry_interval
+        self.on_error = on_error
+
+        self.ttl = None
+        self.renewable = False
+        self.expires_at = None
+        self._next_refresh_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Log in if the client has no token, look up the token's TTL and start the background renewal thread."""
+        if not self.client.token and self.login is not None:
+            self._login()
+        else:
+            self._lookup()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='hvac-token-lifecycle')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background renewal thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def refresh(self):
+        """Renew the token, or log in again where renewal is not possible. Called by the background thread."""
+        if self.renewable:
+            previous_ttl = self.ttl
+            try:
+                self._update(self.client.renew_self_token(increment=self.increment)['auth'])
+            except exceptions.VaultError as error:
+                if self.login is None:
+                    raise
+                logger.debug('unable to renew token, logging in again: %s', error)
+                self._login()
+                return
+            # Vault caps renewals at the token's max TTL; a shorter grant than requested means the cap was reached.
+            requested_ttl = None if self.increment is None else utils.parse_duration(self.increment)
+            if self.login is not None and self.ttl < (previous_ttl if requested_ttl is None else requested_ttl):
+                # Log in again once renew_fraction of what remains has elapsed.
+                self.renewable = False
+        elif self.login is not None:
+            self._login()
+        else:
+            raise exceptions.Unauthorized('token is not renewable and no login callable was provided')
+
+    def _run(self):
+        while self._next_refresh_at is not None:
+            if self._stop.wait(max(self._next_refresh_at - time.time(), 0)):
+                return
+            try:
+                self.refresh()
+            except Exception as error:
+                logger.warning('unable to refresh token: %s', error)
+                if self.on_error is not None:
+                    self.on_error(error)
+                if self.login is None and self.expires_at is not None and self.expires_at <= time.time():
+                    return
+                self._next_refresh_at = time.time() + self.retry_interval
+
+    def _login(self):
+        response = self.login(self.client)
+        if isinstance(response, dict) and response.get('auth'):
+            self._update(response['auth'])
+        else:
+            self._lookup()
+
+    def _lookup(self):
+        data = self.client.lookup_token()['data']
+        self._update({
+            'lease_duration': data.get('ttl', 0),
+            'renewable': data.get('renewable', False),
+        })
+
+    def _update(self, auth):
+        now = time.time()
+        self.ttl = auth.get('lease_duration', 0)
+        self.renewable = auth.get('renewable', False)
+        if self.ttl:
+            self.expires_at = now + self.ttl
+            self._next_refresh_at = now + self.ttl * self.renew_fraction
+        else:
+            self.expires_at = None
+            self._next_refresh_at = None
+
+
+class _Lease(object):
+    def __init__(self, lease_id, lease_duration, renewable, on_failure):
+        self.lease_id = lease_id
+        self.lease_duration = lease_duration
+        self.renewable = renewable
+        self.on_failure = on_failure
+        self.expires_at = None
+        self.renew_at = None
+
+
+class LeaseManager(object):
+    """Track dynamic secret leases and renew them in batches before they expire.
+
+    Leases are registered from the responses of methods such as
+    :py:meth:`hvac.api.secrets_engines.Database.generate_credentials` and kept in a heap ordered by the time they are
+    due for renewal, i.e. once renew_fraction of their lease duration has elapsed. A single scheduler thread wakes
+    when the earliest lease is due and renews it, along with every other lease due within batch_window seconds, via
+    :py:meth:`hvac.api.system_backend.Lease.renew_lease` on a bounded pool of worker threads.
+
+    Failed renewals are retried every retry_interval seconds while the lease remains valid. Once a lease can not be
+    renewed any further (it is not renewable, it has reached its max TTL, or it is about to expire after failed
+    renewals) it is no longer tracked and its on_failure callback is invoked with the lease ID and the last exception
+    raised, if any, so that the caller can request new credentials.
+    """
+
+    def __init__(self, client, renew_fraction=DEFAULT_RENEW_FRACTION, increment=None,
+                 batch_window=DEFAULT_BATCH_WINDOW, retry_interval=DEFAULT_RETRY_INTERVAL,
+                 max_workers=utils.DEFAULT_MAX_WORKERS, on_failure=None):
+        """Create a new lease manager.
+
+        :param client: The client used to renew and revoke leases.
+        :type client: hvac.v1.Client
+        :param renew_fraction: The fraction of a lease's duration to wait before renewing it.
+        :type renew_fraction: float
+        :param increment: Optional lease increment, in seconds, to request when renewing leases.
+        :type increment: int
+        :param batch_window: Leases due within this many seconds of one another are renewed together.
+        :type batch_window: int | float
+        :param retry_interval: The number of seconds to wait before retrying a failed renewal.
+        :type retry_interval: int | float
+        :param max_workers: The maximum number of renewal requests to have in flight at once.
+        :type max_workers: int
+        :param on_failure: Default callable invoked with (lease_id, error) when a lease can not be renewed any further.
+            error is None when the lease is not renewable or has reached its max TTL.
+        :type on_failure: callable
+        """
+        if not 0 < renew_fraction < 1:
+            raise exceptions.ParamValidationError('renew_fraction must be between 0 and 1, "{fraction}" provided'.format(
+                fraction=renew_fraction,
+            ))
+        self.client = client
+        self.renew_fraction = renew_fraction
+        self.increment = increment
+        self.batch_window = batch_window
+        self.retry_interval = retry_interval
+        self.max_workers = max_workers
+        self.on_failure = on_failure
+
+        self._leases = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = True
+        self._executor = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __len__(self):
+        return len(self._leases)
+
+    def __contains__(self, lease_id):
+        return lease_id in self._leases
+
+    def start(self):
+        """Start the scheduler thread and renewal worker pool."""
+        with self._condition:
+            self._stopped = False
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._thread = threading.Thread(target=self._run, name='hvac-lease-manager')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread and wait for in-flight renewals to complete. Leases are not revoked."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def register(self, response, on_failure=None):
+        """Track the lease included in a secret response.
+
+        :param response: The JSON response of a request returning a lease, e.g. generate_credentials.
+        :type response: dict
+        :param on_failure: Optional callable overriding the manager's on_failure callback for this lease.
+        :type on_failure: callable
+        :return: The ID of the registered lease.
+        :rtype: str
+        """
+        lease_id = response.get('lease_id')
+        if not lease_id:
+            raise exceptions.ParamValidationError('response does not include a lease_id')
+        lease = _Lease(
+            lease_id=lease_id,
+            lease_duration=response.get('lease_duration', 0),
+            renewable=response.get('renewable', False),
+            on_failure=on_failure,
+        )
+        with self._condition:
+            lease.expires_at = time.time() + lease.lease_duration
+            self._leases[lease_id] = lease
+            self._schedule(lease, delay=lease.lease_duration * self.renew_fraction)
+        return lease_id
+
+    def unregister(self, lease_id):
+        """Stop tracking a lease without revoking it.
+
+        :param lease_id: The ID of the lease.
+        :type lease_id: str
+        """
+        with self._condition:
+            self._leases.pop(lease_id, None)
+
+    def revoke(self, lease_id):
+        """Revoke a lease and stop tracking it.
+
+        :param lease_id: The ID of the lease.
+        :type lease_id: str
+        """
+        self.client.sys.revoke_lease(lease_id=lease_id)
+        self.unregister(lease_id)
+
+    def revoke_all(self):
+        """Revoke all tracked leases concurrently.
+
+        :return: Mapping of lease ID to the revocation response or the exception raised while revoking it.
+        :rtype: dict
+        """
+        with self._condition:
+            lease_ids = list(self._leases)
+        return utils.map_concurrently(self.revoke, lease_ids, max_workers=self.max_workers)
+
+    def _schedule(self, lease, delay):
+        lease.renew_at = min(time.time() + delay, lease.expires_at)
+        heapq.heappush(self._heap, (lease.renew_at, next(self._counter), lease))
+        self._condition.notify()
+
+    def _run(self):
+        with self._condition:
+            while not self._stopped:
+                now = time.time()
+                due = []
+                while self._heap and self._heap[0][0] <= now + self.batch_window:
+                    renew_at, _, lease = heapq.heappop(self._heap)
+                    # Skip entries for leases that were unregistered or have since been rescheduled.
+                    if self._leases.get(lease.lease_id) is lease and lease.renew_at == renew_at:
+                        due.append(lease)
+                if due:
+                    logger.debug('renewing a batch of %d leases', len(due))
+                    for lease in due:
+                        self._executor.submit(self._renew, lease)
+                    continue
+                timeout = self._heap[0][0] - self.batch_window - now if self._heap else None
+                self._condition.wait(timeout)
+
+    def _renew(self, lease):
+        error = None
+        if lease.renewable:
+            try:
+                response = self.client.sys.renew_lease(lease_id=lease.lease_id, increment=self.increment)
+            except Exception as renew_error:
+                error = renew_error
+            else:
+                lease_duration = response.get('lease_duration', 0)
+                # Vault caps renewals at the lease's max TTL; a shorter grant than requested means the cap was reached.
+                requested_duration = lease.lease_duration if self.increment is None else self.increment
+                renewable = response.get('renewable', False) and lease_duration >= requested_duration
+                with self._condition:
+                    if self._leases.get(lease.lease_id) is not lease:
+                        return
+                    lease.lease_duration = lease_duration
+                    lease.expires_at = time.time() + lease_duration
+                    if renewable:
+                        self._schedule(lease, delay=lease_duration * self.renew_fraction)
+                        return
+
+        with self._condition:
+            if self._leases.get(lease.lease_id) is not lease:
+                return
+            if error is not None and time.time() + self.retry_interval < lease.expires_at:
+                logger.warning('unable to renew lease %s, retrying: %s', lease.lease_id, error)
+                self._schedule(lease, delay=self.retry_interval)
+                return
+            # The lease can not be (further) renewed; stop tracking it and let the caller know.
+            del self._leases[lease.lease_id]
+
+        on_failure = lease.on_failure or self.on_failure
+        if on_failure is not None:
+            try:
+                on_failure(lease.lease_id, error)
+            except Exception:
+                logger.exception('on_failure callback for lease %s raised', lease.lease_id)
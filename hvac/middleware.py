@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Adapter Middleware
+
+Middleware registered on an :py:class:`hvac.adapters.Adapter` wraps each request the adapter sends, allowing behaviour
+such as header injection, tracing, metrics or caching to be layered on without subclassing the adapter.
+
+"""
+import functools
+
+
+class RequestContext(object):
+    """A request about to be sent by an adapter, as seen by its middleware.
+
+    Middleware may modify the method, url, headers and kwargs attributes before the request is sent. The state attribute
+    is a dict in which middleware may keep data of its own between hooks.
+    """
+
+    def __init__(self, method, url, path, base_uri, headers, kwargs, raise_exception=True, idempotent=False):
+        """Create a new request context.
+
+        :param method: HTTP method of the request.
+        :type method: str
+        :param url: Full URL the request will be sent to.
+        :type url: str
+        :param path: Normalized partial URL path of the request, e.g. "v1/secret/data/hvac".
+        :type path: str
+        :param base_uri: Base URL of the Vault node the request will be sent to.
+        :type base_uri: str
+        :param headers: Headers to send with the request.
+        :type headers: dict
+        :param kwargs: Additional keyword arguments for the requests call (timeout, json, params, etc.).
+        :type kwargs: dict
+        :param raise_exception: Whether the adapter raises an exception for an unsuccessful response status.
+        :type raise_exception: bool
+        :param idempotent: Whether the caller flagged the request as safe to repeat.
+        :type idempotent: bool
+        """
+        self.method = method
+        self.url = url
+        self.path = path
+        self.base_uri = base_uri
+        self.headers = headers
+        self.kwargs = kwargs
+        self.raise_exception = raise_exception
+        self.idempotent = idempotent
+        self.state = {}
+
+    def __repr__(self):
+        return '<RequestContext {method} {url}>'.format(method=self.method.upper(), url=self.url)
+
+
+class Middleware(object):
+    """Base class for adapter middleware.
+
+    Subclasses override any of the before_request, after_response and on_error hooks. Middleware needing full control
+    over how a request is sent (e.g. to send it more than once) may instead override handle.
+
+    Middleware is applied in the order it was registered: the first middleware's before_request hook runs first and its
+    after_response hook runs last. Responses reach after_response whatever their status code; exceptions for
+    unsuccessful statuses are raised by the adapter once all middleware has run.
+    """
+
+    def before_request(self, request):
+        """Called before a request is sent.
+
+        :param request: The request about to be sent.
+        :type request: RequestContext
+        :return: None to continue sending the request, or a response to return in its place without sending it.
+        :rtype: None | requests.Response
+        """
+        return None
+
+    def after_response(self, request, response):
+        """Called once a response has been received.
+
+        :param request: The request that was sent.
+        :type request: RequestContext
+        :param response: The response received.
+        :type response: requests.Response
+        :return: The response to hand back to the caller, usually the one received.
+        :rtype: requests.Response
+        """
+        return response
+
+    def on_error(self, request, error):
+        """Called if sending a request raised an exception.
+
+        :param request: The request that was sent.
+        :type request: RequestContext
+        :param error: The exception raised.
+        :type error: Exception
+        :return: None to re-raise the exception, or a response to return in its place.
+        :rtype: None | requests.Response
+        """
+        return None
+
+    def handle(self, request, send):
+        """Process a request by calling the hooks of this middleware around the rest of the chain.
+
+        :param request: The request to process.
+        :type request: RequestContext
+        :param send: Callable accepting a request context, which sends it through the remaining middleware.
+        :type send: callable
+        :return: The response to the request.
+        :rtype: requests.Response
+        """
+        response = self.before_request(request)
+        if response is None:
+            try:
+                response = send(request)
+            except Exception as error:
+                response = self.on_error(request, error)
+                if response is None:
+                    raise
+        return self.after_response(request, response)
+
+
+def build_chain(middleware, send):
+    """Compose middleware around a callable that sends requests.
+
+    :param middleware: Middleware to apply, outermost first.
+    :type middleware: list[Middleware]
+    :param send: Callable accepting a request context and returning its response.
+    :type send: callable
+    :return: Callable accepting a request context which passes it through each middleware before sending it.
+    :rtype: callable
+    """
+    for layer in reversed(middleware):
+        send = functools.partial(layer.handle, send=send)
+    return send
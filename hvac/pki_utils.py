@@ -0,0 +1,428 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Helpers built on top of the PKI secrets engine class."""
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from hvac import exceptions, utils
+from hvac.api.secrets_engines.pki import DEFAULT_MOUNT_POINT
+from hvac.lifecycle import DEFAULT_RENEW_FRACTION, DEFAULT_RETRY_INTERVAL
+
+try:
+    from cryptography import x509
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    from cryptography.x509.oid import NameOID
+    has_cryptography = True
+except ImportError:
+    has_cryptography = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_KEY_TYPE = 'rsa'
+DEFAULT_KEY_BITS = 2048
+
+# Key sizes accepted for locally generated keys, per key type.
+SUPPORTED_KEY_BITS = {
+    'rsa': (2048, 3072, 4096, 8192),
+    'ec': (224, 256, 384, 521),
+    'ed25519': (0, 256),
+}
+
+
+def generate_key_and_csr(common_name, key_type=DEFAULT_KEY_TYPE, key_bits=DEFAULT_KEY_BITS):
+    """Generate a private key and a certificate signing request for it.
+
+    RSA and EC keys are encoded in the same PEM formats Vault uses for the keys it generates (PKCS #1 and SEC 1
+    respectively), Ed25519 keys as PKCS #8. Requires the cryptography package (e.g. `pip install hvac[cryptography]`).
+
+    :param common_name: The CN to include in the CSR's subject.
+    :type common_name: str | unicode
+    :param key_type: The type of key to generate; rsa, ec or ed25519.
+    :type key_type: str | unicode
+    :param key_bits: The number of bits of RSA keys, or the size of the curve of EC keys. Ignored for ed25519 keys.
+    :type key_bits: int
+    :return: The PEM encoded private key and CSR.
+    :rtype: tuple[str, str]
+    """
+    if not has_cryptography:
+        raise ImportError('cryptography is required for local key generation')
+    private_format = serialization.PrivateFormat.TraditionalOpenSSL
+    algorithm = hashes.SHA256()
+    if key_type == 'rsa':
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_bits, backend=default_backend())
+    elif key_type == 'ec':
+        curve = {224: ec.SECP224R1, 256: ec.SECP256R1, 384: ec.SECP384R1, 521: ec.SECP521R1}[key_bits]
+        private_key = ec.generate_private_key(curve(), backend=default_backend())
+    elif key_type == 'ed25519':
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        private_format = serialization.PrivateFormat.PKCS8
+        algorithm = None
+    else:
+        error_msg = 'invalid key_type argument provided "{arg}", supported types: "{supported_types}"'
+        raise exceptions.ParamValidationError(error_msg.format(
+            arg=key_type,
+            supported_types=','.join(sorted(SUPPORTED_KEY_BITS)),
+        ))
+
+    csr = x509.CertificateSigningRequestBuilder().subject_name(
+        x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)]),
+    ).sign(private_key, algorithm, backend=default_backend())
+    private_key_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=private_format,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    return private_key_pem.decode('ascii'), csr.public_bytes(serialization.Encoding.PEM).decode('ascii')
+
+
+class CertificatePool(object):
+    """Keep a pool of certificates issued ahead of time for a role and common name, handing them out without waiting on
+    Vault.
+
+    A scheduler thread keeps pool_size unused certificates ready, issuing replacements on a bounded pool of worker
+    threads as certificates are handed out. Pooled certificates are discarded and replaced once renew_fraction of their
+    lifetime has elapsed, so that every certificate handed out has at least the remaining fraction of its lifetime left.
+    Failed issuance is retried every retry_interval seconds. If the pool is empty when a certificate is requested, e.g.
+    before it has first been filled, a certificate is issued on the calling thread instead.
+
+    By default certificates are issued with :py:meth:`hvac.api.secrets_engines.Pki.generate_certificate`, having Vault
+    generate the private key. With local_keys, private keys and CSRs are instead generated locally, on a pool of
+    processes, and signed with :py:meth:`hvac.api.secrets_engines.Pki.sign_certificate`; this requires the
+    cryptography package (e.g. `pip install hvac[cryptography]`).
+
+    Each certificate is only handed out once.
+    """
+
+    def __init__(self, pki, name, common_name, extra_params=None, pool_size=DEFAULT_POOL_SIZE,
+                 renew_fraction=DEFAULT_RENEW_FRACTION, local_keys=False, key_type=DEFAULT_KEY_TYPE,
+                 key_bits=DEFAULT_KEY_BITS, key_executor=None, key_workers=None, max_workers=utils.DEFAULT_MAX_WORKERS,
+                 retry_interval=DEFAULT_RETRY_INTERVAL, on_error=None, mount_point=DEFAULT_MOUNT_POINT):
+        """Create a new certificate pool.
+
+        :param pki: The Pki instance to send requests with, e.g. client.secrets.pki.
+        :type pki: hvac.api.secrets_engines.Pki
+        :param name: The name of the role to issue certificates against.
+        :type name: str | unicode
+        :param common_name: The requested CN for the certificates.
+        :type common_name: str | unicode
+        :param extra_params: A dictionary with extra parameters for each issue or sign request, e.g. alt_names or ttl.
+        :type extra_params: dict
+        :param pool_size: The number of unused certificates to keep ready.
+        :type pool_size: int
+        :param renew_fraction: The fraction of a pooled certificate's lifetime after which it is replaced.
+        :type renew_fraction: float
+        :param local_keys: Whether to generate private keys locally and have Vault sign CSRs for them.
+        :type local_keys: bool
+        :param key_type: The type of locally generated keys; rsa, ec or ed25519.
+        :type key_type: str | unicode
+        :param key_bits: The number of bits of locally generated RSA keys, or the size of the curve of EC keys.
+        :type key_bits: int
+        :param key_executor: Optional executor to generate local keys on, e.g. one shared by several pools. A
+            ProcessPoolExecutor of key_workers processes is created when the pool is started if not provided.
+        :type key_executor: concurrent.futures.Executor
+        :param key_workers: The number of processes generating local keys. Defaults to the number of CPUs.
+        :type key_workers: int
+        :param max_workers: The maximum number of issue or sign requests to have in flight at once.
+        :type max_workers: int
+        :param retry_interval: The number of seconds to wait before retrying after failing to issue a certificate.
+        :type retry_interval: int | float
+        :param on_error: Optional callable invoked with any exception raised while issuing a certificate in the
+            background.
+        :type on_error: callable
+        :param mount_point: The "path" the method/backend was mounted on.
+        :type mount_point: str | unicode
+        """
+        if not 0 < renew_fraction < 1:
+            raise exceptions.ParamValidationError('renew_fraction must be between 0 and 1, "{fraction}" provided'.format(
+                fraction=renew_fraction,
+            ))
+        if pool_size < 1:
+            raise exceptions.ParamValidationError('pool_size must be at least 1, "{size}" provided'.format(
+                size=pool_size,
+            ))
+        if local_keys:
+            if not has_cryptography:
+                raise ImportError('cryptography is required to generate keys locally')
+            if key_bits not in SUPPORTED_KEY_BITS.get(key_type, ()):
+                error_msg = 'invalid key_type and key_bits arguments provided "{key_type}", "{key_bits}"'
+                raise exceptions.ParamValidationError(error_msg.format(key_type=key_type, key_bits=key_bits))
+
+        self.pki = pki
+        self.name = name
+        self.common_name = common_name
+        self.extra_params = extra_params or {}
+        self.pool_size = pool_size
+        self.renew_fraction = renew_fraction
+        self.local_keys = local_keys
+        self.key_type = key_type
+        self.key_bits = key_bits
+        self.key_workers = key_workers
+        self.max_workers = max_workers
+        self.retry_interval = retry_interval
+        self.on_error = on_error
+        self.mount_point = mount_point
+
+        self._key_executor = key_executor
+        self._owns_key_executor = False
+        self._heap = []
+        self._counter = itertools.count()
+        self._pending = 0
+        self._retry_at = 0
+        self._condition = threading.Condition()
+        self._stopped = True
+        self._executor = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def start(self):
+        """Start the scheduler thread and issuance worker pools. The pool is filled in the background."""
+        if self.local_keys and self._key_executor is None:
+            self._key_executor = ProcessPoolExecutor(max_workers=self.key_workers)
+            self._owns_key_executor = True
+        with self._condition:
+            self._stopped = False
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._thread = threading.Thread(target=self._run, name='hvac-certificate-pool')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread and wait for in-flight issuance to complete. Pooled certificates are not revoked."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._owns_key_executor:
+            self._key_executor.shutdown(wait=True)
+            self._key_executor = None
+            self._owns_key_executor = False
+
+    def acquire(self):
+        """Take a certificate from the pool, issuing one on the calling thread if none is ready.
+
+        :return: The certificate, as in the "data" of :py:meth:`hvac.api.secrets_engines.Pki.generate_certificate`,
+            i.e. including its "certificate", "private_key", "private_key_type", "ca_chain", "serial_number" and
+            "expiration".
+        :rtype: dict
+        """
+        with self._condition:
+            self._discard_stale(time.time())
+            if self._heap:
+                _, _, certificate = heapq.heappop(self._heap)
+                self._condition.notify()
+                return certificate
+        return self.issue()[1]
+
+    def issue(self):
+        """Issue a new certificate, bypassing the pool.
+
+        :return: The time at which the certificate is due for replacement, and the certificate.
+        :rtype: tuple[float, dict]
+        """
+        issued_at = time.time()
+        if self.local_keys:
+            if self._key_executor is not None:
+                private_key, csr = self._key_executor.submit(
+                    generate_key_and_csr, self.common_name, self.key_type, self.key_bits,
+                ).result()
+            else:
+                private_key, csr = generate_key_and_csr(self.common_name, self.key_type, self.key_bits)
+            certificate = self.pki.sign_certificate(
+                name=self.name,
+                csr=csr,
+                common_name=self.common_name,
+                extra_params=dict(self.extra_params),
+                mount_point=self.mount_point,
+            )['data']
+            certificate['private_key'] = private_key
+            certificate['private_key_type'] = self.key_type
+        else:
+            certificate = self.pki.generate_certificate(
+                name=self.name,
+                common_name=self.common_name,
+                extra_params=dict(self.extra_params),
+                mount_point=self.mount_point,
+            )['data']
+        renew_at = issued_at + (certificate['expiration'] - issued_at) * self.renew_fraction
+        return renew_at, certificate
+
+    def _discard_stale(self, now):
+        while self._heap and self._heap[0][0] <= now:
+            _, _, certificate = heapq.heappop(self._heap)
+            logger.debug('discarding pooled certificate %s', certificate.get('serial_number'))
+
+    def _run(self):
+        with self._condition:
+            while not self._stopped:
+                now = time.time()
+                self._discard_stale(now)
+                missing = self.pool_size - len(self._heap) - self._pending
+                if missing > 0 and now >= self._retry_at:
+                    self._pending += missing
+                    for _ in range(missing):
+                        self._executor.submit(self._replenish)
+                    continue
+                wake_at = [self._heap[0][0]] if self._heap else []
+                if missing > 0:
+                    wake_at.append(self._retry_at)
+                self._condition.wait(max(min(wake_at) - now, 0) if wake_at else None)
+
+    def _replenish(self):
+        try:
+            renew_at, certificate = self.issue()
+        except Exception as error:
+            logger.warning('unable to issue certificate for role %s: %s', self.name, error)
+            with self._condition:
+                self._pending -= 1
+                self._retry_at = time.time() + self.retry_interval
+                self._condition.notify()
+            if self.on_error is not None:
+                self.on_error(error)
+            return
+
+        with self._condition:
+            self._pending -= 1
+            heapq.heappush(self._heap, (renew_at, next(self._counter), certificate))
+            self._condition.notify()
+
+
+class CertificateManager(object):
+    """Hand out certificates from a :py:class:`CertificatePool` per distinct role, common name and extra parameters.
+
+    Pools are created, and started, the first time a certificate is requested for their role, common name and extra
+    parameters, after which their certificates are issued ahead of time. Pools generating keys locally share a single
+    pool of key generation processes.
+    """
+
+    def __init__(self, pki, pool_size=DEFAULT_POOL_SIZE, renew_fraction=DEFAULT_RENEW_FRACTION, local_keys=False,
+                 key_type=DEFAULT_KEY_TYPE, key_bits=DEFAULT_KEY_BITS, key_workers=None,
+                 max_workers=utils.DEFAULT_MAX_WORKERS, retry_interval=DEFAULT_RETRY_INTERVAL, on_error=None,
+                 mount_point=DEFAULT_MOUNT_POINT):
+        """Create a new certificate manager.
+
+        :param pki: The Pki instance to send requests with, e.g. client.secrets.pki.
+        :type pki: hvac.api.secrets_engines.Pki
+        :param pool_size: The number of unused certificates to keep ready per pool.
+        :type pool_size: int
+        :param renew_fraction: The fraction of a pooled certificate's lifetime after which it is replaced.
+        :type renew_fraction: float
+        :param local_keys: Whether to generate private keys locally and have Vault sign CSRs for them.
+        :type local_keys: bool
+        :param key_type: The type of locally generated keys; rsa, ec or ed25519.
+        :type key_type: str | unicode
+        :param key_bits: The number of bits of locally generated RSA keys, or the size of the curve of EC keys.
+        :type key_bits: int
+        :param key_workers: The number of processes generating local keys. Defaults to the number of CPUs.
+        :type key_workers: int
+        :param max_workers: The maximum number of issue or sign requests to have in flight at once per pool.
+        :type max_workers: int
+        :param retry_interval: The number of seconds to wait before retrying after failing to issue a certificate.
+        :type retry_interval: int | float
+        :param on_error: Optional callable invoked with any exception raised while issuing a certificate in the
+            background.
+        :type on_error: callable
+        :param mount_point: The "path" the method/backend was mounted on.
+        :type mount_point: str | unicode
+        """
+        self.pki = pki
+        self.pool_options = dict(
+            pool_size=pool_size,
+            renew_fraction=renew_fraction,
+            local_keys=local_keys,
+            key_type=key_type,
+            key_bits=key_bits,
+            max_workers=max_workers,
+            retry_interval=retry_interval,
+            on_error=on_error,
+            mount_point=mount_point,
+        )
+        self.key_workers = key_workers
+
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._key_executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def stop(self):
+        """Stop all pools. Pooled certificates are not revoked."""
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.stop()
+        if self._key_executor is not None:
+            self._key_executor.shutdown(wait=True)
+            self._key_executor = None
+
+    def get_pool(self, name, common_name, extra_params=None):
+        """Retrieve the pool of certificates for a role, common name and extra parameters, starting it on first use.
+
+        :param name: The name of the role to issue certificates against.
+        :type name: str | unicode
+        :param common_name: The requested CN for the certificates.
+        :type common_name: str | unicode
+        :param extra_params: A dictionary with extra parameters for each issue or sign request.
+        :type extra_params: dict
+        :return: The started pool.
+        :rtype: CertificatePool
+        """
+        key = (name, common_name, json.dumps(extra_params or {}, sort_keys=True))
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    if self.pool_options['local_keys'] and self._key_executor is None:
+                        self._key_executor = ProcessPoolExecutor(max_workers=self.key_workers)
+                    pool = CertificatePool(
+                        pki=self.pki,
+                        name=name,
+                        common_name=common_name,
+                        extra_params=extra_params,
+                        key_executor=self._key_executor,
+                        **self.pool_options
+                    )
+                    pool.start()
+                    self._pools[key] = pool
+        return pool
+
+    def acquire(self, name, common_name, extra_params=None):
+        """Take a certificate for a role, common name and extra parameters from their pool.
+
+        :param name: The name of the role to issue the certificate against.
+        :type name: str | unicode
+        :param common_name: The requested CN for the certificate.
+        :type common_name: str | unicode
+        :param extra_params: A dictionary with extra parameters for the issue or sign request.
+        :type extra_params: dict
+        :return: The certificate, as in the "data" of :py:meth:`hvac.api.secrets_engines.Pki.generate_certificate`.
+        :rtype: dict
+        """
+        return self.get_pool(name, common_name, extra_params).acquire()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Policy Evaluator
+
+Evaluates Vault ACL policies locally, answering whether a set of policies grants a capability on a path without a
+request to Vault per check. Policies are parsed with pyhcl (`pip install pyhcl`).
+
+Only path rules and their capabilities are evaluated. Parameter constraints (allowed_parameters, denied_parameters,
+required_parameters), response wrapping TTL bounds, control groups and Sentinel policies are not taken into account.
+
+"""
+import threading
+
+from hvac import exceptions
+
+try:
+    import hcl
+    has_hcl_parser = True
+except ImportError:
+    has_hcl_parser = False
+
+ROOT_POLICY = 'root'
+
+# Capabilities granted by the deprecated "policy" field of a path rule.
+LEGACY_POLICY_CAPABILITIES = {
+    'deny': ('deny',),
+    'read': ('read', 'list'),
+    'write': ('read', 'list', 'create', 'update', 'delete'),
+    'sudo': ('read', 'list', 'create', 'update', 'delete', 'sudo'),
+}
+
+
+class PathRule(object):
+    """A path pattern from one or more policies, along with the capabilities they grant on it."""
+
+    __slots__ = ('pattern', 'capabilities', 'is_prefix', 'priority')
+
+    def __init__(self, pattern, capabilities):
+        """Create a new path rule.
+
+        :param pattern: The path pattern, which may contain "+" segments and end with a "*" glob.
+        :type pattern: str | unicode
+        :param capabilities: The capabilities granted on matching paths.
+        :type capabilities: frozenset
+        """
+        self.pattern = pattern
+        self.capabilities = capabilities
+        self.is_prefix = pattern.endswith('*')
+        self.priority = self.get_priority(pattern)
+
+    @staticmethod
+    def get_priority(pattern):
+        """Compute a sort key ranking a pattern by how specific it is, following Vault's priority matching rules.
+
+        When several patterns match a path, the pattern with the highest key applies: the pattern whose first "+" or
+        "*" occurs latest, then one that does not end in "*", then the one with fewest "+" segments, then the longest
+        and finally the lexicographically greatest.
+
+        :param pattern: The path pattern.
+        :type pattern: str | unicode
+        :return: The sort key.
+        :rtype: tuple
+        """
+        wildcard_positions = [position for position in (pattern.find('+'), pattern.find('*')) if position != -1]
+        segments = pattern.split('/')
+        return (
+            min(wildcard_positions) if wildcard_positions else len(pattern),
+            not pattern.endswith('*'),
+            -segments.count('+'),
+            len(pattern),
+            pattern,
+        )
+
+    def __repr__(self):
+        return '<PathRule {pattern} {capabilities}>'.format(
+            pattern=self.pattern,
+            capabilities=sorted(self.capabilities),
+        )
+
+
+class _RuleNode(object):
+    """Node of a rule tree, reached by consuming one path segment per level."""
+
+    __slots__ = ('children', 'exact', 'prefixes')
+
+    def __init__(self):
+        self.children = {}
+        self.exact = None
+        # Rules whose pattern ends in a "*" glob following the segments leading to this node, as (prefix, rule) pairs
+        # where prefix is the part of the final segment preceding the glob.
+        self.prefixes = []
+
+
+class RuleTree(object):
+    """Path rules compiled into a tree keyed by path segment, with "+" segments stored under a "+" child."""
+
+    def __init__(self, rules):
+        """Compile path rules.
+
+        :param rules: Mapping of path patterns to the capabilities granted on them.
+        :type rules: dict
+        """
+        self.root = _RuleNode()
+        for pattern, capabilities in rules.items():
+            self.add(PathRule(pattern, capabilities))
+
+    def add(self, rule):
+        """Add a path rule to the tree.
+
+        :param rule: The rule to add.
+        :type rule: PathRule
+        """
+        segments = rule.pattern.split('/')
+        if rule.is_prefix:
+            segments, last_segment = segments[:-1], segments[-1][:-1]
+        node = self.root
+        for segment in segments:
+            node = node.children.setdefault(segment, _RuleNode())
+        if rule.is_prefix:
+            node.prefixes.append((last_segment, rule))
+        else:
+            node.exact = rule
+
+    def match(self, path):
+        """Find the rule applying to a path.
+
+        :param path: The path to match, e.g. "secret/data/hvac".
+        :type path: str | unicode
+        :return: The rule exactly matching the path if any, otherwise the most specific matching wildcard or glob rule,
+            or None if no rule matches.
+        :rtype: PathRule | None
+        """
+        segments = path.split('/')
+        segment_count = len(segments)
+        best = None
+        nodes = [self.root]
+        for index in range(segment_count + 1):
+            next_nodes = []
+            for node in nodes:
+                if index < segment_count:
+                    segment = segments[index]
+                    for prefix, rule in node.prefixes:
+                        if segment.startswith(prefix) and (best is None or rule.priority > best.priority):
+                            best = rule
+                    child = node.children.get(segment)
+                    if child is not None:
+                        next_nodes.append(child)
+                    wildcard_child = node.children.get('+')
+                    if wildcard_child is not None and segment != '+':
+                        next_nodes.append(wildcard_child)
+                elif node.exact is not None and (best is None or node.exact.priority > best.priority):
+                    best = node.exact
+            nodes = next_nodes
+        return best
+
+
+class PolicyEvaluator(object):
+    """Evaluates the capabilities granted by sets of Vault ACL policies without sending requests to Vault.
+
+    As with Vault, the rules of all policies in a set are merged per path pattern (a "deny" capability overriding all
+    others), and the single most specific pattern matching a path determines the capabilities granted on it. The rules
+    of each distinct set of policies are compiled once and reused until a policy is added or removed.
+    """
+
+    def __init__(self, policies=None):
+        """Create a new policy evaluator.
+
+        :param policies: Mapping of policy names to their HCL/JSON policy documents or parsed policy dicts.
+        :type policies: dict
+        """
+        self._policies = {}
+        self._trees = {}
+        self._lock = threading.Lock()
+        for name, policy in (policies or {}).items():
+            self.add_policy(name, policy)
+
+    @property
+    def policy_names(self):
+        """Names of the policies loaded into the evaluator.
+
+        :return: The sorted policy names.
+        :rtype: list[str]
+        """
+        return sorted(self._policies)
+
+    @staticmethod
+    def parse_policy(policy):
+        """Parse a policy into a mapping of path patterns to the capabilities granted on them.
+
+        :param policy: The HCL or JSON policy document, or the already parsed policy.
+        :type policy: str | unicode | dict
+        :return: Mapping of path patterns to sets of capabilities.
+        :rtype: dict
+        """
+        if not isinstance(policy, dict):
+            if not has_hcl_parser:
+                raise ImportError('pyhcl is required for policy parsing')
+            policy = hcl.loads(policy) if policy.strip() else {}
+
+        rules = {}
+        for pattern, rule in (policy.get('path') or {}).items():
+            capabilities = set(rule.get('capabilities') or [])
+            legacy_policy = rule.get('policy')
+            if legacy_policy is not None:
+                if legacy_policy not in LEGACY_POLICY_CAPABILITIES:
+                    raise exceptions.ParamValidationError('unsupported policy "{policy}" for path "{pattern}"'.format(
+                        policy=legacy_policy,
+                        pattern=pattern,
+                    ))
+                capabilities.update(LEGACY_POLICY_CAPABILITIES[legacy_policy])
+            rules[pattern.lstrip('/')] = capabilities
+        return rules
+
+    def add_policy(self, name, policy):
+        """Add or replace a policy.
+
+        :param name: The name of the policy.
+        :type name: str | unicode
+        :param policy: The HCL or JSON policy document, or the already parsed policy.
+        :type policy: str | unicode | dict
+        """
+        rules = self.parse_policy(policy)
+        with self._lock:
+            self._policies[name] = rules
+            self._trees.clear()
+
+    def remove_policy(self, name):
+        """Remove a policy.
+
+        :param name: The name of the policy.
+        :type name: str | unicode
+        """
+        with self._lock:
+            self._policies.pop(name, None)
+            self._trees.clear()
+
+    def load_policies(self, client, names=None):
+        """Load policies from Vault via :py:meth:`hvac.api.system_backend.Policy.read_policy`.
+
+        :param client: Client used to read the policies.
+        :type client: hvac.v1.Client
+        :param names: Names of the policies to load. All ACL policies are loaded if not provided.
+        :type names: list[str]
+        """
+        if names is None:
+            names = client.sys.list_policies()['data']['policies']
+        for name in names:
+            if name == ROOT_POLICY:
+                continue
+            self.add_policy(name, client.sys.read_policy(name=name)['data']['rules'])
+
+    def get_rule_tree(self, policies):
+        """Retrieve the compiled rules of a set of policies, compiling them on first use.
+
+        :param policies: Names of the policies. Names of policies that have not been loaded are ignored.
+        :type policies: list[str]
+        :return: The compiled rules.
+        :rtype: RuleTree
+        """
+        key = frozenset(policies)
+        tree = self._trees.get(key)
+        if tree is None:
+            with self._lock:
+                merged_rules = {}
+                for name in key:
+                    for pattern, capabilities in self._policies.get(name, {}).items():
+                        merged_rules.setdefault(pattern, set()).update(capabilities)
+                tree = RuleTree({
+                    pattern: frozenset(['deny']) if 'deny' in capabilities else frozenset(capabilities)
+                    for pattern, capabilities in merged_rules.items()
+                })
+                self._trees[key] = tree
+        return tree
+
+    def get_matching_rule(self, path, policies):
+        """Find the path rule determining the capabilities a set of policies grants on a path.
+
+        :param path: The path to check, e.g. "secret/data/hvac".
+        :type path: str | unicode
+        :param policies: Names of the policies.
+        :type policies: list[str]
+        :return: The matching rule, or None if no rule matches.
+        :rtype: PathRule | None
+        """
+        return self.get_rule_tree(policies).match(path.lstrip('/'))
+
+    def get_capabilities(self, path, policies):
+        """Determine the capabilities a set of policies grants on a path.
+
+        :param path: The path to check, e.g. "secret/data/hvac".
+        :type path: str | unicode
+        :param policies: Names of the policies.
+        :type policies: list[str]
+        :return: The capabilities, sorted. ["deny"] if no rule matches the path and ["root"] if the set of policies
+            includes the root policy, as with :py:meth:`hvac.api.system_backend.Capabilities.get_capabilities`.
+        :rtype: list[str]
+        """
+        if ROOT_POLICY in policies:
+            return [ROOT_POLICY]
+        rule = self.get_matching_rule(path, policies)
+        if rule is None or not rule.capabilities:
+            return ['deny']
+        return sorted(rule.capabilities)
+
+    def has_capability(self, path, capability, policies):
+        """Check whether a set of policies grants a capability on a path.
+
+        :param path: The path to check, e.g. "secret/data/hvac".
+        :type path: str | unicode
+        :param capability: The capability to check for, e.g. "read".
+        :type capability: str | unicode
+        :param policies: Names of the policies.
+        :type policies: list[str]
+        :return: True if the capability is granted.
+        :rtype: bool
+        """
+        if ROOT_POLICY in policies:
+            return True
+        rule = self.get_matching_rule(path, policies)
+        if rule is None or 'deny' in rule.capabilities:
+            return False
+        return capability in rule.capabilities
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Retry policies for requests sent by hvac adapters."""
+import random
+import time
+from email.utils import parsedate_tz, mktime_tz
+
+import requests.exceptions
+
+from hvac.middleware import Middleware
+
+DEFAULT_RETRY_METHODS = frozenset(['GET', 'LIST', 'HEAD'])
+DEFAULT_RETRY_STATUS_CODES = frozenset([429, 502, 503, 504])
+RETRYABLE_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+class RetryPolicy(Middleware):
+    """Decide whether, and how long to wait before, a failed request is retried.
+
+    Delays follow an exponential backoff with "full jitter": the delay before retry number n is drawn uniformly from
+    [0, min(max_backoff, backoff_factor * 2 ** n)], which spreads retries from many clients out rather than having them
+    arrive in lockstep. A Retry-After header on the failed response raises the delay to at least the requested value.
+    No retry is attempted if it would exceed the policy's overall time budget for the call.
+
+    Only requests using one of the policy's methods (by default the safe methods GET, LIST and HEAD) are retried,
+    unless the request is flagged as idempotent (e.g. ``adapter.post(url, idempotent=True)``). Requests sent with
+    raise_exception=False are only retried on connection errors and timeouts, leaving status codes to the caller.
+    """
+
+    def __init__(self, max_attempts=3, backoff_factor=0.1, max_backoff=10, budget=None,
+                 methods=DEFAULT_RETRY_METHODS, status_codes=DEFAULT_RETRY_STATUS_CODES, respect_retry_after=True):
+        """Create a new retry policy.
+
+        :param max_attempts: The maximum number of times to send a request, including the first attempt.
+        :type max_attempts: int
+        :param backoff_factor: The base delay, in seconds, of the exponential backoff.
+        :type backoff_factor: float
+        :param max_backoff: The maximum backoff delay, in seconds, before jitter is applied.
+        :type max_backoff: float
+        :param budget: Optional overall time budget, in seconds, for a call including all of its retries. The timeout
+            of each attempt is also capped to the time remaining in the budget.
+        :type budget: float
+        :param methods: HTTP methods that are safe to retry.
+        :type methods: collections.abc.Iterable[str]
+        :param status_codes: Response status codes to retry.
+        :type status_codes: collections.abc.Iterable[int]
+        :param respect_retry_after: Whether to honour the Retry-After header of retried responses.
+        :type respect_retry_after: bool
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.methods = frozenset(method.upper() for method in methods)
+        self.status_codes = frozenset(status_codes)
+        self.respect_retry_after = respect_retry_after
+
+    def allows(self, method, idempotent=False):
+        """Determine whether requests with the given method may be retried.
+
+        :param method: The request's HTTP method.
+        :type method: str
+        :param idempotent: Whether the caller flagged the request as idempotent.
+        :type idempotent: bool
+        :return: True if the request may be retried.
+        :rtype: bool
+        """
+        return idempotent or method.upper() in self.methods
+
+    def remaining_budget(self, started_at):
+        """Determine the time remaining in the budget of a call.
+
+        :param started_at: When the call's first attempt was sent, as returned by time.time().
+        :type started_at: float
+        :return: The number of seconds remaining, or None if the policy has no budget.
+        :rtype: float | None
+        """
+        if self.budget is None:
+            return None
+        return self.budget - (time.time() - started_at)
+
+    def get_retry_delay(self, attempt, started_at, response=None, error=None):
+        """Determine how long to wait before retrying a failed attempt.
+
+        :param attempt: The number of attempts sent so far.
+        :type attempt: int
+        :param started_at: When the call's first attempt was sent, as returned by time.time().
+        :type started_at: float
+        :param response: The response received for the attempt, if any.
+        :type response: requests.Response
+        :param error: The exception raised while sending the attempt, if any.
+        :type error: Exception
+        :return: The number of seconds to wait before retrying, or None if the attempt should not be retried.
+        :rtype: float | None
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if error is not None:
+            if not isinstance(error, RETRYABLE_EXCEPTIONS):
+                return None
+        elif response is None or response.status_code not in self.status_codes:
+            return None
+
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+        if response is not None and self.respect_retry_after:
+            retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+        remaining = self.remaining_budget(started_at)
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """Parse the value of a Retry-After header.
+
+        :param value: Either a number of seconds or an HTTP date.
+        :type value: str
+        :return: The number of seconds to wait, or None if the value is missing or invalid.
+        :rtype: float | None
+        """
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        parsed_date = parsedate_tz(value)
+        if parsed_date is None:
+            return None
+        return max(mktime_tz(parsed_date) - time.time(), 0)
+
+    @staticmethod
+    def budgeted_timeout(timeout, remaining):
+        """Cap a requests timeout value to the time remaining in a retry budget.
+
+        :param timeout: The configured timeout, either a number of seconds or a (connect, read) tuple.
+        :type timeout: int | float | tuple
+        :param remaining: The number of seconds remaining in the budget.
+        :type remaining: float
+        :return: The capped timeout.
+        :rtype: float | tuple
+        """
+        remaining = max(remaining, 0.001)
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def handle(self, request, send):
+        """Send a request, retrying it as allowed by this policy.
+
+        :param request: The request to send.
+        :type request: hvac.middleware.RequestContext
+        :param send: Callable sending the request through the remaining middleware.
+        :type send: callable
+        :return: The response of the final attempt.
+        :rtype: requests.Response
+        """
+        if not self.allows(request.method, idempotent=request.idempotent):
+            return send(request)
+
+        timeout = request.kwargs.get('timeout')
+        attempt = 0
+        started_at = time.time()
+        while True:
+            attempt += 1
+            if self.budget is not None:
+                request.kwargs['timeout'] = self.budgeted_timeout(
+                    timeout=timeout,
+                    remaining=self.remaining_budget(started_at),
+                )
+            try:
+                response = send(request)
+            except Exception as error:
+                delay = self.get_retry_delay(attempt, started_at, error=error)
+                if delay is None:
+                    raise
+            else:
+                if not request.raise_exception:
+                    # Callers handling error statuses themselves (e.g. health checks) get the first response back.
+                    return response
+                delay = self.get_retry_delay(attempt, started_at, response=response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
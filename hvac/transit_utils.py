@@ -0,0 +1,567 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Helpers built on top of the Transit secrets engine class."""
+import os
+import struct
+import threading
+import time
+from base64 import b64decode, b64encode
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from hvac import exceptions, utils
+from hvac.api.secrets_engines.transit import DEFAULT_MOUNT_POINT
+from hvac.cache import TTLCache
+
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    has_cryptography = True
+except ImportError:
+    has_cryptography = False
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_CHUNKS_PER_REQUEST = 32
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_DATA_KEY_MAX_USES = 2 ** 20
+DEFAULT_DATA_KEY_MAX_AGE = 300
+
+# Each stream record's plaintext is prefixed with a random stream ID, its sequence number and a final record flag.
+STREAM_ID_SIZE = 16
+_RECORD_HEADER = struct.Struct('>QB')
+
+
+class _PendingBatch(object):
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.items = []
+        self.futures = []
+
+
+class TransitBatcher(object):
+    """Coalesce individual Transit encrypt and decrypt calls into batched requests.
+
+    Each submission returns a :py:class:`concurrent.futures.Future` immediately. Submissions for the same operation,
+    mount point, key name (and key version, for encryption) are buffered until either max_batch_size items have been
+    collected or the oldest item has waited max_delay seconds, at which point they are sent to Vault as a single
+    batch_input request on a bounded pool of worker threads. Each item carries its own context and nonce, so keys
+    with derivation enabled can be batched as well.
+
+    Futures resolve to the resulting ciphertext (for encrypt) or base64 encoded plaintext (for decrypt). Errors
+    reported by Vault for individual batch items are raised from the corresponding futures as
+    :py:class:`hvac.exceptions.InvalidRequest`; errors for the request as a whole are raised from every future in the
+    batch.
+    """
+
+    def __init__(self, transit, max_batch_size=250, max_delay=0.01, max_workers=utils.DEFAULT_MAX_WORKERS):
+        """Create a new batcher and start its background flushing thread.
+
+        :param transit: The Transit instance to send batched requests with, e.g. client.secrets.transit.
+        :type transit: hvac.api.secrets_engines.Transit
+        :param max_batch_size: The maximum number of items to send in a single request.
+        :type max_batch_size: int
+        :param max_delay: The maximum number of seconds an item is held waiting for others to join its batch.
+        :type max_delay: float
+        :param max_workers: The maximum number of batched requests to have in flight at once.
+        :type max_workers: int
+        """
+        self.transit = transit
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+        self._pending = {}
+        self._closed = False
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._thread = threading.Thread(target=self._run, name='hvac-transit-batcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def encrypt(self, name, plaintext, context=None, nonce=None, key_version=None, mount_point=DEFAULT_MOUNT_POINT):
+        """Submit a plaintext to be encrypted with the named key.
+
+        :param name: Specifies the name of the encryption key to encrypt against.
+        :type name: str | unicode
+        :param plaintext: Specifies base64 encoded plaintext to be encoded.
+        :type plaintext: str | unicode
+        :param context: Specifies the base64 encoded context for key derivation.
+        :type context: str | unicode
+        :param nonce: Specifies the base64 encoded nonce value.
+        :type nonce: str | unicode
+        :param key_version: Specifies the version of the key to use for encryption. If not set, uses the latest version.
+        :type key_version: int
+        :param mount_point: The "path" the method/backend was mounted on.
+        :type mount_point: str | unicode
+        :return: A future resolving to the ciphertext.
+        :rtype: concurrent.futures.Future
+        """
+        item = utils.remove_nones({
+            'plaintext': plaintext,
+            'context': context,
+            'nonce': nonce,
+        })
+        return self._submit(('encrypt', mount_point, name, key_version), item)
+
+    def decrypt(self, name, ciphertext, context=None, nonce=None, mount_point=DEFAULT_MOUNT_POINT):
+        """Submit a ciphertext to be decrypted with the named key.
+
+        :param name: Specifies the name of the encryption key to decrypt against.
+        :type name: str | unicode
+        :param ciphertext: The ciphertext to decrypt.
+        :type ciphertext: str | unicode
+        :param context: Specifies the base64 encoded context for key derivation.
+        :type context: str | unicode
+        :param nonce: Specifies a base64 encoded nonce value used during encryption.
+        :type nonce: str | unicode
+        :param mount_point: The "path" the method/backend was mounted on.
+        :type mount_point: str | unicode
+        :return: A future resolving to the base64 encoded plaintext.
+        :rtype: concurrent.futures.Future
+        """
+        item = utils.remove_nones({
+            'ciphertext': ciphertext,
+            'context': context,
+            'nonce': nonce,
+        })
+        return self._submit(('decrypt', mount_point, name, None), item)
+
+    def flush(self):
+        """Send all buffered items immediately, without waiting for their batches to fill up or time out."""
+        with self._condition:
+            for group in list(self._pending):
+                self._dispatch(group, self._pending.pop(group))
+
+    def close(self):
+        """Send any buffered items, wait for all in-flight requests to complete and stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _submit(self, group, item):
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('cannot submit items to a closed TransitBatcher')
+            batch = self._pending.get(group)
+            if batch is None:
+                batch = self._pending[group] = _PendingBatch(deadline=time.time() + self.max_delay)
+                self._condition.notify()
+            batch.items.append(item)
+            batch.futures.append(future)
+            if len(batch.items) >= self.max_batch_size:
+                self._dispatch(group, self._pending.pop(group))
+        return future
+
+    def _run(self):
+        with self._condition:
+            while True:
+                now = time.time()
+                for group in [g for g, batch in self._pending.items() if self._closed or batch.deadline <= now]:
+                    self._dispatch(group, self._pending.pop(group))
+                if self._closed:
+                    return
+                timeout = None
+                if self._pending:
+                    timeout = min(batch.deadline for batch in self._pending.values()) - now
+                self._condition.wait(timeout)
+
+    def _dispatch(self, group, batch):
+        self._executor.submit(self._send, group, batch)
+
+    def _send(self, group, batch):
+        # Drop items whose futures were cancelled while they were buffered.
+        pending = [(item, future) for item, future in zip(batch.items, batch.futures)
+                   if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        operation, mount_point, name, key_version = group
+        batch_input = [item for item, _ in pending]
+        try:
+            if operation == 'encrypt':
+                response = self.transit.encrypt_data(
+                    name=name,
+                    plaintext=None,
+                    key_version=key_version,
+                    batch_input=batch_input,
+                    mount_point=mount_point,
+                )
+            else:
+                response = self.transit.decrypt_data(
+                    name=name,
+                    ciphertext=None,
+                    batch_input=batch_input,
+                    mount_point=mount_point,
+                )
+            batch_results = response['data']['batch_results']
+        except Exception as error:
+            for _, future in pending:
+                future.set_exception(error)
+            return
+
+        if len(batch_results) != len(pending):
+            error = exceptions.UnexpectedError('received {results} batch results for {items} items'.format(
+                results=len(batch_results),
+                items=len(pending),
+            ))
+            for _, future in pending:
+                future.set_exception(error)
+            return
+
+        result_key = 'ciphertext' if operation == 'encrypt' else 'plaintext'
+        for (_, future), result in zip(pending, batch_results):
+            if result.get('error'):
+                future.set_exception(exceptions.InvalidRequest(result['error']))
+            else:
+                future.set_result(result.get(result_key))
+
+
+def _iter_chunks(source, chunk_size):
+    """Yield bytes from a file-like object or iterable of bytes in chunks of (at most) chunk_size bytes."""
+    if hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    buffered = b''
+    for data in source:
+        buffered += data
+        while len(buffered) >= chunk_size:
+            yield buffered[:chunk_size]
+            buffered = buffered[chunk_size:]
+    if buffered:
+        yield buffered
+
+
+def _iter_framed_chunks(chunks):
+    """Prefix each chunk with the stream's ID, the chunk's sequence number and whether it is the final chunk.
+
+    A stream of no chunks still yields a single (empty) final chunk, so that truncation can always be detected.
+    """
+    stream_id = os.urandom(STREAM_ID_SIZE)
+    sequence = 0
+    previous = None
+    for chunk in chunks:
+        if previous is not None:
+            yield stream_id + _RECORD_HEADER.pack(sequence, 0) + previous
+            sequence += 1
+        previous = chunk
+    yield stream_id + _RECORD_HEADER.pack(sequence, 1) + (previous or b'')
+
+
+def _iter_records(source):
+    """Yield non-empty ciphertext records, one per line of a file-like object or item of an iterable."""
+    for record in source:
+        if isinstance(record, bytes):
+            record = record.decode('utf-8')
+        record = record.strip()
+        if record:
+            yield record
+
+
+def _iter_batches(items, batch_size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _pipeline(send, batches, write, max_in_flight):
+    """Send batches with up to max_in_flight requests outstanding, writing their results in submission order."""
+    count = 0
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        try:
+            for batch in batches:
+                if len(in_flight) >= max_in_flight:
+                    count += write(in_flight.popleft().result())
+                in_flight.append(executor.submit(send, batch))
+            while in_flight:
+                count += write(in_flight.popleft().result())
+        finally:
+            for future in in_flight:
+                future.cancel()
+    return count
+
+
+def _batch_values(response, result_key):
+    values = []
+    for result in response['data']['batch_results']:
+        if result.get('error'):
+            raise exceptions.InvalidRequest(result['error'])
+        values.append(result[result_key])
+    return values
+
+
+def encrypt_stream(transit, name, source, destination, context=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                   chunks_per_request=DEFAULT_CHUNKS_PER_REQUEST, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                   mount_point=DEFAULT_MOUNT_POINT):
+    """Encrypt a stream of bytes with the named key, writing one ciphertext record per line to a destination stream.
+
+    The source is read in chunks of chunk_size bytes, each of which is base64 encoded and encrypted as one item of a
+    batch_input request. Up to max_in_flight batch requests are kept outstanding at once, so at most
+    chunk_size * chunks_per_request * max_in_flight bytes of plaintext are held in memory regardless of the size of
+    the source. chunk_size * chunks_per_request should be kept well below the Vault server's max_request_size once
+    base64 overhead (4/3) is accounted for.
+
+    Each chunk is encrypted together with a random ID for the stream, the chunk's sequence number and a flag marking
+    the final chunk, allowing :py:func:`decrypt_stream` to detect records that were dropped, reordered, duplicated,
+    spliced in from another stream or truncated from the end.
+
+    :param transit: The Transit instance to send requests with, e.g. client.secrets.transit.
+    :type transit: hvac.api.secrets_engines.Transit
+    :param name: Specifies the name of the encryption key to encrypt against.
+    :type name: str | unicode
+    :param source: A binary file-like object, or an iterable of bytes, to encrypt.
+    :type source: io.BufferedIOBase | collections.abc.Iterable[bytes]
+    :param destination: A binary file-like object to write newline delimited ciphertext records to.
+    :type destination: io.BufferedIOBase
+    :param context: Specifies the base64 encoded context for key derivation, applied to every chunk.
+    :type context: str | unicode
+    :param chunk_size: The number of plaintext bytes to encrypt per ciphertext record.
+    :type chunk_size: int
+    :param chunks_per_request: The number of chunks to send in each batch request.
+    :type chunks_per_request: int
+    :param max_in_flight: The maximum number of batch requests to have outstanding at once.
+    :type max_in_flight: int
+    :param mount_point: The "path" the method/backend was mounted on.
+    :type mount_point: str | unicode
+    :return: The number of ciphertext records written.
+    :rtype: int
+    """
+    def send(chunks):
+        batch_input = [
+            utils.remove_nones({'plaintext': b64encode(chunk).decode('ascii'), 'context': context})
+            for chunk in chunks
+        ]
+        response = transit.encrypt_data(
+            name=name,
+            plaintext=None,
+            batch_input=batch_input,
+            mount_point=mount_point,
+        )
+        return _batch_values(response, 'ciphertext')
+
+    def write(ciphertexts):
+        for ciphertext in ciphertexts:
+            destination.write(ciphertext.encode('ascii') + b'\n')
+        return len(ciphertexts)
+
+    return _pipeline(
+        send=send,
+        batches=_iter_batches(_iter_framed_chunks(_iter_chunks(source, chunk_size)), chunks_per_request),
+        write=write,
+        max_in_flight=max_in_flight,
+    )
+
+
+def decrypt_stream(transit, name, source, destination, context=None,
+                   chunks_per_request=DEFAULT_CHUNKS_PER_REQUEST, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                   mount_point=DEFAULT_MOUNT_POINT):
+    """Decrypt ciphertext records produced by :py:func:`encrypt_stream`, writing the plaintext to a destination stream.
+
+    Records are verified to belong to a single stream and to be complete and in order. As plaintext is written as it is
+    decrypted, the destination should be discarded if a :py:class:`hvac.exceptions.ParamValidationError` is raised.
+
+    :param transit: The Transit instance to send requests with, e.g. client.secrets.transit.
+    :type transit: hvac.api.secrets_engines.Transit
+    :param name: Specifies the name of the encryption key to decrypt against.
+    :type name: str | unicode
+    :param source: A file-like object of newline delimited ciphertext records, or an iterable of records.
+    :type source: io.IOBase | collections.abc.Iterable[str]
+    :param destination: A binary file-like object to write the decrypted bytes to.
+    :type destination: io.BufferedIOBase
+    :param context: Specifies the base64 encoded context for key derivation, applied to every record.
+    :type context: str | unicode
+    :param chunks_per_request: The number of records to send in each batch request.
+    :type chunks_per_request: int
+    :param max_in_flight: The maximum number of batch requests to have outstanding at once.
+    :type max_in_flight: int
+    :param mount_point: The "path" the method/backend was mounted on.
+    :type mount_point: str | unicode
+    :return: The number of ciphertext records decrypted.
+    :rtype: int
+    """
+    def send(records):
+        batch_input = [utils.remove_nones({'ciphertext': record, 'context': context}) for record in records]
+        response = transit.decrypt_data(
+            name=name,
+            ciphertext=None,
+            batch_input=batch_input,
+            mount_point=mount_point,
+        )
+        return _batch_values(response, 'plaintext')
+
+    stream = {'id': None, 'sequence': 0, 'final': False}
+
+    def write(plaintexts):
+        for plaintext in plaintexts:
+            record = b64decode(plaintext)
+            header_size = STREAM_ID_SIZE + _RECORD_HEADER.size
+            if len(record) < header_size:
+                raise exceptions.ParamValidationError('ciphertext record {num} is not part of an encrypted stream'.format(
+                    num=stream['sequence'],
+                ))
+            stream_id = record[:STREAM_ID_SIZE]
+            sequence, final = _RECORD_HEADER.unpack(record[STREAM_ID_SIZE:header_size])
+            if stream['final']:
+                raise exceptions.ParamValidationError('unexpected ciphertext record after the end of the stream')
+            if stream['id'] is not None and stream_id != stream['id']:
+                raise exceptions.ParamValidationError('ciphertext record {num} belongs to a different stream'.format(
+                    num=stream['sequence'],
+                ))
+            if sequence != stream['sequence']:
+                raise exceptions.ParamValidationError('expected ciphertext record {expected}, got record {actual}'.format(
+                    expected=stream['sequence'],
+                    actual=sequence,
+                ))
+            stream.update(id=stream_id, sequence=sequence + 1, final=bool(final))
+            destination.write(record[header_size:])
+        return len(plaintexts)
+
+    records = _pipeline(
+        send=send,
+        batches=_iter_batches(_iter_records(source), chunks_per_request),
+        write=write,
+        max_in_flight=max_in_flight,
+    )
+    if not stream['final']:
+        raise exceptions.ParamValidationError('encrypted stream is truncated after record {num}'.format(
+            num=stream['sequence'],
+        ))
+    return records
+
+
+class EnvelopeEncryptor(object):
+    """Encrypt and decrypt payloads locally with AES-GCM data keys generated and wrapped by a Transit key.
+
+    A data key is requested from Vault via :py:meth:`hvac.api.secrets_engines.Transit.generate_data_key` and used to
+    encrypt payloads locally until it has been used max_uses times or is older than max_age seconds, after which a new
+    data key is requested. Each envelope embeds the wrapped (Vault encrypted) data key alongside the payload. When
+    decrypting, the wrapped data key is only sent to Vault to be decrypted if its plaintext is not already cached.
+
+    Envelopes are strings in the form "<wrapped data key>:<base64 encoded nonce and ciphertext>".
+
+    Requires the cryptography package (e.g. `pip install hvac[cryptography]`).
+    """
+
+    def __init__(self, transit, name, context=None, bits=256, max_uses=DEFAULT_DATA_KEY_MAX_USES,
+                 max_age=DEFAULT_DATA_KEY_MAX_AGE, cache_size=1024, mount_point=DEFAULT_MOUNT_POINT):
+        """Create a new envelope encryptor.
+
+        :param transit: The Transit instance to send requests with, e.g. client.secrets.transit.
+        :type transit: hvac.api.secrets_engines.Transit
+        :param name: Specifies the name of the Transit key used to wrap data keys.
+        :type name: str | unicode
+        :param context: Specifies the base64 encoded context for key derivation. Required if derivation is enabled for
+            the Transit key.
+        :type context: str | unicode
+        :param bits: The number of bits in generated data keys; 128 or 256.
+        :type bits: int
+        :param max_uses: The number of payloads to encrypt with a data key before requesting a new one. AES-GCM with
+            random nonces should not be used for more than 2 ** 32 encryptions under one key.
+        :type max_uses: int
+        :param max_age: The number of seconds a data key's plaintext is retained, for encryption and decryption.
+        :type max_age: int | float
+        :param cache_size: The number of unwrapped data keys to retain for decryption.
+        :type cache_size: int
+        :param mount_point: The "path" the method/backend was mounted on.
+        :type mount_point: str | unicode
+        """
+        if not has_cryptography:
+            raise ImportError('cryptography is required to use {cls}'.format(cls=self.__class__.__name__))
+        if bits not in (128, 256):
+            error_msg = 'invalid bits argument provided "{arg}", supported values: "128, 256"'
+            raise exceptions.ParamValidationError(error_msg.format(arg=bits))
+
+        self.transit = transit
+        self.name = name
+        self.context = context
+        self.bits = bits
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.mount_point = mount_point
+
+        self._data_keys = TTLCache(maxsize=cache_size, default_ttl=max_age)
+        self._lock = threading.Lock()
+        self._current_key = None
+        self._current_key_uses = 0
+        self._current_key_expiry = 0
+
+    def encrypt(self, plaintext, associated_data=None):
+        """Encrypt a payload locally with the current data key.
+
+        :param plaintext: The payload to encrypt.
+        :type plaintext: bytes
+        :param associated_data: Optional additional data to authenticate (but not encrypt). The same value must be
+            provided when decrypting.
+        :type associated_data: bytes
+        :return: The envelope.
+        :rtype: str
+        """
+        wrapped_key, data_key = self._get_encryption_key()
+        nonce = os.urandom(12)
+        ciphertext = AESGCM(data_key).encrypt(nonce, plaintext, associated_data)
+        return '{wrapped_key}:{payload}'.format(
+            wrapped_key=wrapped_key,
+            payload=b64encode(nonce + ciphertext).decode('ascii'),
+        )
+
+    def decrypt(self, envelope, associated_data=None):
+        """Decrypt an envelope produced by :py:meth:`encrypt`.
+
+        :param envelope: The envelope to decrypt.
+        :type envelope: str | unicode
+        :param associated_data: The additional authenticated data provided when encrypting, if any.
+        :type associated_data: bytes
+        :return: The decrypted payload.
+        :rtype: bytes
+        """
+        wrapped_key, payload = envelope.rsplit(':', 1)
+        payload = b64decode(payload)
+        data_key = self._get_decryption_key(wrapped_key)
+        return AESGCM(data_key).decrypt(payload[:12], payload[12:], associated_data)
+
+    def _get_encryption_key(self):
+        with self._lock:
+            if self._current_key is None or self._current_key_uses >= self.max_uses \
+                    or self._current_key_expiry <= time.time():
+                response = self.transit.generate_data_key(
+                    name=self.name,
+                    key_type='plaintext',
+                    context=self.context,
+                    bits=self.bits,
+                    mount_point=self.mount_point,
+                )
+                wrapped_key = response['data']['ciphertext']
+                data_key = b64decode(response['data']['plaintext'])
+                self._data_keys.set(wrapped_key, data_key)
+                self._current_key = (wrapped_key, data_key)
+                self._current_key_uses = 0
+                self._current_key_expiry = time.time() + self.max_age
+            self._current_key_uses += 1
+            return self._current_key
+
+    def _get_decryption_key(self, wrapped_key):
+        data_key = self._data_keys.get(wrapped_key)
+        if data_key is None:
+            response = self.transit.decrypt_data(
+                name=self.name,
+                ciphertext=wrapped_key,
+                context=self.context,
+                mount_point=self.mount_point,
+            )
+            data_key = b64decode(response['data']['plaintext'])
+            self._data_keys.set(wrapped_key, data_key)
+        return data_key
@@ -3,15 +3,25 @@ Misc utility functions and constants
 """
 
 import functools
+import importlib
 import inspect
 import os
+import re
+import sys
 import warnings
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from textwrap import dedent
 
 import six
 
 from hvac import exceptions
 
+DEFAULT_MAX_WORKERS = 10
+DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h|d)')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
 
 def raise_for_error(method, url, status_code, message=None, errors=None):
     """Helper method to raise exceptions based on the status code of a response received back from Vault.
@@ -154,17 +164,23 @@ def deprecated_method(to_be_removed_in_version, new_method=None):
     :param to_be_removed_in_version: Version of this module the decorated method will be removed in.
     :type to_be_removed_in_version: str
     :param new_method: Method intended to replace the decorated method. This method's docstrings are included in the
-        decorated method's docstring.
-    :type new_method: function
+        decorated method's docstring. May instead be given as a dotted path, e.g.
+        "hvac.api.auth_methods.ldap.Ldap.login", to avoid importing the replacement's module; the decorated method's
+        docstring then refers to the replacement rather than including its docstrings.
+    :type new_method: function | str
     :return: Wrapped function that includes a deprecation warning and update docstrings from the replacement method.
     :rtype: types.FunctionType
     """
     def decorator(method):
+        if isinstance(new_method, six.string_types):
+            module_name, _, method_name = new_method.rsplit('.', 2)
+        else:
+            module_name, method_name = inspect.getmodule(new_method).__name__, new_method.__name__
         deprecation_message = generate_method_deprecation_message(
             to_be_removed_in_version=to_be_removed_in_version,
             old_method_name=method.__name__,
-            method_name=new_method.__name__,
-            module_name=inspect.getmodule(new_method).__name__,
+            method_name=method_name,
+            module_name=module_name,
         )
 
         @functools.wraps(method)
@@ -178,7 +194,15 @@ def deprecated_method(to_be_removed_in_version, new_method=None):
             warnings.simplefilter('default', DeprecationWarning)  # reset filter
             return method(*args, **kwargs)
 
-        if new_method:
+        if isinstance(new_method, six.string_types):
+            new_func.__doc__ = """\
+                {message}
+                See :py:meth:`{new_method}` for this method's replacement.
+                """.format(
+                    message=deprecation_message,
+                    new_method=new_method,
+                )
+        elif new_method:
             new_func.__doc__ = """\
                 {message}
                 Docstring content from this method's replacement copied below:
@@ -194,6 +218,45 @@ def deprecated_method(to_be_removed_in_version, new_method=None):
     return decorator
 
 
+def apply_to_response(response, func):
+    """Apply a function to the value returned by an adapter's request method.
+
+    The request methods of asyncio adapters (see :py:mod:`hvac.aio`) return awaitables, in which case the function is
+    only applied once the request has been awaited.
+
+    :param response: The value returned by the adapter.
+    :type response: dict | requests.Response | collections.abc.Awaitable
+    :param func: Callable accepting the response.
+    :type func: callable
+    :return: The value returned by func, or an awaitable resolving to it.
+    :rtype: object
+    """
+    if hasattr(response, '__await__'):
+        from hvac.aio import apply_after_await
+        return apply_after_await(response, func)
+    return func(response)
+
+
+def synchronous_only(method):
+    """Decorator for API methods which send several requests, each depending on the result of the last, and so can
+    not be used with asyncio adapters.
+
+    :param method: The API method.
+    :type method: function
+    :return: Wrapped method raising NotImplementedError when called on an instance using an asyncio adapter.
+    :rtype: types.FunctionType
+    """
+    @functools.wraps(method)
+    def new_func(self, *args, **kwargs):
+        if getattr(self._adapter, 'is_async', False) is True:
+            raise NotImplementedError('{cls}.{method} is not supported by asyncio adapters'.format(
+                cls=self.__class__.__name__,
+                method=method.__name__,
+            ))
+        return method(self, *args, **kwargs)
+    return new_func
+
+
 def validate_list_of_strings_param(param_name, param_argument):
     """Validate that an argument is a list of strings.
 
@@ -307,6 +370,36 @@ def remove_nones(params):
     }
 
 
+def normalize_path(path):
+    """Strip leading, trailing and duplicate slashes from a path, as Vault does when routing requests.
+
+    :param path: The path to normalize, e.g. "/secret//hvac/".
+    :type path: str | unicode
+    :return: The normalized path, e.g. "secret/hvac".
+    :rtype: str | unicode
+    """
+    return '/'.join(segment for segment in path.split('/') if segment)
+
+
+def parse_duration(duration):
+    """Convert a duration, as accepted by Vault for TTL parameters, to a number of seconds.
+
+    :param duration: The duration, either a number of seconds or a string such as "3600", "1h" or "1h30m".
+    :type duration: str | unicode | int | float
+    :return: The number of seconds, or None if the duration could not be parsed.
+    :rtype: int | float | None
+    """
+    if isinstance(duration, six.integer_types + (float,)):
+        return duration
+    duration = str(duration).strip()
+    if duration.isdigit():
+        return int(duration)
+    parts = DURATION_RE.findall(duration)
+    if not parts or ''.join(number + unit for number, unit in parts) != duration:
+        return None
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
 def format_url(format_str, *args, **kwargs):
     """Creates a URL using the specified format after escaping the provided arguments.
 
@@ -335,3 +428,158 @@ def format_url(format_str, *args, **kwargs):
         *escaped_args,
         **escaped_kwargs
     )
+
+
+def map_concurrently(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    """Call a function once per item using a bounded pool of worker threads.
+
+    Exceptions raised for an individual item are captured and returned in place of a result rather than aborting the
+    remaining calls.
+
+    :param func: Callable accepting a single item.
+    :type func: callable
+    :param items: Hashable items to call the function with. Duplicates are only called once.
+    :type items: collections.abc.Iterable
+    :param max_workers: The maximum number of calls to run at the same time.
+    :type max_workers: int
+    :return: Mapping of each item to the value returned by, or the exception raised by, its call.
+    :rtype: dict
+    """
+    if max_workers < 1:
+        raise exceptions.ParamValidationError('max_workers must be at least 1, "{max_workers}" provided'.format(
+            max_workers=max_workers,
+        ))
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as error:
+            return error
+
+    unique_items = list(dict.fromkeys(items))
+    if not unique_items:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_items))) as executor:
+        return dict(zip(unique_items, executor.map(call, unique_items)))
+
+
+def walk_concurrently(list_keys, path='', max_depth=None, max_workers=DEFAULT_MAX_WORKERS):
+    """Walk a tree of "/"-suffixed folder keys, listing sibling folders in parallel.
+
+    Folders are descended depth-first so the number of folders waiting to be listed stays small, and at most
+    max_workers listings are in flight at once. Results are yielded as soon as each listing completes, so callers never
+    need to hold the whole tree in memory. Folders that no longer exist by the time they are listed are skipped; any
+    other error raised while listing is propagated.
+
+    :param list_keys: Callable accepting a folder path and returning the list of keys directly under it.
+    :type list_keys: callable
+    :param path: The folder to start walking from.
+    :type path: str | unicode
+    :param max_depth: Optional number of levels below path to descend. 0 lists path only.
+    :type max_depth: int
+    :param max_workers: The maximum number of listings to have in flight at once.
+    :type max_workers: int
+    :return: Generator of (folder path, keys) tuples, one per folder listed.
+    :rtype: collections.abc.Iterator[tuple]
+    """
+    if max_workers < 1:
+        raise exceptions.ParamValidationError('max_workers must be at least 1, "{max_workers}" provided'.format(
+            max_workers=max_workers,
+        ))
+
+    path = path.strip('/')
+    pending = deque([(path + '/' if path else '', 0)])
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < max_workers:
+                    folder, depth = pending.pop()
+                    in_flight[executor.submit(list_keys, folder)] = (folder, depth)
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder, depth = in_flight.pop(future)
+                    try:
+                        keys = future.result()
+                    except exceptions.InvalidPath:
+                        continue
+                    yield folder, keys
+                    if max_depth is None or depth < max_depth:
+                        pending.extend((folder + key, depth + 1) for key in keys if key.endswith('/'))
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+@contextmanager
+def open_file(path_or_fileobj, mode):
+    """Open a file by path, or pass through an already open file object.
+
+    File objects passed in are left open on exit; files opened by path are closed.
+
+    :param path_or_fileobj: Path of the file to open, or a file object.
+    :type path_or_fileobj: str | file
+    :param mode: Mode to open the file in when a path is provided.
+    :type mode: str
+    :return: The file object.
+    :rtype: file
+    """
+    if hasattr(path_or_fileobj, 'read') or hasattr(path_or_fileobj, 'write'):
+        yield path_or_fileobj
+        return
+    with open(path_or_fileobj, mode) as fileobj:
+        yield fileobj
+
+
+def import_string(dotted_path):
+    """Import a class (or other module attribute) given its dotted path.
+
+    :param dotted_path: Dotted path of the attribute, e.g. "hvac.api.auth_methods.azure.Azure".
+    :type dotted_path: str
+    :return: The imported attribute.
+    :rtype: object
+    """
+    module_name, attr_name = dotted_path.rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), attr_name)
+
+
+def install_lazy_imports(module_name, attributes=None, submodules=()):
+    """Defer importing attributes and submodules of a module until they are first accessed.
+
+    Relies on module level __getattr__ support (PEP 562); on Python versions predating it everything is imported
+    immediately instead.
+
+    :param module_name: Name of the module to install the lazy imports in, usually __name__.
+    :type module_name: str
+    :param attributes: Mapping of attribute names to the dotted paths they are imported from, e.g.
+        {"Azure": "hvac.api.auth_methods.azure.Azure"}.
+    :type attributes: dict
+    :param submodules: Names of submodules to import when accessed as attributes of the module.
+    :type submodules: list[str]
+    """
+    module = sys.modules[module_name]
+    attributes = attributes or {}
+
+    def load(name):
+        if name in attributes:
+            value = import_string(attributes[name])
+        else:
+            value = importlib.import_module('{module}.{name}'.format(module=module_name, name=name))
+        setattr(module, name, value)
+        return value
+
+    if sys.version_info < (3, 7):
+        for name in list(attributes) + list(submodules):
+            load(name)
+        return
+
+    def __getattr__(name):
+        if name in attributes or name in submodules:
+            return load(name)
+        raise AttributeError('module {module!r} has no attribute {name!r}'.format(module=module_name, name=name))
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(attributes) | set(submodules))
+
+    module.__getattr__ = __getattr__
+    module.__dir__ = __dir__
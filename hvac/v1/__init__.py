@@ -8,12 +8,6 @@ from hvac import aws_utils, exceptions, adapters, utils, api
 from hvac.constants.client import DEPRECATED_PROPERTIES, DEFAULT_URL
 from hvac.utils import generate_property_deprecation_message
 
-try:
-    import hcl
-    has_hcl_parser = True
-except ImportError:
-    has_hcl_parser = False
-
 
 class Client(object):
     """The hvac Client class for HashiCorp's Vault."""
@@ -21,7 +15,8 @@ class Client(object):
     def __init__(self, url=None, token=None,
                  cert=None, verify=True, timeout=30, proxies=None,
                  allow_redirects=True, session=None, adapter=adapters.JSONAdapter,
-                 namespace=None, **kwargs):
+                 namespace=None, pool_connections=adapters.DEFAULT_POOLSIZE, pool_maxsize=adapters.DEFAULT_POOLSIZE,
+                 pool_block=False, keep_alive_timeout=None, **kwargs):
         """Creates a new hvac client instance.
 
         :param url: Base URL for the Vault instance being addressed.
@@ -50,6 +45,14 @@ class Client(object):
         :type kwargs: dict
         :param namespace: Optional Vault Namespace.
         :type namespace: str
+        :param pool_connections: The number of connection pools (i.e., distinct hosts) to cache.
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of connections to keep open per host.
+        :type pool_maxsize: int
+        :param pool_block: Whether requests should block waiting for a free connection once the pool is exhausted.
+        :type pool_block: bool
+        :param keep_alive_timeout: Optional number of seconds pooled connections may sit idle before being closed.
+        :type keep_alive_timeout: int | float
         """
 
         token = token if token is not None else utils.get_token_from_env()
@@ -64,6 +67,10 @@ class Client(object):
             allow_redirects=allow_redirects,
             session=session,
             namespace=namespace,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive_timeout=keep_alive_timeout,
             **kwargs
         )
 
@@ -257,7 +264,10 @@ class Client(object):
             return None
 
         if parse:
-            if not has_hcl_parser:
+            # pyhcl is only imported when needed as it is slow to import.
+            try:
+                import hcl
+            except ImportError:
                 raise ImportError('pyhcl is required for policy parsing')
             policy = hcl.loads(policy)
 
@@ -620,7 +630,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.iam_login,
+        new_method='hvac.api.auth_methods.aws.Aws.iam_login',
     )
     def auth_aws_iam(self, access_key, secret_key, session_token=None, header_value=None, mount_point='aws', role='', use_token=True, region='us-east-1'):
         """POST /auth/<mount point>/login
@@ -669,7 +679,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.ec2_login,
+        new_method='hvac.api.auth_methods.aws.Aws.ec2_login',
     )
     def auth_ec2(self, pkcs7, nonce=None, role=None, use_token=True, mount_point='aws-ec2'):
         """POST /auth/<mount point>/login
@@ -932,7 +942,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.configure,
+        new_method='hvac.api.auth_methods.aws.Aws.configure',
     )
     def create_vault_ec2_client_configuration(self, access_key, secret_key, endpoint=None, mount_point='aws-ec2'):
         """POST /auth/<mount_point>/config/client
@@ -974,7 +984,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.read_config,
+        new_method='hvac.api.auth_methods.aws.Aws.read_config',
     )
     def get_vault_ec2_client_configuration(self, mount_point='aws-ec2'):
         """GET /auth/<mount_point>/config/client
@@ -988,7 +998,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.delete_config,
+        new_method='hvac.api.auth_methods.aws.Aws.delete_config',
     )
     def delete_vault_ec2_client_configuration(self, mount_point='aws-ec2'):
         """DELETE /auth/<mount_point>/config/client
@@ -1002,7 +1012,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.create_certificate_configuration,
+        new_method='hvac.api.auth_methods.aws.Aws.create_certificate_configuration',
     )
     def create_vault_ec2_certificate_configuration(self, cert_name, aws_public_cert, mount_point='aws-ec2'):
         """POST /auth/<mount_point>/config/certificate/<cert_name>
@@ -1024,7 +1034,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.read_certificate_configuration,
+        new_method='hvac.api.auth_methods.aws.Aws.read_certificate_configuration',
     )
     def get_vault_ec2_certificate_configuration(self, cert_name, mount_point='aws-ec2'):
         """GET /auth/<mount_point>/config/certificate/<cert_name>
@@ -1040,7 +1050,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.list_certificate_configurations,
+        new_method='hvac.api.auth_methods.aws.Aws.list_certificate_configurations',
     )
     def list_vault_ec2_certificate_configurations(self, mount_point='aws-ec2'):
         """GET /auth/<mount_point>/config/certificates?list=true
@@ -1055,7 +1065,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.create_role,
+        new_method='hvac.api.auth_methods.aws.Aws.create_role',
     )
     def create_ec2_role(self, role, bound_ami_id=None, bound_account_id=None, bound_iam_role_arn=None,
                         bound_iam_instance_profile_arn=None, bound_ec2_instance_id=None, bound_region=None,
@@ -1149,7 +1159,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.read_role,
+        new_method='hvac.api.auth_methods.aws.Aws.read_role',
     )
     def get_ec2_role(self, role, mount_point='aws-ec2'):
         """GET /auth/<mount_point>/role/<role>
@@ -1165,7 +1175,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.delete_role,
+        new_method='hvac.api.auth_methods.aws.Aws.delete_role',
     )
     def delete_ec2_role(self, role, mount_point='aws-ec2'):
         """DELETE /auth/<mount_point>/role/<role>
@@ -1181,7 +1191,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.list_roles,
+        new_method='hvac.api.auth_methods.aws.Aws.list_roles',
     )
     def list_ec2_roles(self, mount_point='aws-ec2'):
         """GET /auth/<mount_point>/roles?list=true
@@ -1198,7 +1208,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.11.2',
-        new_method=api.auth_methods.Aws.create_role_tags,
+        new_method='hvac.api.auth_methods.aws.Aws.create_role_tags',
     )
     def create_ec2_role_tag(self, role, policies=None, max_ttl=None, instance_id=None,
                             disallow_reauthentication=False, allow_instance_migration=False, mount_point='aws-ec2'):
@@ -1672,7 +1682,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.create_key,
+        new_method='hvac.api.secrets_engines.transit.Transit.create_key',
     )
     def transit_create_key(self, name, convergent_encryption=None, derived=None, exportable=None,
                            key_type=None, mount_point='transit'):
@@ -1708,7 +1718,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.read_key,
+        new_method='hvac.api.secrets_engines.transit.Transit.read_key',
     )
     def transit_read_key(self, name, mount_point='transit'):
         """GET /<mount_point>/keys/<name>
@@ -1725,7 +1735,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.list_keys,
+        new_method='hvac.api.secrets_engines.transit.Transit.list_keys',
     )
     def transit_list_keys(self, mount_point='transit'):
         """GET /<mount_point>/keys?list=true
@@ -1740,7 +1750,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.delete_key,
+        new_method='hvac.api.secrets_engines.transit.Transit.delete_key',
     )
     def transit_delete_key(self, name, mount_point='transit'):
         """DELETE /<mount_point>/keys/<name>
@@ -1757,7 +1767,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.update_key_configuration,
+        new_method='hvac.api.secrets_engines.transit.Transit.update_key_configuration',
     )
     def transit_update_key(self, name, min_decryption_version=None, min_encryption_version=None, deletion_allowed=None,
                            mount_point='transit'):
@@ -1789,7 +1799,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.rotate_key,
+        new_method='hvac.api.secrets_engines.transit.Transit.rotate_key',
     )
     def transit_rotate_key(self, name, mount_point='transit'):
         """POST /<mount_point>/keys/<name>/rotate
@@ -1806,7 +1816,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.export_key,
+        new_method='hvac.api.secrets_engines.transit.Transit.export_key',
     )
     def transit_export_key(self, name, key_type, version=None, mount_point='transit'):
         """GET /<mount_point>/export/<key_type>/<name>(/<version>)
@@ -1830,7 +1840,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.encrypt_data,
+        new_method='hvac.api.secrets_engines.transit.Transit.encrypt_data',
     )
     def transit_encrypt_data(self, name, plaintext, context=None, key_version=None, nonce=None, batch_input=None,
                              key_type=None, convergent_encryption=None, mount_point='transit'):
@@ -1878,7 +1888,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.decrypt_data,
+        new_method='hvac.api.secrets_engines.transit.Transit.decrypt_data',
     )
     def transit_decrypt_data(self, name, ciphertext, context=None, nonce=None, batch_input=None, mount_point='transit'):
         """POST /<mount_point>/decrypt/<name>
@@ -1913,7 +1923,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.rewrap_data,
+        new_method='hvac.api.secrets_engines.transit.Transit.rewrap_data',
     )
     def transit_rewrap_data(self, name, ciphertext, context=None, key_version=None, nonce=None, batch_input=None,
                             mount_point='transit'):
@@ -1953,7 +1963,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.generate_data_key,
+        new_method='hvac.api.secrets_engines.transit.Transit.generate_data_key',
     )
     def transit_generate_data_key(self, name, key_type, context=None, nonce=None, bits=None, mount_point='transit'):
         """POST /<mount_point>/datakey/<type>/<name>
@@ -1986,7 +1996,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.generate_random_bytes,
+        new_method='hvac.api.secrets_engines.transit.Transit.generate_random_bytes',
     )
     def transit_generate_rand_bytes(self, data_bytes=None, output_format=None, mount_point='transit'):
         """POST /<mount_point>/random(/<data_bytes>)
@@ -2013,7 +2023,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.hash_data,
+        new_method='hvac.api.secrets_engines.transit.Transit.hash_data',
     )
     def transit_hash_data(self, hash_input, algorithm=None, output_format=None, mount_point='transit'):
         """POST /<mount_point>/hash(/<algorithm>)
@@ -2044,7 +2054,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.generate_hmac,
+        new_method='hvac.api.secrets_engines.transit.Transit.generate_hmac',
     )
     def transit_generate_hmac(self, name, hmac_input, key_version=None, algorithm=None, mount_point='transit'):
         """POST /<mount_point>/hmac/<name>(/<algorithm>)
@@ -2076,7 +2086,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.sign_data,
+        new_method='hvac.api.secrets_engines.transit.Transit.sign_data',
     )
     def transit_sign_data(self, name, input_data, key_version=None, algorithm=None, context=None, prehashed=None,
                           mount_point='transit', signature_algorithm='pss'):
@@ -2121,7 +2131,7 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.secrets_engines.Transit.verify_signed_data,
+        new_method='hvac.api.secrets_engines.transit.Transit.verify_signed_data',
     )
     def transit_verify_signed_data(self, name, input_data, algorithm=None, signature=None, hmac=None, context=None,
                                    prehashed=None, mount_point='transit', signature_algorithm='pss'):
@@ -2570,21 +2580,21 @@ class Client(object):
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.8.0',
-        new_method=api.auth_methods.Ldap.login,
+        new_method='hvac.api.auth_methods.ldap.Ldap.login',
     )
     def auth_ldap(self, *args, **kwargs):
         return self.auth.ldap.login(*args, **kwargs)
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.9.0',
-        new_method=api.auth_methods.Gcp.login,
+        new_method='hvac.api.auth_methods.gcp.Gcp.login',
     )
     def auth_gcp(self, *args, **kwargs):
         return self.auth.gcp.login(*args, **kwargs)
 
     @utils.deprecated_method(
         to_be_removed_in_version='0.8.0',
-        new_method=api.auth_methods.Github.login,
+        new_method='hvac.api.auth_methods.github.Github.login',
     )
     def auth_github(self, *args, **kwargs):
         return self.auth.github.login(*args, **kwargs)
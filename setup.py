@@ -31,10 +31,15 @@ setup(
     install_requires=[
         'requests>=2.21.0',
         'six>=1.5.0',
+        'futures>=3.0.0; python_version < "3.2"',
     ],
     include_package_data=True,
     package_data={'hvac': ['version']},
     extras_require={
-        'parser': ['pyhcl>=0.3.10']
+        'parser': ['pyhcl>=0.3.10'],
+        'aiohttp': ['aiohttp>=3.6.0'],
+        'cryptography': ['cryptography>=2.0'],
+        'orjson': ['orjson>=2.0'],
+        'ujson': ['ujson>=1.35'],
     }
 )
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Microbenchmark of the per-call overhead added by hvac's adapters.
+
+The underlying Requests session is replaced with a stub returning a canned response, so the reported times only cover
+the work done by hvac itself (URL and header building, middleware dispatch and JSON decoding).
+
+Usage: python tests/benchmarks/bench_adapter_request.py [--iterations N]
+"""
+import argparse
+import timeit
+
+import requests
+
+from hvac import adapters, json_codec
+
+
+class StubSession(requests.Session):
+    """A Requests session returning the same canned response for every request without touching the network."""
+
+    def __init__(self, body=b'{"data": {"data": {"foo": "bar"}, "metadata": {"version": 1}}}'):
+        super(StubSession, self).__init__()
+        self.response = requests.Response()
+        self.response.status_code = 200
+        self.response.headers['Content-Type'] = 'application/json'
+        self.response._content = body
+
+    def request(self, method, url, **kwargs):
+        return self.response
+
+
+def run(iterations):
+    cases = [
+        ('RawAdapter.get', adapters.RawAdapter, dict(token='s.token', namespace='ns1'), '/v1/secret/data/hvac'),
+        ('RawAdapter.get (unnormalized path)', adapters.RawAdapter, dict(token='s.token'), '//v1//secret/data/hvac/'),
+        ('JSONAdapter.get', adapters.JSONAdapter, dict(token='s.token', namespace='ns1'), '/v1/secret/data/hvac'),
+    ]
+    for name in sorted(json_codec.CODECS):
+        try:
+            json_codec.get_codec(name)
+        except ImportError:
+            continue
+        cases.append((
+            'JSONAdapter.get ({codec} codec)'.format(codec=name),
+            adapters.JSONAdapter,
+            dict(token='s.token', json_codec=name),
+            '/v1/secret/data/hvac',
+        ))
+    print('{name:<40} {usec:>12}'.format(name='case', usec='usec/call'))
+    for name, adapter_class, adapter_kwargs, path in cases:
+        adapter = adapter_class(session=StubSession(), **adapter_kwargs)
+        best = min(timeit.repeat(lambda: adapter.get(path), number=iterations, repeat=5))
+        print('{name:<40} {usec:>12.2f}'.format(name=name, usec=best / iterations * 1e6))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    run(parser.parse_args().iterations)
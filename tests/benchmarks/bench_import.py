@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of the time taken to import hvac and construct a client in a fresh interpreter.
+
+Each statement is timed in a new Python process, as in a serverless cold start; interpreter startup itself is not
+included. The number of hvac modules imported by each statement is also reported.
+
+Usage: python tests/benchmarks/bench_import.py [--runs N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+STATEMENTS = [
+    ('import hvac', 'import hvac'),
+    ('from hvac import Client', 'from hvac import Client'),
+    ('hvac.Client()', 'import hvac; hvac.Client()'),
+    ('client.secrets.kv.v2', 'import hvac; hvac.Client().secrets.kv.v2'),
+    ('all auth methods and secrets engines', 'from hvac.api.auth_methods import *; from hvac.api.secrets_engines import *'),
+]
+
+TIMER = '''
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, len([name for name in sys.modules if name == 'hvac' or name.startswith('hvac.')]))
+'''
+
+
+def time_statement(statement, runs):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=root)
+    results = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', TIMER.format(statement=statement)], env=env)
+        elapsed, module_count = output.split()
+        results.append((float(elapsed), int(module_count)))
+    return min(results)
+
+
+def run(runs):
+    print('{name:<40} {msec:>10} {modules:>14}'.format(name='statement', msec='msec', modules='hvac modules'))
+    for name, statement in STATEMENTS:
+        elapsed, module_count = time_statement(statement, runs)
+        print('{name:<40} {msec:>10.1f} {modules:>14}'.format(name=name, msec=elapsed * 1e3, modules=module_count))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    run(parser.parse_args().runs)
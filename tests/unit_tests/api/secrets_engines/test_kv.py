@@ -66,3 +66,19 @@ class TestKv(TestCase):
         kv._default_kv_version = 0
         with self.assertRaises(AttributeError):
             assert kv.read_secret
+
+    def test_adapter_property(self):
+        kv = Kv(adapter=MagicMock())
+        kv_v1 = kv.v1
+
+        new_adapter = MagicMock()
+        kv.adapter = new_adapter
+
+        self.assertIs(
+            expr1=kv_v1.adapter,
+            expr2=new_adapter,
+        )
+        self.assertIs(
+            expr1=kv.v2.adapter,
+            expr2=new_adapter,
+        )
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+import mock
+import requests_mock
+
+from hvac.adapters import JSONAdapter
+from hvac.api.secrets_engines.kv_v1 import KvV1
+from hvac.cache import TTLCache
+
+
+class TestKvV1(TestCase):
+
+    def setUp(self):
+        self.kv = KvV1(adapter=JSONAdapter(), cache=TTLCache())
+
+    @requests_mock.Mocker()
+    def test_write_invalidates_cache_with_equivalent_path(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/secret/hvac',
+            json={'data': {'foo': 'bar'}},
+        )
+        requests_mocker.register_uri(
+            method='POST',
+            url='http://localhost:8200/v1/secret/hvac',
+            status_code=204,
+        )
+        self.kv.read_secret(path='/hvac')
+        self.kv.create_or_update_secret(path='hvac', secret={'foo': 'baz'}, method='PUT')
+        self.kv.read_secret(path='/hvac')
+
+        self.assertEqual(first=3, second=requests_mocker.call_count)
+
+    @requests_mock.Mocker()
+    def test_read_secret_cached(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/secret/hvac',
+            json={'data': {'foo': 'bar'}, 'lease_duration': 2764800},
+        )
+        requests_mocker.register_uri(
+            method='POST',
+            url='http://localhost:8200/v1/secret/hvac',
+            status_code=204,
+        )
+        self.kv.read_secret(path='hvac')
+        self.kv.read_secret(path='hvac')
+        self.kv.create_or_update_secret(path='hvac', secret={'foo': 'baz'}, method='PUT')
+        self.kv.read_secret(path='hvac')
+
+        self.assertEqual(first=3, second=requests_mocker.call_count)
+
+    @requests_mock.Mocker()
+    def test_read_secret_ignores_lease_duration(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/secret/hvac',
+            json={'data': {'foo': 'bar'}, 'lease_duration': 2764800},
+        )
+        self.kv.cache = TTLCache(default_ttl=60)
+        with mock.patch('hvac.cache.time.time', return_value=1000):
+            self.kv.read_secret(path='hvac')
+        with mock.patch('hvac.cache.time.time', return_value=1061):
+            self.kv.read_secret(path='hvac')
+
+        self.assertEqual(first=2, second=requests_mocker.call_count)
+
+    @requests_mock.Mocker()
+    def test_read_racing_write_not_cached(self, requests_mocker):
+        def read_overtaken_by_write(request, context):
+            self.kv.create_or_update_secret(path='hvac', secret={'foo': 'baz'}, method='PUT')
+            return {'data': {'foo': 'bar'}}
+
+        requests_mocker.register_uri(method='GET', url='http://localhost:8200/v1/secret/hvac', json=read_overtaken_by_write)
+        requests_mocker.register_uri(method='POST', url='http://localhost:8200/v1/secret/hvac', status_code=204)
+        self.kv.read_secret(path='hvac')
+
+        self.assertEqual(first=0, second=len(self.kv.cache))
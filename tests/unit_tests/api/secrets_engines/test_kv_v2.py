@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+import requests_mock
+from parameterized import parameterized, param
+
+from hvac.adapters import JSONAdapter
+from hvac.api.secrets_engines.kv_v2 import KvV2
+from hvac.cache import TTLCache
+from hvac.exceptions import InvalidPath
+
+
+class TestKvV2(TestCase):
+
+    def setUp(self):
+        self.mock_response = {
+            'data': {
+                'data': {'foo': 'bar'},
+                'metadata': {'version': 1},
+            },
+            'lease_duration': 0,
+        }
+        self.kv = KvV2(adapter=JSONAdapter(), cache=TTLCache())
+
+    @requests_mock.Mocker()
+    def test_read_secret_version_cached(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/secret/data/hvac',
+            json=self.mock_response,
+        )
+        for _ in range(3):
+            response = self.kv.read_secret_version(path='hvac')
+        self.kv.read_secret_version(path='hvac', version=1)
+
+        self.assertEqual(first=self.mock_response, second=response)
+        self.assertEqual(first=2, second=requests_mocker.call_count)
+
+    @parameterized.expand([
+        param('create_or_update_secret', 'POST', 'data', dict(secret={'foo': 'baz'})),
+        param('delete_latest_version_of_secret', 'DELETE', 'data', {}),
+        param('delete_secret_versions', 'POST', 'delete', dict(versions=[1])),
+        param('undelete_secret_versions', 'POST', 'undelete', dict(versions=[1])),
+        param('destroy_secret_versions', 'POST', 'destroy', dict(versions=[1])),
+        param('delete_metadata_and_all_versions', 'DELETE', 'metadata', {}),
+    ])
+    @requests_mock.Mocker()
+    def test_write_invalidates_cache(self, method_name, http_method, route, kwargs, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/secret/data/hvac',
+            json=self.mock_response,
+        )
+        requests_mocker.register_uri(
+            method=http_method,
+            url='http://localhost:8200/v1/secret/{route}/hvac'.format(route=route),
+            status_code=204,
+        )
+        self.kv.read_secret_version(path='hvac')
+        self.kv.read_secret_version(path='hvac', version=1)
+        getattr(self.kv, method_name)(path='hvac', **kwargs)
+
+        self.assertEqual(first=0, second=len(self.kv.cache))
+
+    @requests_mock.Mocker()
+    def test_write_invalidates_cache_with_equivalent_path(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/secret/data/hvac/app',
+            json=self.mock_response,
+        )
+        requests_mocker.register_uri(
+            method='POST',
+            url='http://localhost:8200/v1/secret/data/hvac/app',
+            json=self.mock_response,
+        )
+        self.kv.read_secret_version(path='/hvac//app/')
+        self.kv.read_secret_version(path='hvac/app')
+        self.kv.create_or_update_secret(path='hvac/app', secret={'foo': 'baz'})
+
+        self.assertEqual(first=2, second=requests_mocker.call_count)
+        self.assertEqual(first=0, second=len(self.kv.cache))
+
+    @requests_mock.Mocker()
+    def test_read_secrets(self, requests_mocker):
+        for path in ('one', 'two'):
+            requests_mocker.register_uri(
+                method='GET',
+                url='http://localhost:8200/v1/secret/data/{path}'.format(path=path),
+                json=self.mock_response,
+            )
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/secret/data/missing',
+            status_code=404,
+        )
+        results = KvV2(adapter=JSONAdapter()).read_secrets(paths=['one', 'two', 'missing', 'one'], max_workers=2)
+
+        self.assertEqual(first={'one', 'two', 'missing'}, second=set(results))
+        self.assertEqual(first=self.mock_response, second=results['one'])
+        self.assertEqual(first=self.mock_response, second=results['two'])
+        self.assertIsInstance(results['missing'], InvalidPath)
+        self.assertEqual(first=3, second=requests_mocker.call_count)
+
+    @parameterized.expand([
+        param('full tree', None, ['', 'a/', 'a/b/', 'c/']),
+        param('depth limited', 1, ['', 'a/', 'c/']),
+        param('root only', 0, ['']),
+    ])
+    @requests_mock.Mocker()
+    def test_walk(self, label, max_depth, expected_folders, requests_mocker):
+        tree = {
+            '': ['a/', 'c/', 'top'],
+            'a/': ['b/', 'one'],
+            'a/b/': ['two'],
+        }
+        for folder, keys in tree.items():
+            requests_mocker.register_uri(
+                method='LIST',
+                url='http://localhost:8200/v1/secret/metadata/{folder}'.format(folder=folder).rstrip('/'),
+                json={'data': {'keys': keys}},
+            )
+        requests_mocker.register_uri(
+            method='LIST',
+            url='http://localhost:8200/v1/secret/metadata/c',
+            status_code=404,
+        )
+        results = dict(KvV2(adapter=JSONAdapter()).walk(max_depth=max_depth, max_workers=2))
+
+        self.assertEqual(
+            first={folder: tree[folder] for folder in expected_folders if folder in tree},
+            second=results,
+        )
+        self.assertEqual(first=len(expected_folders), second=requests_mocker.call_count)
@@ -0,0 +1,151 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+import requests_mock
+from six.moves import BaseHTTPServer
+
+from hvac import exceptions
+from hvac.adapters import JSONAdapter
+from hvac.api.system_backend import Raft
+from hvac.api.system_backend.raft import SnapshotReader
+
+SNAPSHOT = os.urandom(256 * 1024 + 17)
+SNAPSHOT_SHA256 = hashlib.sha256(SNAPSHOT).hexdigest()
+
+
+class SnapshotHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        content_length = int(self.headers['Content-Length'])
+        body = self.rfile.read(content_length)
+        if len(body) < content_length:
+            # The client aborted the upload.
+            return
+        self.received.append((self.path, body))
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRaft(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.snapshot_path = os.path.join(self.tmp_dir, 'raft.snap')
+
+    @requests_mock.Mocker()
+    def test_save_raft_snapshot(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/sys/storage/raft/snapshot',
+            content=SNAPSHOT,
+            headers={'Content-Length': str(len(SNAPSHOT))},
+        )
+        progress = []
+        raft = Raft(adapter=JSONAdapter())
+        result = raft.save_raft_snapshot(
+            self.snapshot_path,
+            chunk_size=64 * 1024,
+            checksum_algorithm='sha256',
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+        self.assertEqual(first={'size': len(SNAPSHOT), 'checksum': SNAPSHOT_SHA256}, second=result)
+        with open(self.snapshot_path, 'rb') as snapshot_file:
+            self.assertEqual(first=SNAPSHOT, second=snapshot_file.read())
+        self.assertEqual(first=5, second=len(progress))
+        self.assertEqual(first=(len(SNAPSHOT), len(SNAPSHOT)), second=progress[-1])
+
+    @requests_mock.Mocker()
+    def test_save_raft_snapshot_to_fileobj(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/sys/storage/raft/snapshot',
+            content=SNAPSHOT,
+        )
+        fileobj = io.BytesIO()
+        result = Raft(adapter=JSONAdapter()).save_raft_snapshot(fileobj)
+        self.assertEqual(first={'size': len(SNAPSHOT), 'checksum': None}, second=result)
+        self.assertEqual(first=SNAPSHOT, second=fileobj.getvalue())
+        self.assertFalse(fileobj.closed)
+
+    def test_snapshot_reader(self):
+        with open(self.snapshot_path, 'wb') as snapshot_file:
+            snapshot_file.write(SNAPSHOT)
+        progress = []
+        with open(self.snapshot_path, 'rb') as snapshot_file:
+            reader = SnapshotReader(
+                snapshot_file,
+                chunk_size=100 * 1024,
+                checksum_algorithm='sha256',
+                progress_callback=lambda done, total: progress.append((done, total)),
+            )
+            self.assertEqual(first=len(SNAPSHOT), second=len(reader))
+            chunks = list(reader)
+        self.assertEqual(first=[100 * 1024, 100 * 1024, 56 * 1024 + 17], second=[len(chunk) for chunk in chunks])
+        self.assertEqual(first=SNAPSHOT_SHA256, second=reader.hexdigest())
+        self.assertEqual(first=(len(SNAPSHOT), len(SNAPSHOT)), second=progress[-1])
+
+        # Streams of unknown length are uploaded with chunked transfer encoding.
+        self.assertEqual(first=0, second=len(SnapshotReader(iter_only_stream(SNAPSHOT))))
+
+    def test_restore_raft_snapshot_from(self):
+        server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), SnapshotHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        SnapshotHandler.received = []
+
+        with open(self.snapshot_path, 'wb') as snapshot_file:
+            snapshot_file.write(SNAPSHOT)
+        raft = Raft(adapter=JSONAdapter(base_uri='http://127.0.0.1:{port}'.format(port=server.server_address[1])))
+
+        response = raft.restore_raft_snapshot_from(
+            self.snapshot_path,
+            checksum_algorithm='sha256',
+            expected_checksum=SNAPSHOT_SHA256,
+        )
+        self.assertEqual(first=204, second=response.status_code)
+        with open(self.snapshot_path, 'rb') as snapshot_file:
+            raft.restore_raft_snapshot_from(snapshot_file, force=True)
+        self.assertEqual(
+            first=[
+                ('/v1/sys/storage/raft/snapshot', SNAPSHOT),
+                ('/v1/sys/storage/raft/snapshot-force', SNAPSHOT),
+            ],
+            second=SnapshotHandler.received,
+        )
+
+        with self.assertRaises(exceptions.ParamValidationError):
+            raft.restore_raft_snapshot_from(
+                self.snapshot_path,
+                checksum_algorithm='sha256',
+                expected_checksum='0' * 64,
+            )
+        self.assertEqual(first=2, second=len(SnapshotHandler.received))
+
+    def test_restore_raft_snapshot_from_requires_algorithm(self):
+        with self.assertRaises(exceptions.ParamValidationError):
+            Raft(adapter=JSONAdapter()).restore_raft_snapshot_from(self.snapshot_path, expected_checksum='abc')
+
+
+class iter_only_stream(object):
+    """A readable stream without a file descriptor or known length."""
+
+    def __init__(self, data):
+        self._buffer = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._buffer.read(size)
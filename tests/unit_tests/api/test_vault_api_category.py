@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from unittest import TestCase
 
 from mock import create_autospec
@@ -71,3 +73,74 @@ class TestVaultApiCategory(TestCase):
             first=self.mock_vault_api_category._implementedvaultapibase.adapter,
             second=new_adapter,
         )
+
+    def test_implemented_classes_created_lazily(self):
+        self.assertNotIn(
+            member='_implementedvaultapibase',
+            container=self.mock_vault_api_category.__dict__,
+        )
+        instance = self.mock_vault_api_category.implementedvaultapibase
+        self.assertIsInstance(
+            obj=instance,
+            cls=ImplementedVaultApiBase,
+        )
+        self.assertIs(
+            expr1=self.mock_vault_api_category.implementedvaultapibase,
+            expr2=instance,
+        )
+        self.assertIs(
+            expr1=self.mock_vault_api_category._implementedvaultapibase,
+            expr2=instance,
+        )
+
+    def test_adapter_property_propagates_to_created_instances(self):
+        instance = self.mock_vault_api_category.implementedvaultapibase
+
+        new_adapter = create_autospec(Adapter)
+        self.mock_vault_api_category.adapter = new_adapter
+
+        self.assertIs(
+            expr1=instance._adapter,
+            expr2=new_adapter,
+        )
+
+
+class LazyVaultApiCategory(VaultApiCategory):
+    implemented_class_paths = [
+        'tests.unit_tests.api.test_vault_api_category.ImplementedVaultApiBase',
+    ]
+    unimplemented_classes = []
+
+
+class TestLazyVaultApiCategory(TestCase):
+
+    def test_implemented_class_paths(self):
+        category = LazyVaultApiCategory(adapter=create_autospec(Adapter))
+        self.assertEqual(
+            first=['implementedvaultapibase'],
+            second=category.implemented_class_names,
+        )
+        self.assertEqual(
+            first=[ImplementedVaultApiBase],
+            second=category.implemented_classes,
+        )
+        self.assertIsInstance(
+            obj=category.implementedvaultapibase,
+            cls=ImplementedVaultApiBase,
+        )
+
+    def test_import_hvac_defers_api_modules(self):
+        script = (
+            'import sys, hvac\n'
+            'assert "hvac.v1" not in sys.modules\n'
+            'client = hvac.Client()\n'
+            'assert "hvac.api.secrets_engines.kv" not in sys.modules\n'
+            'assert client.secrets.kv.v2\n'
+            'assert "hvac.api.secrets_engines.kv_v2" in sys.modules\n'
+            'assert "hvac.api.auth_methods.ldap" not in sys.modules\n'
+            'from hvac.api.auth_methods import Ldap\n'
+            'assert Ldap is client.auth.ldap.__class__\n'
+            'import hvac.api.secrets_engines as secrets_engines\n'
+            'assert "KvV1" in dir(secrets_engines)\n'
+        )
+        subprocess.check_call([sys.executable, '-c', script])
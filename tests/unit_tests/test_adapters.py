@@ -1,12 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import io
 import logging
 from unittest import TestCase
 
+import mock
+import requests
 import requests_mock
 from parameterized import parameterized, param
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
 
-from hvac import adapters
+from hvac import adapters, exceptions
+from hvac.retry import RetryPolicy
 
 
 class TestRequest(TestCase):
@@ -112,3 +117,285 @@ class TestRequest(TestCase):
             first=mock_response,
             second=response.json()
         )
+
+    def test_pool_configuration(self):
+        adapter = adapters.RawAdapter(pool_connections=4, pool_maxsize=64, pool_block=True)
+        for prefix in ('http://', 'https://'):
+            http_adapter = adapter.session.get_adapter(prefix)
+            self.assertEqual(first=4, second=http_adapter._pool_connections)
+            self.assertEqual(first=64, second=http_adapter._pool_maxsize)
+            self.assertTrue(http_adapter._pool_block)
+
+    @requests_mock.Mocker()
+    def test_pool_stats(self, requests_mocker):
+        adapter = adapters.RawAdapter(pool_maxsize=16)
+        self.assertEqual(first={}, second=adapter.pool_stats())
+
+        http_adapter = adapter.session.get_adapter(adapters.DEFAULT_BASE_URI)
+        http_adapter.poolmanager.connection_from_url(adapters.DEFAULT_BASE_URI)
+        self.assertEqual(
+            first={
+                'http://localhost:8200': {
+                    'maxsize': 16,
+                    'in_use': 0,
+                    'idle': 0,
+                    'num_connections': 0,
+                    'num_requests': 0,
+                },
+            },
+            second=adapter.pool_stats(),
+        )
+
+    @parameterized.expand([
+        param('no timeout configured', keep_alive_timeout=None, idle_seconds=3600, expect_close=False),
+        param('idle within timeout', keep_alive_timeout=60, idle_seconds=30, expect_close=False),
+        param('idle beyond timeout', keep_alive_timeout=60, idle_seconds=90, expect_close=True),
+    ])
+    def test_expire_idle_connections(self, label, keep_alive_timeout, idle_seconds, expect_close):
+        adapter = adapters.RawAdapter(keep_alive_timeout=keep_alive_timeout)
+        http_adapter = adapter.session.get_adapter(adapters.DEFAULT_BASE_URI)
+        pool = http_adapter.poolmanager.connection_from_url(adapters.DEFAULT_BASE_URI)
+        # Check out two connection slots, returning one to the pool as an idle connection.
+        pool.pool.get()
+        pool.pool.get()
+        idle_conn, in_use_conn = mock.Mock(), mock.Mock()
+        pool.pool.put(idle_conn)
+        with mock.patch.object(adapter.session, 'close') as mock_session_close, \
+                mock.patch('hvac.adapters.time.time', side_effect=[1000, 1000 + idle_seconds]):
+            adapter.expire_idle_connections()
+            adapter.expire_idle_connections()
+        self.assertEqual(
+            first=expect_close,
+            second=idle_conn.close.called,
+        )
+        in_use_conn.close.assert_not_called()
+        mock_session_close.assert_not_called()
+        self.assertIn(idle_conn, pool.pool.queue)
+
+    @parameterized.expand([
+        param('retried GET', 'GET', False, 3),
+        param('write not retried', 'POST', False, 1),
+        param('idempotent write retried', 'POST', True, 3),
+    ])
+    @requests_mock.Mocker()
+    def test_retry_policy(self, label, method, idempotent, expected_attempts, requests_mocker):
+        mock_url = '{}/v1/sys/health'.format(adapters.DEFAULT_BASE_URI)
+        requests_mocker.register_uri(
+            method=method,
+            url=mock_url,
+            response_list=[
+                {'status_code': 503, 'text': 'sealed'},
+                {'status_code': 429, 'text': 'slow down', 'headers': {'Retry-After': '2'}},
+                {'status_code': 200, 'json': {}},
+            ],
+        )
+        adapter = adapters.RawAdapter(retry_policy=RetryPolicy(max_attempts=3))
+        with mock.patch('hvac.retry.time.sleep') as mock_sleep:
+            if expected_attempts == 1:
+                with self.assertRaises(exceptions.VaultDown):
+                    adapter.request(method, 'v1/sys/health', idempotent=idempotent)
+            else:
+                response = adapter.request(method, 'v1/sys/health', idempotent=idempotent)
+                self.assertEqual(first=200, second=response.status_code)
+                self.assertGreaterEqual(mock_sleep.call_args_list[-1][0][0], 2)
+        self.assertEqual(
+            first=expected_attempts,
+            second=requests_mocker.call_count,
+        )
+
+    @requests_mock.Mocker()
+    def test_retry_policy_gives_up(self, requests_mocker):
+        mock_url = '{}/v1/secret/foo'.format(adapters.DEFAULT_BASE_URI)
+        requests_mocker.register_uri(method='GET', url=mock_url, status_code=502, text='bad gateway')
+        adapter = adapters.RawAdapter(retry_policy=RetryPolicy(max_attempts=4))
+        with mock.patch('hvac.retry.time.sleep'):
+            with self.assertRaises(exceptions.BadGateway):
+                adapter.get('v1/secret/foo')
+        self.assertEqual(first=4, second=requests_mocker.call_count)
+
+    @requests_mock.Mocker()
+    def test_retry_policy_connection_error(self, requests_mocker):
+        mock_url = '{}/v1/secret/foo'.format(adapters.DEFAULT_BASE_URI)
+        requests_mocker.register_uri(
+            method='GET',
+            url=mock_url,
+            response_list=[
+                {'exc': requests.exceptions.ConnectionError},
+                {'status_code': 200, 'json': {'data': {}}},
+            ],
+        )
+        adapter = adapters.RawAdapter(retry_policy=RetryPolicy(budget=10))
+        with mock.patch('hvac.retry.time.sleep'):
+            response = adapter.get('v1/secret/foo')
+        self.assertEqual(first=200, second=response.status_code)
+        self.assertLessEqual(requests_mocker.last_request.timeout, 10)
+
+    @requests_mock.Mocker()
+    def test_retry_policy_ignores_unraised_statuses(self, requests_mocker):
+        mock_url = '{}/v1/sys/health'.format(adapters.DEFAULT_BASE_URI)
+        requests_mocker.register_uri(method='GET', url=mock_url, status_code=429, json={'standby': True})
+        adapter = adapters.RawAdapter(retry_policy=RetryPolicy())
+        response = adapter.get('v1/sys/health', raise_exception=False)
+        self.assertEqual(first=429, second=response.status_code)
+        self.assertEqual(first=1, second=requests_mocker.call_count)
+
+    @requests_mock.Mocker()
+    def test_static_headers_follow_token_and_namespace(self, requests_mocker):
+        requests_mocker.register_uri(method='GET', url=requests_mock.ANY, json={})
+        adapter = adapters.RawAdapter(token='s.first')
+        adapter.get('/v1/sys/health')
+        self.assertEqual(first='s.first', second=requests_mocker.last_request.headers['X-Vault-Token'])
+        self.assertNotIn('X-Vault-Namespace', requests_mocker.last_request.headers)
+
+        adapter.token = 's.second'
+        adapter.namespace = 'ns1'
+        adapter.base_uri = 'https://vault.example.com:8200/'
+        caller_headers = {'X-Custom': 'value'}
+        adapter.get('/v1/sys/health', headers=caller_headers, wrap_ttl='60s')
+        last_request = requests_mocker.last_request
+        self.assertEqual(first='https://vault.example.com:8200/v1/sys/health', second=last_request.url)
+        self.assertEqual(first='s.second', second=last_request.headers['X-Vault-Token'])
+        self.assertEqual(first='ns1', second=last_request.headers['X-Vault-Namespace'])
+        self.assertEqual(first='60s', second=last_request.headers['X-Vault-Wrap-TTL'])
+        self.assertEqual(first='value', second=last_request.headers['X-Custom'])
+        self.assertEqual(first={'X-Custom': 'value'}, second=caller_headers)
+
+    @requests_mock.Mocker()
+    def test_request_kwargs_do_not_leak(self, requests_mocker):
+        requests_mocker.register_uri(method='GET', url=requests_mock.ANY, json={})
+        adapter = adapters.RawAdapter(timeout=30)
+        adapter.get('/v1/sys/health', timeout=5)
+        self.assertEqual(first=5, second=requests_mocker.last_request.timeout)
+        adapter.get('/v1/sys/health')
+        self.assertEqual(first=30, second=requests_mocker.last_request.timeout)
+
+    @requests_mock.Mocker()
+    def test_json_adapter_leaves_streamed_responses(self, requests_mocker):
+        requests_mocker.register_uri(method='GET', url=requests_mock.ANY, json={'data': {}})
+        adapter = adapters.JSONAdapter()
+        self.assertEqual(first={'data': {}}, second=adapter.get('/v1/secret/foo'))
+        response = adapter.get('/v1/secret/foo', stream=True)
+        self.assertIsInstance(response, requests.Response)
+        self.assertFalse(response._content_consumed)
+
+
+class TestHAAdapter(TestCase):
+    nodes = ['http://vault-0:8200', 'http://vault-1:8200', 'http://vault-2:8200']
+
+    def register_health(self, requests_mocker, statuses):
+        for node, status_code in zip(self.nodes, statuses):
+            requests_mocker.register_uri(
+                method='GET',
+                url='{node}/v1/sys/health'.format(node=node),
+                status_code=status_code,
+                json={},
+            )
+
+    @requests_mock.Mocker()
+    def test_discover(self, requests_mocker):
+        self.register_health(requests_mocker, [429, 200, 503])
+        adapter = adapters.HARawAdapter(nodes=self.nodes)
+        self.assertEqual(
+            first={
+                'http://vault-0:8200': 'standby',
+                'http://vault-1:8200': 'active',
+                'http://vault-2:8200': 'unavailable',
+            },
+            second=adapter.discover(),
+        )
+        self.assertEqual(first='http://vault-1:8200', second=adapter.base_uri)
+
+    @parameterized.expand([
+        param('write', 'POST', False, 'http://vault-1:8200'),
+        param('read', 'GET', False, 'http://vault-1:8200'),
+        param('read from standbys', 'GET', True, 'http://vault-2:8200'),
+        param('write with read from standbys', 'PUT', True, 'http://vault-1:8200'),
+    ])
+    @requests_mock.Mocker()
+    def test_routing(self, label, method, read_from_standbys, expected_node, requests_mocker):
+        self.register_health(requests_mocker, [429, 200, 473])
+        for node in self.nodes:
+            requests_mocker.register_uri(method=method, url='{node}/v1/secret/foo'.format(node=node), json={'data': {}})
+        adapter = adapters.HAJSONAdapter(nodes=self.nodes, read_from_standbys=read_from_standbys)
+        response = adapter.request(method, '/v1/secret/foo')
+        self.assertEqual(first={'data': {}}, second=response)
+        self.assertEqual(
+            first='{node}/v1/secret/foo'.format(node=expected_node),
+            second=requests_mocker.last_request.url,
+        )
+
+    @parameterized.expand([
+        param('connect timeout', requests.exceptions.ConnectTimeout('timed out')),
+        param('connection refused', requests.exceptions.ConnectionError(MaxRetryError(
+            pool=None, url='/v1/secret/foo', reason=NewConnectionError(None, 'Connection refused'),
+        ))),
+    ])
+    @requests_mock.Mocker()
+    def test_failover(self, label, error, requests_mocker):
+        self.register_health(requests_mocker, [429, 200, 429])
+        requests_mocker.register_uri(method='POST', url='http://vault-1:8200/v1/secret/foo', exc=error)
+        requests_mocker.register_uri(method='POST', url='http://vault-0:8200/v1/secret/foo', status_code=204)
+        adapter = adapters.HARawAdapter(nodes=self.nodes)
+        response = adapter.post('/v1/secret/foo', json={'foo': 'bar'})
+        self.assertEqual(first=204, second=response.status_code)
+        self.assertEqual(first='unavailable', second=adapter.roles['http://vault-1:8200'])
+
+    @requests_mock.Mocker()
+    def test_aborted_write_not_resent(self, requests_mocker):
+        self.register_health(requests_mocker, [429, 200, 429])
+        requests_mocker.register_uri(
+            method='POST',
+            url='http://vault-1:8200/v1/secret/foo',
+            exc=requests.exceptions.ConnectionError(ProtocolError('Connection aborted.', Exception('Remote end closed'))),
+        )
+        requests_mocker.register_uri(method='POST', url='http://vault-0:8200/v1/secret/foo', status_code=204)
+        adapter = adapters.HARawAdapter(nodes=self.nodes)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            adapter.post('/v1/secret/foo', json={'foo': 'bar'})
+        self.assertEqual(
+            first=['http://vault-1:8200/v1/secret/foo'],
+            second=[request.url for request in requests_mocker.request_history if request.method == 'POST'],
+        )
+
+    @requests_mock.Mocker()
+    def test_failover_rewinds_file_body(self, requests_mocker):
+        self.register_health(requests_mocker, [429, 200, 429])
+        bodies = []
+
+        def refuse_connection(request, context):
+            bodies.append(request.body.read())
+            raise requests.exceptions.ConnectTimeout('timed out')
+
+        def record_body(request, context):
+            bodies.append(request.body.read())
+            context.status_code = 204
+
+        requests_mocker.register_uri(method='POST', url='http://vault-1:8200/v1/sys/storage/raft/snapshot',
+                                     content=refuse_connection)
+        requests_mocker.register_uri(method='POST', url='http://vault-0:8200/v1/sys/storage/raft/snapshot',
+                                     content=record_body)
+        adapter = adapters.HARawAdapter(nodes=self.nodes)
+        response = adapter.post('/v1/sys/storage/raft/snapshot', data=io.BytesIO(b'snapshot'))
+        self.assertEqual(first=204, second=response.status_code)
+        self.assertEqual(first=[b'snapshot', b'snapshot'], second=bodies)
+
+    @requests_mock.Mocker()
+    def test_no_failover_for_unseekable_body(self, requests_mocker):
+        self.register_health(requests_mocker, [429, 200, 429])
+        requests_mocker.register_uri(method='POST', url=requests_mock.ANY, exc=requests.exceptions.ConnectTimeout)
+        adapter = adapters.HARawAdapter(nodes=self.nodes)
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            adapter.post('/v1/sys/storage/raft/snapshot', data=iter([b'snap', b'shot']))
+        self.assertEqual(first=1, second=len([request for request in requests_mocker.request_history
+                                             if request.method == 'POST']))
+
+    @requests_mock.Mocker()
+    def test_all_nodes_unavailable(self, requests_mocker):
+        requests_mocker.register_uri(method='GET', url=requests_mock.ANY, exc=requests.exceptions.ConnectionError)
+        adapter = adapters.HARawAdapter(nodes=self.nodes)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            adapter.get('/v1/secret/foo')
+        self.assertEqual(
+            first=set(self.nodes),
+            second={request.url.rsplit('/v1/', 1)[0] for request in requests_mocker.request_history},
+        )
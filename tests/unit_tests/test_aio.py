@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import functools
+from unittest import TestCase, skipIf
+
+from hvac import exceptions
+from hvac.json_codec import StdlibJSONCodec
+from hvac.middleware import Middleware
+from hvac.retry import RetryPolicy
+from hvac.aio import AsyncClient, AsyncJSONAdapter, AsyncRawAdapter, has_aiohttp
+
+if has_aiohttp:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+
+def run_in_loop(test_method):
+    """Run a coroutine test method to completion in the test case's event loop."""
+    @functools.wraps(test_method)
+    def wrapper(self):
+        return self.loop.run_until_complete(test_method(self))
+    return wrapper
+
+
+@skipIf(not has_aiohttp, 'aiohttp not installed')
+class TestAsyncAdapters(TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.requests = []
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self.handler)
+        self.server = TestServer(app)
+        self.loop.run_until_complete(self.server.start_server())
+        self.base_uri = str(self.server.make_url(''))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.server.close())
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    async def handler(self, request):
+        body = await request.read()
+        self.requests.append((request.method, request.path_qs, dict(request.headers), body))
+        if request.path == '/v1/secret/data/missing':
+            return web.json_response({'errors': []}, status=404)
+        if request.path == '/v1/sys/mounts':
+            return web.json_response({'data': {'secret/': {'options': {'version': '2'}}}})
+        if request.path == '/v1/sys/seal-status':
+            return web.json_response({'sealed': False})
+        if request.path == '/v1/auth/ldap/login/hvac':
+            return web.json_response({'auth': {'client_token': 's.new-token'}})
+        if request.method == 'DELETE':
+            return web.Response(status=204)
+        return web.json_response({'data': {'method': request.method, 'path': request.path}})
+
+    @run_in_loop
+    async def test_json_adapter_with_api_class(self):
+        client = AsyncClient(url=self.base_uri, token='s.token')
+        async with client:
+            response = await client.secrets.kv.v2.read_secret_version(path='hvac', version=2)
+
+        self.assertEqual(
+            first={'data': {'method': 'GET', 'path': '/v1/secret/data/hvac'}},
+            second=response,
+        )
+        method, path_qs, headers, _ = self.requests[0]
+        self.assertEqual(first='/v1/secret/data/hvac?version=2', second=path_qs)
+        self.assertEqual(first='s.token', second=headers['X-Vault-Token'])
+
+    @run_in_loop
+    async def test_raw_adapter_returns_response(self):
+        adapter = AsyncRawAdapter(base_uri=self.base_uri, namespace='ns1')
+        response = await adapter.delete('/v1//secret/hvac')
+        await adapter.close()
+
+        self.assertEqual(first=204, second=response.status)
+        method, path_qs, headers, _ = self.requests[0]
+        self.assertEqual(first='/v1/secret/hvac', second=path_qs)
+        self.assertEqual(first='ns1', second=headers['X-Vault-Namespace'])
+
+    @run_in_loop
+    async def test_params_and_wrap_ttl(self):
+        adapter = AsyncJSONAdapter(base_uri=self.base_uri)
+        response = await adapter.get('/v1/auth/token/accessors', params={'list': True, 'skipped': None})
+        await adapter.get('/v1/some/path', wrap_ttl='60s')
+        await adapter.close()
+
+        self.assertEqual(first='GET', second=response['data']['method'])
+        self.assertEqual(first='/v1/auth/token/accessors?list=true', second=self.requests[0][1])
+        self.assertEqual(first='60s', second=self.requests[1][2]['X-Vault-Wrap-TTL'])
+
+    @run_in_loop
+    async def test_login_sets_token(self):
+        client = AsyncClient(url=self.base_uri)
+        await client.auth.ldap.login(username='hvac', password='hvac')
+        await client.close()
+
+        self.assertEqual(first='s.new-token', second=client.token)
+
+    @run_in_loop
+    async def test_error_raises(self):
+        adapter = AsyncJSONAdapter(base_uri=self.base_uri)
+        with self.assertRaises(exceptions.InvalidPath):
+            await adapter.get('/v1/secret/data/missing')
+
+        response = await adapter.get('/v1/secret/data/missing', raise_exception=False)
+        await adapter.close()
+        self.assertEqual(first=404, second=response.status)
+
+    @run_in_loop
+    async def test_middleware_hooks(self):
+        calls = []
+
+        class RecordingMiddleware(Middleware):
+            def before_request(self, request):
+                calls.append(('before', request.method, request.path))
+                request.headers['X-Request-Id'] = 'abc'
+
+            def after_response(self, request, response):
+                calls.append(('after', response.status))
+                return response
+
+        adapter = AsyncJSONAdapter(base_uri=self.base_uri, middleware=[RecordingMiddleware()])
+        self.assertEqual(first=1, second=len(adapter.get_middleware()))
+        await adapter.get('/v1/secret/data/hvac')
+        await adapter.close()
+
+        self.assertEqual(first=[('before', 'get', 'v1/secret/data/hvac'), ('after', 200)], second=calls)
+        self.assertEqual(first='abc', second=self.requests[0][2]['X-Request-ID'])
+
+    def test_add_middleware_rejects_blocking_middleware(self):
+        adapter = AsyncRawAdapter(base_uri=self.base_uri)
+        with self.assertRaises(exceptions.ParamValidationError):
+            adapter.add_middleware(RetryPolicy())
+        self.assertEqual(first=[], second=adapter.get_middleware())
+
+    @run_in_loop
+    async def test_json_codec(self):
+        class RecordingCodec(StdlibJSONCodec):
+            def __init__(self):
+                self.calls = []
+
+            def dumps(self, obj):
+                self.calls.append('dumps')
+                return super(RecordingCodec, self).dumps(obj)
+
+            def loads(self, data):
+                self.calls.append('loads')
+                return super(RecordingCodec, self).loads(data)
+
+        self.assertIsInstance(AsyncJSONAdapter().json_codec, StdlibJSONCodec)
+        codec = RecordingCodec()
+        async with AsyncClient(url=self.base_uri, token='s.token', json_codec=codec) as client:
+            response = await client.secrets.kv.v2.create_or_update_secret(path='hvac', secret={'foo': 'bar'})
+
+        self.assertEqual(first={'data': {'method': 'POST', 'path': '/v1/secret/data/hvac'}}, second=response)
+        self.assertEqual(first=['dumps', 'loads'], second=codec.calls)
+        method, path_qs, headers, body = self.requests[0]
+        self.assertEqual(first='application/json', second=headers['Content-Type'])
+        self.assertEqual(first={'options': {}, 'data': {'foo': 'bar'}}, second=StdlibJSONCodec().loads(body))
+
+    @run_in_loop
+    async def test_pool_stats(self):
+        adapter = AsyncRawAdapter(base_uri=self.base_uri, keep_alive_timeout=30)
+        self.assertEqual(first={}, second=adapter.pool_stats())
+        adapter.expire_idle_connections()
+        await adapter.get('/v1/secret/data/hvac')
+        stats = adapter.pool_stats()
+        await adapter.close()
+
+        self.assertEqual(
+            first={'maxsize': 10, 'in_use': 0, 'idle': 1, 'num_connections': None, 'num_requests': None},
+            second=stats[self.base_uri.rstrip('/')],
+        )
+
+    @run_in_loop
+    async def test_api_methods_processing_responses(self):
+        async with AsyncClient(url=self.base_uri, token='s.token') as client:
+            config = await client.auth.aws.read_config()
+            option = await client.sys.retrieve_mount_option(mount_point='secret', option_name='version')
+            sealed = await client.sys.is_sealed()
+
+        self.assertEqual(first={'method': 'GET', 'path': '/v1/auth/aws/config/client'}, second=config)
+        self.assertEqual(first='2', second=option)
+        self.assertFalse(sealed)
+
+    def test_api_methods_sending_dependent_requests_raise(self):
+        client = AsyncClient(url=self.base_uri, token='s.token')
+        with self.assertRaises(NotImplementedError):
+            client.secrets.kv.v2.patch(path='hvac', secret={'foo': 'bar'})
+        with self.assertRaises(NotImplementedError):
+            client.secrets.kv.v1.create_or_update_secret(path='hvac', secret={'foo': 'bar'})
+        with self.assertRaises(NotImplementedError):
+            client.sys.submit_unseal_keys(keys=['key'])
+        self.assertEqual(first=[], second=self.requests)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+import mock
+
+from hvac.cache import TTLCache
+
+
+class TestTTLCache(TestCase):
+
+    def test_get_returns_copy(self):
+        cache = TTLCache()
+        value = {'data': {'key': 'value'}}
+        cache.set('key', value)
+        cached_value = cache.get('key')
+        cached_value['data']['key'] = 'changed'
+
+        self.assertEqual(
+            first=value,
+            second=cache.get('key'),
+        )
+        self.assertEqual(first=2, second=cache.hits)
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(first=1, second=cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(first=3, second=cache.get('c'))
+
+    def test_ttl_expiry(self):
+        cache = TTLCache(default_ttl=60, max_ttl=120)
+        with mock.patch('hvac.cache.time.time', return_value=1000):
+            cache.set('default', 1)
+            cache.set('explicit', 2, ttl=90)
+            cache.set('capped', 3, ttl=3600)
+        with mock.patch('hvac.cache.time.time', return_value=1075):
+            self.assertIsNone(cache.get('default'))
+            self.assertEqual(first=2, second=cache.get('explicit'))
+            self.assertEqual(first=3, second=cache.get('capped'))
+        with mock.patch('hvac.cache.time.time', return_value=1125):
+            self.assertIsNone(cache.get('capped'))
+
+    def test_invalidate_matching(self):
+        cache = TTLCache()
+        cache.set(('secret', 'hvac', None), 1)
+        cache.set(('secret', 'hvac', 2), 2)
+        cache.set(('secret', 'other', None), 3)
+        cache.invalidate_matching(lambda key: key[:2] == ('secret', 'hvac'))
+
+        self.assertEqual(first=1, second=len(cache))
+        self.assertEqual(first=3, second=cache.get(('secret', 'other', None)))
+
+    def test_set_skipped_after_invalidation(self):
+        cache = TTLCache()
+        generation = cache.generation
+        cache.invalidate('key')
+        cache.set('key', 'stale', generation=generation)
+        self.assertIsNone(cache.get('key'))
+
+        cache.set('key', 'fresh', generation=cache.generation)
+        self.assertEqual(first='fresh', second=cache.get('key'))
@@ -0,0 +1,128 @@
+from unittest import TestCase
+
+import mock
+import requests_mock
+
+from hvac import Client
+from hvac.capabilities_cache import CapabilitiesCache
+
+VAULT_URL = 'http://localhost:8200'
+
+
+def lookup_response(accessor, policies, ttl=3600):
+    return {'data': {'accessor': accessor, 'policies': policies, 'identity_policies': None, 'ttl': ttl}}
+
+
+class TestCapabilitiesCache(TestCase):
+
+    def setUp(self):
+        self.client = Client(url=VAULT_URL, token='s.gateway')
+        self.cache = CapabilitiesCache(self.client)
+
+    def register(self, requests_mocker, capabilities, policies=('default', 'app')):
+        requests_mocker.register_uri(
+            method='POST',
+            url='{}/v1/auth/token/lookup'.format(VAULT_URL),
+            json=lookup_response('accessor-1', list(policies)),
+        )
+
+        def capabilities_callback(request, context):
+            paths = request.json()['paths']
+            data = {path: capabilities[path] for path in paths}
+            return dict(data, data=data)
+
+        requests_mocker.register_uri(
+            method='POST',
+            url='{}/v1/sys/capabilities'.format(VAULT_URL),
+            json=capabilities_callback,
+        )
+
+    def capabilities_calls(self, requests_mocker):
+        return [request.json()['paths'] for request in requests_mocker.request_history
+                if request.path == '/v1/sys/capabilities']
+
+    @requests_mock.Mocker()
+    def test_prefetch_and_cache(self, requests_mocker):
+        capabilities = {
+            'secret/data/app': ['read', 'list'],
+            'secret/data/admin': ['deny'],
+            'sys/mounts': ['root'],
+        }
+        self.register(requests_mocker, capabilities)
+
+        self.assertEqual(
+            first={'secret/data/app': ['read', 'list'], 'secret/data/admin': ['deny']},
+            second=self.cache.prefetch(['secret/data/app', 'secret/data/admin'], token='s.user'),
+        )
+        self.assertTrue(self.cache.has_capability('secret/data/app', 'read', token='s.user'))
+        self.assertFalse(self.cache.has_capability('secret/data/app', 'update', token='s.user'))
+        self.assertFalse(self.cache.has_capability('secret/data/admin', 'read', token='s.user'))
+        self.assertTrue(self.cache.has_capability('sys/mounts', 'update', token='s.user'))
+
+        self.assertEqual(
+            first=[['secret/data/app', 'secret/data/admin'], ['sys/mounts']],
+            second=self.capabilities_calls(requests_mocker),
+        )
+        lookups = [request for request in requests_mocker.request_history if request.path == '/v1/auth/token/lookup']
+        self.assertEqual(first=1, second=len(lookups))
+
+    @requests_mock.Mocker()
+    def test_ttl_bounded_by_token(self, requests_mocker):
+        self.register(requests_mocker, {'secret/data/app': ['read']})
+        requests_mocker.register_uri(
+            method='POST',
+            url='{}/v1/auth/token/lookup'.format(VAULT_URL),
+            json=lookup_response('accessor-1', ['app'], ttl=10),
+        )
+        with mock.patch('hvac.cache.time.time', return_value=1000), \
+                mock.patch('hvac.capabilities_cache.time.time', return_value=1000):
+            self.cache.get_capabilities('secret/data/app', token='s.user')
+        with mock.patch('hvac.cache.time.time', return_value=1009):
+            self.cache.get_capabilities('secret/data/app', token='s.user')
+        self.assertEqual(first=1, second=len(self.capabilities_calls(requests_mocker)))
+        with mock.patch('hvac.cache.time.time', return_value=1011), \
+                mock.patch('hvac.capabilities_cache.time.time', return_value=1011):
+            self.cache.get_capabilities('secret/data/app', token='s.user')
+        self.assertEqual(first=2, second=len(self.capabilities_calls(requests_mocker)))
+
+    @requests_mock.Mocker()
+    def test_policy_changes_invalidate(self, requests_mocker):
+        self.register(requests_mocker, {'secret/data/app': ['read']})
+        requests_mocker.register_uri(method='PUT', url=requests_mock.ANY, status_code=204)
+        requests_mocker.register_uri(method='DELETE', url=requests_mock.ANY, status_code=204)
+
+        self.cache.get_capabilities('secret/data/app', token='s.user')
+        self.client.sys.create_or_update_policy(name='unrelated', policy='path "x" { capabilities = ["read"] }')
+        self.cache.get_capabilities('secret/data/app', token='s.user')
+        self.assertEqual(first=1, second=len(self.capabilities_calls(requests_mocker)))
+
+        self.client.sys.delete_policy(name='app')
+        self.cache.get_capabilities('secret/data/app', token='s.user')
+        self.assertEqual(first=2, second=len(self.capabilities_calls(requests_mocker)))
+
+    @requests_mock.Mocker()
+    def test_self_and_accessor(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='{}/v1/auth/token/lookup-self'.format(VAULT_URL),
+            json=lookup_response('accessor-self', ['gateway'], ttl=0),
+        )
+        requests_mocker.register_uri(
+            method='POST',
+            url='{}/v1/sys/capabilities-self'.format(VAULT_URL),
+            json={'secret/data/app': ['read'], 'capabilities': ['read'], 'data': {'secret/data/app': ['read']}},
+        )
+        requests_mocker.register_uri(
+            method='POST',
+            url='{}/v1/auth/token/lookup-accessor'.format(VAULT_URL),
+            json=lookup_response('accessor-2', ['app']),
+        )
+        requests_mocker.register_uri(
+            method='POST',
+            url='{}/v1/sys/capabilities-accessor'.format(VAULT_URL),
+            json={'capabilities': ['list']},
+        )
+        self.assertEqual(first=['read'], second=self.cache.get_capabilities('secret/data/app'))
+        self.assertEqual(first=['list'], second=self.cache.get_capabilities('secret/data/app', accessor='accessor-2'))
+        self.assertEqual(first=['read'], second=self.cache.get_capabilities('secret/data/app'))
+        self.assertEqual(first=4, second=requests_mocker.call_count)
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+import mock
+import requests
+import requests_mock
+
+from hvac import adapters, exceptions
+from hvac.circuit_breaker import CircuitBreaker
+
+ENDPOINT = 'http://localhost:8200'
+
+
+class TestCircuitBreaker(TestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3)
+        for _ in range(2):
+            breaker.check_endpoint(ENDPOINT)
+            breaker.record_failure(ENDPOINT)
+        self.assertEqual(first=CircuitBreaker.CLOSED, second=breaker.state(ENDPOINT))
+
+        breaker.record_failure(ENDPOINT)
+        self.assertEqual(first=CircuitBreaker.OPEN, second=breaker.state(ENDPOINT))
+        with self.assertRaises(exceptions.CircuitBreakerOpen):
+            breaker.check_endpoint(ENDPOINT)
+        self.assertEqual(first=CircuitBreaker.CLOSED, second=breaker.state('http://other:8200'))
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure(ENDPOINT)
+        breaker.record_success(ENDPOINT)
+        breaker.record_failure(ENDPOINT)
+        self.assertEqual(first=CircuitBreaker.CLOSED, second=breaker.state(ENDPOINT))
+
+    def test_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        with mock.patch('hvac.circuit_breaker.time.time', return_value=1000):
+            breaker.record_failure(ENDPOINT)
+        with mock.patch('hvac.circuit_breaker.time.time', return_value=1031):
+            self.assertEqual(first=CircuitBreaker.HALF_OPEN, second=breaker.state(ENDPOINT))
+            breaker.check_endpoint(ENDPOINT)
+            with self.assertRaises(exceptions.CircuitBreakerOpen):
+                # Only a single trial request is let through at a time.
+                breaker.check_endpoint(ENDPOINT)
+            breaker.record_failure(ENDPOINT)
+            self.assertEqual(first=CircuitBreaker.OPEN, second=breaker.state(ENDPOINT))
+        with mock.patch('hvac.circuit_breaker.time.time', return_value=1062):
+            breaker.check_endpoint(ENDPOINT)
+            breaker.record_success(ENDPOINT)
+            self.assertEqual(first=CircuitBreaker.CLOSED, second=breaker.state(ENDPOINT))
+
+    def test_is_failure(self):
+        breaker = CircuitBreaker()
+        self.assertTrue(breaker.is_failure(error=requests.exceptions.ConnectTimeout()))
+        self.assertTrue(breaker.is_failure(response=mock.Mock(status_code=503)))
+        self.assertFalse(breaker.is_failure(response=mock.Mock(status_code=404)))
+        self.assertFalse(breaker.is_failure(error=ValueError()))
+
+    @requests_mock.Mocker()
+    def test_adapter_fails_fast(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='{}/v1/secret/foo'.format(ENDPOINT),
+            exc=requests.exceptions.ConnectionError,
+        )
+        adapter = adapters.JSONAdapter(base_uri=ENDPOINT, circuit_breaker=CircuitBreaker(failure_threshold=2))
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                adapter.get('/v1/secret/foo')
+        with self.assertRaises(exceptions.VaultDown):
+            adapter.get('/v1/secret/foo')
+        self.assertEqual(first=2, second=requests_mocker.call_count)
@@ -0,0 +1,155 @@
+from unittest import TestCase
+
+import mock
+import requests_mock
+
+from hvac import Client, exceptions
+from hvac.identity_index import IdentityIndex
+
+VAULT_URL = 'http://localhost:8200'
+
+ALICE = {
+    'id': 'e-alice',
+    'name': 'alice',
+    'policies': ['default'],
+    'aliases': [{'id': 'a-alice', 'name': 'alice@corp', 'mount_accessor': 'auth_oidc'}],
+}
+BOB = {'id': 'e-bob', 'name': 'bob', 'policies': [], 'aliases': []}
+ENG = {'id': 'g-eng', 'name': 'eng', 'policies': ['eng'], 'alias': {}}
+ADMINS = {
+    'id': 'g-admins',
+    'name': 'admins',
+    'type': 'external',
+    'alias': {'id': 'ga-admins', 'name': 'admins', 'mount_accessor': 'auth_oidc'},
+}
+
+
+class TestIdentityIndex(TestCase):
+
+    def setUp(self):
+        self.requests_mocker = requests_mock.Mocker()
+        self.requests_mocker.start()
+        self.addCleanup(self.requests_mocker.stop)
+        self.register_state(entities=[ALICE], groups=[ENG, ADMINS])
+        self.index = IdentityIndex(Client(url=VAULT_URL))
+        self.index.refresh()
+
+    def register_state(self, entities, groups):
+        for endpoint, objects in (('entity', entities), ('group', groups)):
+            self.requests_mocker.register_uri(
+                method='LIST',
+                url='{}/v1/identity/{}/id'.format(VAULT_URL, endpoint),
+                json={'data': {'keys': [obj['id'] for obj in objects]}},
+            )
+            for obj in objects:
+                self.requests_mocker.register_uri(
+                    method='GET',
+                    url='{}/v1/identity/{}/id/{}'.format(VAULT_URL, endpoint, obj['id']),
+                    json={'data': obj},
+                )
+        entity_aliases = {
+            alias['id']: dict(alias, canonical_id=entity['id']) for entity in entities for alias in entity['aliases']
+        }
+        self.requests_mocker.register_uri(
+            method='LIST',
+            url='{}/v1/identity/entity-alias/id'.format(VAULT_URL),
+            json={'data': {'keys': list(entity_aliases), 'key_info': entity_aliases}},
+        )
+        group_aliases = {group['alias']['id']: dict(group['alias'], canonical_id=group['id']) for group in groups if group['alias']}
+        if group_aliases:
+            self.requests_mocker.register_uri(
+                method='LIST',
+                url='{}/v1/identity/group-alias/id'.format(VAULT_URL),
+                json={'data': {'keys': list(group_aliases), 'key_info': group_aliases}},
+            )
+        else:
+            self.requests_mocker.register_uri(
+                method='LIST',
+                url='{}/v1/identity/group-alias/id'.format(VAULT_URL),
+                status_code=404,
+            )
+
+    def reads(self):
+        return [request.path for request in self.requests_mocker.request_history if request.method == 'GET']
+
+    def test_lookups(self):
+        self.assertEqual(first=ALICE, second=self.index.get_entity(entity_id='e-alice'))
+        self.assertEqual(first=ALICE, second=self.index.get_entity(name='alice'))
+        self.assertEqual(first=ALICE, second=self.index.get_entity(alias_id='a-alice'))
+        self.assertEqual(first=ALICE, second=self.index.get_entity(alias_name='alice@corp', alias_mount_accessor='auth_oidc'))
+        self.assertEqual(first=ENG, second=self.index.get_group(name='eng'))
+        self.assertEqual(first=ADMINS, second=self.index.get_group(alias_name='admins', alias_mount_accessor='auth_oidc'))
+        with self.assertRaises(exceptions.ParamValidationError):
+            self.index.get_entity(alias_name='alice@corp')
+
+    def test_refresh_is_incremental(self):
+        self.register_state(entities=[ALICE, BOB], groups=[ENG])
+        self.requests_mocker.reset_mock()
+        self.index.refresh()
+
+        self.assertEqual(first=['/v1/identity/entity/id/e-bob'], second=self.reads())
+        self.assertEqual(first=BOB, second=self.index.get_entity(name='bob'))
+        self.assertEqual(first=ALICE, second=self.index.get_entity(name='alice'))
+        self.index.fallback = False
+        self.assertIsNone(self.index.get_group(name='admins'))
+        self.assertIsNone(self.index.get_group(alias_id='ga-admins'))
+
+    def test_detail_ttl(self):
+        self.index.detail_ttl = 60
+        self.requests_mocker.reset_mock()
+        with mock.patch('hvac.identity_index.time.time', return_value=self.index.refreshed_at + 30):
+            self.index.refresh()
+        self.assertEqual(first=[], second=self.reads())
+        with mock.patch('hvac.identity_index.time.time', return_value=self.index.refreshed_at + 61):
+            self.index.refresh()
+        self.assertEqual(
+            first=['/v1/identity/entity/id/e-alice', '/v1/identity/group/id/g-admins', '/v1/identity/group/id/g-eng'],
+            second=sorted(self.reads()),
+        )
+
+    def test_default_detail_ttl_picks_up_renames(self):
+        self.register_state(entities=[dict(ALICE, name='alice2', policies=['admin'])], groups=[ENG, ADMINS])
+        with mock.patch('hvac.identity_index.time.time', return_value=self.index.refreshed_at + 301):
+            self.index.refresh()
+
+        self.index.fallback = False
+        self.assertIsNone(self.index.get_entity(name='alice'))
+        self.assertEqual(first=['admin'], second=self.index.get_entity(name='alice2')['policies'])
+
+    def test_refresh_discards_misses_from_earlier_lookups(self):
+        self.requests_mocker.register_uri(method='POST', url='{}/v1/identity/lookup/entity'.format(VAULT_URL), status_code=204)
+
+        identity = self.index.client.secrets.identity
+        original_lookup_entity = identity.lookup_entity
+
+        def lookup_entity(**kwargs):
+            self.index.refresh()
+            return original_lookup_entity(**kwargs)
+
+        with mock.patch.object(identity, 'lookup_entity', side_effect=lookup_entity):
+            self.assertIsNone(self.index.get_entity(name='bob'))
+        self.assertEqual(first=0, second=len(self.index._misses))
+
+    def test_fallback(self):
+        self.requests_mocker.register_uri(
+            method='POST',
+            url='{}/v1/identity/lookup/entity'.format(VAULT_URL),
+            additional_matcher=lambda request: request.json() == {'alias_name': 'bob@corp', 'alias_mount_accessor': 'auth_oidc'},
+            json={'data': dict(BOB, aliases=[{'id': 'a-bob', 'name': 'bob@corp', 'mount_accessor': 'auth_oidc'}])},
+        )
+        self.requests_mocker.register_uri(
+            method='POST',
+            url='{}/v1/identity/lookup/entity'.format(VAULT_URL),
+            additional_matcher=lambda request: request.json() == {'name': 'nobody'},
+            status_code=204,
+        )
+        self.assertEqual(first='e-bob', second=self.index.get_entity(alias_name='bob@corp', alias_mount_accessor='auth_oidc')['id'])
+        self.assertEqual(first='e-bob', second=self.index.get_entity(alias_id='a-bob')['id'])
+        self.assertIsNone(self.index.get_entity(name='nobody'))
+        self.assertIsNone(self.index.get_entity(name='nobody'))
+
+        lookups = [request.json() for request in self.requests_mocker.request_history if request.method == 'POST']
+        self.assertEqual(
+            first=[{'alias_name': 'bob@corp', 'alias_mount_accessor': 'auth_oidc'}, {'name': 'nobody'}],
+            second=lookups,
+        )
@@ -0,0 +1,205 @@
+from unittest import TestCase
+
+import mock
+import requests_mock
+
+from hvac import Client, exceptions
+from hvac.identity_sync import IdentitySync
+
+VAULT_URL = 'http://localhost:8200'
+
+
+def make_state():
+    return {
+        'entities': {'alice': 'e-alice', 'bob': 'e-bob', 'carol': 'e-carol'},
+        'groups': {'eng': 'g-eng', 'ops': 'g-ops', 'idp-admins': 'g-idp'},
+        'entity_aliases': {
+            ('alice@corp', 'auth_oidc'): {'id': 'a-alice', 'canonical_id': 'e-alice'},
+            ('old-alice', 'auth_oidc'): {'id': 'a-old', 'canonical_id': 'e-alice'},
+            ('bob@corp', 'auth_oidc'): {'id': 'a-bob', 'canonical_id': 'e-carol'},
+        },
+        'entity_details': {
+            'alice': {'policies': ['default'], 'metadata': {'team': 'eng'}, 'disabled': False},
+            'bob': {'policies': ['default'], 'metadata': {}, 'disabled': False},
+        },
+        'group_details': {
+            'eng': {'policies': ['eng'], 'metadata': {}, 'type': 'internal', 'member_entity_ids': ['e-alice'],
+                    'member_group_ids': [], 'alias': None},
+            'ops': {'policies': ['ops'], 'metadata': {}, 'type': 'internal', 'member_entity_ids': [],
+                    'member_group_ids': ['g-eng'], 'alias': None},
+            'idp-admins': {'policies': [], 'metadata': {}, 'type': 'internal', 'member_entity_ids': [],
+                           'member_group_ids': [], 'alias': None},
+        },
+    }
+
+
+class TestIdentitySync(TestCase):
+
+    def setUp(self):
+        self.client = mock.MagicMock()
+        self.sync = IdentitySync(self.client)
+
+    def test_plan_unchanged(self):
+        plan = self.sync.plan(
+            entities=[
+                {'name': 'alice', 'policies': 'default', 'metadata': {'team': 'eng'},
+                 'aliases': [{'name': 'alice@corp', 'mount_accessor': 'auth_oidc'},
+                             {'name': 'old-alice', 'mount_accessor': 'auth_oidc'}]},
+                {'name': 'bob', 'disabled': False},
+            ],
+            groups=[
+                {'name': 'eng', 'policies': ['eng'], 'member_entity_names': ['alice']},
+                {'name': 'ops', 'member_group_names': ['eng']},
+            ],
+            state=make_state(),
+        )
+        self.assertEqual(first=0, second=len(plan))
+
+    def test_plan_changes(self):
+        plan = self.sync.plan(
+            entities=[
+                {'name': 'alice', 'policies': ['default', 'eng'],
+                 'aliases': [{'name': 'alice@corp', 'mount_accessor': 'auth_oidc'}]},
+                {'name': 'bob', 'aliases': [{'name': 'bob@corp', 'mount_accessor': 'auth_oidc'}]},
+                {'name': 'dave', 'policies': ['default'], 'aliases': [{'name': 'dave@corp', 'mount_accessor': 'auth_oidc'}]},
+            ],
+            groups=[
+                {'name': 'eng', 'policies': ['eng'], 'member_entity_names': ['alice', 'dave']},
+                {'name': 'sre', 'member_group_names': ['platform']},
+                {'name': 'platform', 'member_entity_names': ['dave']},
+                {'name': 'idp-admins', 'type': 'external', 'alias': {'name': 'admins', 'mount_accessor': 'auth_oidc'}},
+            ],
+            state=make_state(),
+        )
+        self.assertEqual(
+            first={'alice': {'policies': ['default', 'eng']}, 'dave': {'policies': ['default']}},
+            second=plan.entity_writes,
+        )
+        self.assertEqual(
+            first={('bob@corp', 'auth_oidc'): ('bob', 'a-bob'), ('dave@corp', 'auth_oidc'): ('dave', None)},
+            second=plan.entity_alias_writes,
+        )
+        self.assertEqual(first={'a-old'}, second=plan.entity_alias_deletes)
+        self.assertEqual(
+            first=[
+                {
+                    'eng': {'member_entity_names': ['alice', 'dave'], 'type': 'internal'},
+                    'platform': {'member_entity_names': ['dave'], 'type': 'internal'},
+                    'idp-admins': {'type': 'external'},
+                },
+                {'sre': {'member_group_names': ['platform'], 'type': 'internal'}},
+            ],
+            second=plan.group_write_levels,
+        )
+        self.assertEqual(first={'idp-admins': ('admins', 'auth_oidc', None)}, second=plan.group_alias_writes)
+        self.assertEqual(first={'idp-admins': 'g-idp'}, second=plan.group_replacements)
+        self.assertEqual(first={}, second=plan.entity_deletes)
+
+    def test_plan_delete_missing(self):
+        self.sync.delete_missing = True
+        plan = self.sync.plan(entities=[{'name': 'alice'}], groups=[{'name': 'eng'}], state=make_state())
+        self.assertEqual(first={'bob': 'e-bob', 'carol': 'e-carol'}, second=plan.entity_deletes)
+        self.assertEqual(first={'ops': 'g-ops', 'idp-admins': 'g-idp'}, second=plan.group_deletes)
+
+    def test_plan_validation(self):
+        for entities, groups in [
+            ([{'name': 'alice'}, {'name': 'alice'}], []),
+            ([], [{'name': 'eng', 'member_entity_names': ['nobody']}]),
+            ([], [{'name': 'ext', 'type': 'external', 'member_entity_names': ['alice']}]),
+            ([], [{'name': 'eng', 'alias': {'name': 'eng', 'mount_accessor': 'auth_oidc'}}]),
+            ([], [{'name': 'a', 'member_group_names': ['b']}, {'name': 'b', 'member_group_names': ['a']}]),
+        ]:
+            with self.assertRaises(exceptions.ParamValidationError):
+                self.sync.plan(entities=entities, groups=groups, state=make_state())
+
+    def test_apply(self):
+        identity = self.client.secrets.identity
+        identity.create_or_update_entity_by_name.side_effect = lambda name, **kwargs: {'data': {'id': 'e-' + name}}
+        identity.create_or_update_group_by_name.side_effect = lambda name, **kwargs: {'data': {'id': 'g-' + name}}
+        plan = self.sync.plan(
+            entities=[{'name': 'dave', 'policies': ['default'],
+                       'aliases': [{'name': 'dave@corp', 'mount_accessor': 'auth_oidc'}]}],
+            groups=[
+                {'name': 'sre', 'member_group_names': ['platform'], 'member_entity_names': ['alice']},
+                {'name': 'platform', 'member_entity_names': ['dave']},
+            ],
+            state=make_state(),
+        )
+        result = self.sync.apply(plan)
+        self.assertEqual(first={'applied': 4, 'errors': {}}, second=result)
+        identity.create_or_update_entity_alias.assert_called_once_with(
+            name='dave@corp', canonical_id='e-dave', mount_accessor='auth_oidc', mount_point='identity',
+        )
+        identity.create_or_update_group_by_name.assert_any_call(
+            name='sre', group_type='internal', mount_point='identity',
+            member_entity_ids=['e-alice'], member_group_ids=['g-platform'],
+        )
+
+    def test_apply_moves_alias_between_entities(self):
+        identity = self.client.secrets.identity
+        plan = self.sync.plan(
+            entities=[
+                {'name': 'alice', 'aliases': [{'name': 'alice@corp', 'mount_accessor': 'auth_oidc'}]},
+                {'name': 'bob', 'aliases': [{'name': 'old-alice', 'mount_accessor': 'auth_oidc'}]},
+            ],
+            groups=[],
+            state=make_state(),
+        )
+        self.assertEqual(first={('old-alice', 'auth_oidc'): ('bob', 'a-old')}, second=plan.entity_alias_writes)
+        self.assertEqual(first=set(), second=plan.entity_alias_deletes)
+
+        result = self.sync.apply(plan)
+        self.assertEqual(first={}, second=result['errors'])
+        identity.update_entity_alias.assert_called_once_with(
+            alias_id='a-old', name='old-alice', canonical_id='e-bob', mount_accessor='auth_oidc',
+            mount_point='identity',
+        )
+        identity.delete_entity_alias.assert_not_called()
+
+    def test_apply_skips_dependents_of_failures(self):
+        identity = self.client.secrets.identity
+        identity.create_or_update_entity_by_name.side_effect = exceptions.InternalServerError('boom')
+        plan = self.sync.plan(
+            entities=[{'name': 'dave', 'aliases': [{'name': 'dave@corp', 'mount_accessor': 'auth_oidc'}]}],
+            groups=[{'name': 'platform', 'member_entity_names': ['dave']}],
+            state=make_state(),
+        )
+        result = self.sync.apply(plan)
+        self.assertEqual(first=0, second=result['applied'])
+        self.assertEqual(
+            first={('write_entity', 'dave'), ('write_entity_alias', ('dave@corp', 'auth_oidc')), ('write_group', 'platform')},
+            second=set(result['errors']),
+        )
+        identity.create_or_update_entity_alias.assert_not_called()
+
+    @requests_mock.Mocker()
+    def test_fetch_state(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='LIST',
+            url='{}/v1/identity/entity/id'.format(VAULT_URL),
+            json={'data': {'keys': ['e-alice', 'e-bob'], 'key_info': {'e-alice': {'name': 'alice'}, 'e-bob': {'name': 'bob'}}}},
+        )
+        requests_mocker.register_uri(
+            method='LIST',
+            url='{}/v1/identity/entity-alias/id'.format(VAULT_URL),
+            json={'data': {'keys': ['a-alice'], 'key_info': {
+                'a-alice': {'name': 'alice@corp', 'mount_accessor': 'auth_oidc', 'canonical_id': 'e-alice'},
+            }}},
+        )
+        requests_mocker.register_uri(method='LIST', url='{}/v1/identity/group/id'.format(VAULT_URL), status_code=404)
+        requests_mocker.register_uri(
+            method='GET',
+            url='{}/v1/identity/entity/id/e-alice'.format(VAULT_URL),
+            json={'data': {'id': 'e-alice', 'name': 'alice', 'policies': ['b', 'a'], 'metadata': None, 'disabled': False}},
+        )
+        state = IdentitySync(Client(url=VAULT_URL)).fetch_state(entity_names=['alice', 'missing'], group_names=['eng'])
+        self.assertEqual(
+            first={
+                'entities': {'alice': 'e-alice', 'bob': 'e-bob'},
+                'groups': {},
+                'entity_aliases': {('alice@corp', 'auth_oidc'): {'id': 'a-alice', 'canonical_id': 'e-alice'}},
+                'entity_details': {'alice': {'policies': ['a', 'b'], 'metadata': {}, 'disabled': False}},
+                'group_details': {},
+            },
+            second=state,
+        )
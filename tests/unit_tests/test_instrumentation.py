@@ -0,0 +1,163 @@
+import logging
+import threading
+from unittest import TestCase
+
+import mock
+import requests
+import requests_mock
+from parameterized import parameterized, param
+from six.moves import BaseHTTPServer
+
+from hvac import adapters
+from hvac.instrumentation import (
+    HistogramSink, InstrumentationMiddleware, LoggingSink, PathTemplater, PrometheusSink, RequestSample,
+)
+
+
+class OkHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"data": {}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPathTemplater(TestCase):
+
+    @parameterized.expand([
+        param('kv v2 data', path='/v1/secret/data/my/app', expected='/v1/{mount}/data/{path}'),
+        param('transit encrypt', path='v1/transit/encrypt/my-key', expected='/v1/{mount}/encrypt/{path}'),
+        param('transit keys', path='v1/transit/keys', expected='/v1/{mount}/keys'),
+        param('pki issue', path='v1/pki/issue/web', expected='/v1/{mount}/issue/{path}'),
+        param('kv v1 secret', path='v1/secret/my-app/db', expected='/v1/{mount}/{path}'),
+        param('kv v1 top level secret', path='v1/secret/my-app', expected='/v1/{mount}/{path}'),
+        param('mount root', path='v1/secret', expected='/v1/{mount}'),
+        param('sys static', path='v1/sys/health?standbyok=true', expected='/v1/sys/health'),
+        param('sys leases', path='v1/sys/leases/revoke-prefix/aws/creds', expected='/v1/sys/leases/revoke-prefix'),
+        param('sys policy', path='v1/sys/policies/acl/admins', expected='/v1/sys/policies/acl/{name}'),
+        param('identity entity', path='v1/identity/entity/id/1234', expected='/v1/identity/entity/id/{id}'),
+        param('token create role', path='v1/auth/token/create/my-role', expected='/v1/auth/token/create'),
+        param('auth login', path='v1/auth/my/ldap/login/alice', expected='/v1/auth/{mount}/login'),
+        param('auth role', path='v1/auth/approle/role/my-role', expected='/v1/auth/{mount}/role/{name}'),
+        param('unknown', path='healthz', expected='/healthz'),
+    ])
+    def test_template(self, label, path, expected):
+        self.assertEqual(first=expected, second=PathTemplater()(path))
+
+    def test_custom_templates(self):
+        templater = PathTemplater(templates=[(r'^v1/kv/data/teams/([^/]+)/.+$', r'/v1/kv/data/teams/\1/{path}')])
+        self.assertEqual(
+            first='/v1/kv/data/teams/platform/{path}',
+            second=templater('v1/kv/data/teams/platform/db/password'),
+        )
+
+
+class TestInstrumentationMiddleware(TestCase):
+
+    @requests_mock.Mocker()
+    def test_records_samples(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='POST',
+            url='{}/v1/transit/encrypt/my-key'.format(adapters.DEFAULT_BASE_URI),
+            json={'data': {'ciphertext': 'vault:v1:abc'}},
+        )
+        requests_mocker.register_uri(
+            method='GET',
+            url='{}/v1/secret/data/foo'.format(adapters.DEFAULT_BASE_URI),
+            exc=requests.exceptions.ConnectTimeout,
+        )
+        samples = []
+        sink = HistogramSink()
+        adapter = adapters.JSONAdapter(middleware=[InstrumentationMiddleware([sink, LoggingSink(samples.append)])])
+        adapter.post('/v1/transit/encrypt/my-key', json={'plaintext': 'aGk='})
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            adapter.get('/v1/secret/data/foo')
+
+        self.assertEqual(first=2, second=len(samples))
+        self.assertEqual(first=('POST', '/v1/{mount}/encrypt/{path}', 200), second=samples[0][:3])
+        self.assertEqual(first=len(b'{"plaintext": "aGk="}'), second=samples[0].request_bytes)
+        self.assertEqual(first=len(b'{"data": {"ciphertext": "vault:v1:abc"}}'), second=samples[0].response_bytes)
+        self.assertEqual(first=('GET', '/v1/{mount}/data/{path}', 'ConnectTimeout'), second=samples[1][:3])
+
+        snapshot = sink.snapshot()
+        self.assertEqual(
+            first={('POST', '/v1/{mount}/encrypt/{path}', '200'), ('GET', '/v1/{mount}/data/{path}', 'ConnectTimeout')},
+            second=set(snapshot),
+        )
+        series = snapshot[('POST', '/v1/{mount}/encrypt/{path}', '200')]
+        self.assertEqual(first=1, second=series['total_time']['count'])
+        self.assertEqual(first=0, second=series['connect_time']['count'])
+
+    def test_connect_time(self):
+        server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), OkHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        samples = []
+        adapter = adapters.JSONAdapter(
+            base_uri='http://127.0.0.1:{port}'.format(port=server.server_address[1]),
+            middleware=[InstrumentationMiddleware([LoggingSink(samples.append)])],
+        )
+        adapter.get('/v1/sys/health')
+        adapter.get('/v1/sys/health')
+        adapter.close()
+
+        self.assertIsNotNone(samples[0].connect_time)
+        self.assertIsNone(samples[1].connect_time, 'expected the pooled connection to be reused')
+        self.assertGreaterEqual(samples[0].total_time, samples[0].ttfb)
+
+
+class TestSinks(TestCase):
+    sample = RequestSample(
+        method='GET',
+        path='/v1/{mount}/data/{path}',
+        status=200,
+        connect_time=None,
+        ttfb=0.02,
+        total_time=0.03,
+        request_bytes=0,
+        response_bytes=512,
+    )
+
+    def test_histogram(self):
+        sink = HistogramSink(buckets=(0.01, 0.05))
+        sink.record(self.sample)
+        sink.record(self.sample._replace(total_time=0.1))
+        series = sink.snapshot()[('GET', '/v1/{mount}/data/{path}', '200')]
+        self.assertEqual(first=[(0.01, 0), (0.05, 1)], second=series['total_time']['buckets'])
+        self.assertEqual(first=2, second=series['total_time']['count'])
+        self.assertEqual(first=1024, second=series['response_bytes'])
+        sink.reset()
+        self.assertEqual(first={}, second=sink.snapshot())
+
+    def test_prometheus(self):
+        sink = PrometheusSink(buckets=(0.05,))
+        sink.record(self.sample)
+        rendered = sink.render()
+        labels = 'method="GET",path="/v1/{mount}/data/{path}",status="200"'
+        for line in [
+            '# TYPE hvac_request_duration_seconds histogram',
+            'hvac_request_duration_seconds_bucket{%s,le="0.05"} 1' % labels,
+            'hvac_request_duration_seconds_bucket{%s,le="+Inf"} 1' % labels,
+            'hvac_request_duration_seconds_count{%s} 1' % labels,
+            'hvac_request_connect_seconds_count{%s} 0' % labels,
+            'hvac_response_bytes_total{%s} 512' % labels,
+        ]:
+            self.assertIn(line, rendered.splitlines())
+
+    def test_logging(self):
+        mock_logger = mock.Mock(spec=logging.Logger)
+        LoggingSink(logger=mock_logger, level=logging.INFO).record(self.sample)
+        args = mock_logger.log.call_args[0]
+        self.assertEqual(first=logging.INFO, second=args[0])
+        self.assertIn('GET /v1/{mount}/data/{path} 200 total=0.030000s', args[1] % args[2:])
@@ -0,0 +1,75 @@
+import subprocess
+import sys
+from unittest import TestCase, skipIf
+
+import requests_mock
+from parameterized import parameterized, param
+
+from hvac import adapters, exceptions
+from hvac.json_codec import (
+    JSONCodec, OrjsonCodec, StdlibJSONCodec, UjsonCodec, get_codec, has_orjson, has_ujson,
+)
+
+AVAILABLE_CODECS = [param(name) for name, available in [('json', True), ('orjson', has_orjson), ('ujson', has_ujson)]
+                    if available]
+
+
+class TestJSONCodec(TestCase):
+
+    @parameterized.expand(AVAILABLE_CODECS)
+    def test_round_trip(self, name):
+        codec = get_codec(name)
+        document = {'data': {'keys': ['a', 'b'], 'ttl': 3600, 'renewable': True, 'unicode': u'é', 'none': None}}
+        encoded = codec.dumps(document)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(first=document, second=codec.loads(encoded))
+        self.assertEqual(first=document, second=StdlibJSONCodec().loads(encoded))
+
+    @parameterized.expand(AVAILABLE_CODECS)
+    def test_invalid_document(self, name):
+        with self.assertRaises(ValueError):
+            get_codec(name).loads(b'<html>Bad Gateway</html>')
+
+    def test_get_codec(self):
+        self.assertIsInstance(get_codec(), StdlibJSONCodec)
+        codec = StdlibJSONCodec()
+        self.assertIs(codec, get_codec(codec))
+        self.assertIsInstance(get_codec('auto'), JSONCodec)
+        with self.assertRaises(exceptions.ParamValidationError):
+            get_codec('yaml')
+
+    def test_codec_packages_imported_on_use(self):
+        script = (
+            'import sys, hvac.adapters\n'
+            'assert "orjson" not in sys.modules\n'
+            'assert "ujson" not in sys.modules\n'
+            'hvac.adapters.JSONAdapter()\n'
+            'assert "orjson" not in sys.modules\n'
+        )
+        subprocess.check_call([sys.executable, '-c', script])
+
+    @skipIf(has_orjson, 'orjson is installed')
+    def test_missing_orjson(self):
+        with self.assertRaises(ImportError):
+            OrjsonCodec()
+
+    @skipIf(has_ujson, 'ujson is installed')
+    def test_missing_ujson(self):
+        with self.assertRaises(ImportError):
+            UjsonCodec()
+
+    @parameterized.expand(AVAILABLE_CODECS)
+    def test_adapter(self, name):
+        with requests_mock.mock() as requests_mocker:
+            requests_mocker.register_uri(
+                method='POST',
+                url='{}/v1/transit/encrypt/my-key'.format(adapters.DEFAULT_BASE_URI),
+                json={'data': {'ciphertext': 'vault:v1:abc'}},
+            )
+            adapter = adapters.JSONAdapter(json_codec=name)
+            response = adapter.post('/v1/transit/encrypt/my-key', json={'plaintext': 'aGk='})
+
+        self.assertEqual(first={'data': {'ciphertext': 'vault:v1:abc'}}, second=response)
+        last_request = requests_mocker.last_request
+        self.assertEqual(first='application/json', second=last_request.headers['Content-Type'])
+        self.assertEqual(first={'plaintext': 'aGk='}, second=last_request.json())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+from unittest import TestCase
+
+from mock import MagicMock
+from parameterized import parameterized, param
+
+from hvac import exceptions
+from hvac.lifecycle import LeaseManager, TokenLifecycleManager
+
+
+class TestTokenLifecycleManager(TestCase):
+
+    def setUp(self):
+        self.mock_client = MagicMock()
+        self.mock_client.token = 's.token'
+        self.mock_client.lookup_token.return_value = {'data': {'ttl': 3600, 'renewable': True}}
+        self.mock_login = MagicMock(return_value={'auth': {'lease_duration': 3600, 'renewable': True}})
+
+    def test_start_looks_up_ttl(self):
+        manager = TokenLifecycleManager(client=self.mock_client, login=self.mock_login)
+        with manager:
+            self.assertEqual(first=3600, second=manager.ttl)
+            self.assertTrue(manager.renewable)
+        self.mock_login.assert_not_called()
+
+    def test_start_logs_in_without_token(self):
+        self.mock_client.token = None
+        manager = TokenLifecycleManager(client=self.mock_client, login=self.mock_login)
+        with manager:
+            self.mock_login.assert_called_once_with(self.mock_client)
+        self.mock_client.lookup_token.assert_not_called()
+
+    def test_refresh_renews(self):
+        self.mock_client.renew_self_token.return_value = {'auth': {'lease_duration': 3600, 'renewable': True}}
+        manager = TokenLifecycleManager(client=self.mock_client, login=self.mock_login, increment='1h')
+        manager._lookup()
+        manager.refresh()
+
+        self.mock_client.renew_self_token.assert_called_once_with(increment='1h')
+        self.mock_login.assert_not_called()
+        self.assertTrue(manager.renewable)
+
+    def test_refresh_logs_in_when_renewal_capped(self):
+        self.mock_client.renew_self_token.return_value = {'auth': {'lease_duration': 600, 'renewable': True}}
+        manager = TokenLifecycleManager(client=self.mock_client, login=self.mock_login)
+        manager._lookup()
+        manager.refresh()
+        self.assertFalse(manager.renewable)
+        self.assertEqual(first=600, second=manager.ttl)
+
+        manager.refresh()
+        self.mock_login.assert_called_once_with(self.mock_client)
+        self.assertEqual(first=3600, second=manager.ttl)
+
+    @parameterized.expand([
+        param('increment in seconds', 3600),
+        param('increment as a duration', '1h'),
+        param('increment as a compound duration', '30m1800s'),
+    ])
+    def test_refresh_with_increment_below_current_ttl(self, label, increment):
+        self.mock_client.lookup_token.return_value = {'data': {'ttl': 86400, 'renewable': True}}
+        self.mock_client.renew_self_token.return_value = {'auth': {'lease_duration': 3600, 'renewable': True}}
+        manager = TokenLifecycleManager(client=self.mock_client, login=self.mock_login, increment=increment)
+        manager._lookup()
+        manager.refresh()
+        self.assertTrue(manager.renewable)
+
+        manager.refresh()
+        self.assertEqual(first=2, second=self.mock_client.renew_self_token.call_count)
+        self.mock_login.assert_not_called()
+
+    def test_refresh_logs_in_when_renewal_capped_below_increment(self):
+        self.mock_client.renew_self_token.return_value = {'auth': {'lease_duration': 600, 'renewable': True}}
+        manager = TokenLifecycleManager(client=self.mock_client, login=self.mock_login, increment='1h')
+        manager._lookup()
+        manager.refresh()
+        self.assertFalse(manager.renewable)
+
+    def test_refresh_logs_in_when_renewal_fails(self):
+        self.mock_client.renew_self_token.side_effect = exceptions.Forbidden('permission denied')
+        manager = TokenLifecycleManager(client=self.mock_client, login=self.mock_login)
+        manager._lookup()
+        manager.refresh()
+
+        self.mock_login.assert_called_once_with(self.mock_client)
+
+    def test_refresh_without_login_raises(self):
+        self.mock_client.lookup_token.return_value = {'data': {'ttl': 3600, 'renewable': False}}
+        manager = TokenLifecycleManager(client=self.mock_client)
+        manager._lookup()
+        with self.assertRaises(exceptions.Unauthorized):
+            manager.refresh()
+
+    def test_background_renewal(self):
+        renewed = threading.Event()
+        self.mock_client.lookup_token.return_value = {'data': {'ttl': 0.03, 'renewable': True}}
+
+        def renew_self_token(increment):
+            renewed.set()
+            return {'auth': {'lease_duration': 3600, 'renewable': True}}
+
+        self.mock_client.renew_self_token.side_effect = renew_self_token
+        with TokenLifecycleManager(client=self.mock_client, login=self.mock_login):
+            self.assertTrue(renewed.wait(timeout=5))
+
+    def test_invalid_renew_fraction(self):
+        with self.assertRaises(exceptions.ParamValidationError):
+            TokenLifecycleManager(client=self.mock_client, renew_fraction=1.5)
+
+
+class TestLeaseManager(TestCase):
+
+    def setUp(self):
+        self.mock_client = MagicMock()
+        self.failures = []
+        self.failed = threading.Event()
+
+    def on_failure(self, lease_id, error):
+        self.failures.append((lease_id, error))
+        self.failed.set()
+
+    def test_register(self):
+        manager = LeaseManager(client=self.mock_client)
+        lease_id = manager.register({'lease_id': 'database/creds/hvac/1', 'lease_duration': 3600, 'renewable': True})
+
+        self.assertEqual(first='database/creds/hvac/1', second=lease_id)
+        self.assertIn(lease_id, manager)
+        with self.assertRaises(exceptions.ParamValidationError):
+            manager.register({'data': {}})
+
+    def test_batched_renewal(self):
+        renewed = []
+        all_renewed = threading.Event()
+
+        def renew_lease(lease_id, increment):
+            renewed.append(lease_id)
+            if len(renewed) == 3:
+                all_renewed.set()
+            return {'lease_id': lease_id, 'lease_duration': 3600, 'renewable': True}
+
+        self.mock_client.sys.renew_lease.side_effect = renew_lease
+        with LeaseManager(client=self.mock_client, batch_window=0.5) as manager:
+            for num, lease_duration in enumerate([0.03, 0.06, 0.09]):
+                manager.register({'lease_id': 'lease/%d' % num, 'lease_duration': lease_duration, 'renewable': True})
+            manager.register({'lease_id': 'lease/later', 'lease_duration': 3600, 'renewable': True})
+            self.assertTrue(all_renewed.wait(timeout=5))
+
+        self.assertEqual(first={'lease/0', 'lease/1', 'lease/2'}, second=set(renewed))
+        self.assertEqual(first=4, second=len(manager))
+
+    def test_non_renewable_lease_fires_callback(self):
+        with LeaseManager(client=self.mock_client, batch_window=0, on_failure=self.on_failure) as manager:
+            manager.register({'lease_id': 'lease/0', 'lease_duration': 0.03, 'renewable': False})
+            self.assertTrue(self.failed.wait(timeout=5))
+
+        self.assertEqual(first=[('lease/0', None)], second=self.failures)
+        self.assertEqual(first=0, second=len(manager))
+        self.mock_client.sys.renew_lease.assert_not_called()
+
+    def test_failed_renewal_fires_callback(self):
+        error = exceptions.InvalidRequest('lease not found')
+        self.mock_client.sys.renew_lease.side_effect = error
+        with LeaseManager(client=self.mock_client, batch_window=0, on_failure=self.on_failure) as manager:
+            manager.register({'lease_id': 'lease/0', 'lease_duration': 0.03, 'renewable': True})
+            self.assertTrue(self.failed.wait(timeout=5))
+
+        self.assertEqual(first=[('lease/0', error)], second=self.failures)
+
+    def test_renewal_with_increment_below_original_ttl(self):
+        renewed = threading.Event()
+
+        def renew_lease(lease_id, increment):
+            if self.mock_client.sys.renew_lease.call_count >= 2:
+                renewed.set()
+            return {'lease_id': lease_id, 'lease_duration': increment, 'renewable': True}
+
+        self.mock_client.sys.renew_lease.side_effect = renew_lease
+        with LeaseManager(client=self.mock_client, increment=0.05, batch_window=0, on_failure=self.on_failure) as manager:
+            manager.register({'lease_id': 'lease/0', 'lease_duration': 0.2, 'renewable': True})
+            self.assertTrue(renewed.wait(timeout=5))
+            self.assertIn('lease/0', manager)
+
+        self.assertEqual(first=[], second=self.failures)
+
+    def test_renewal_capped_at_max_ttl_fires_callback(self):
+        self.mock_client.sys.renew_lease.return_value = {'lease_id': 'lease/0', 'lease_duration': 0.02, 'renewable': True}
+        with LeaseManager(client=self.mock_client, increment=3600, batch_window=0, on_failure=self.on_failure) as manager:
+            manager.register({'lease_id': 'lease/0', 'lease_duration': 0.03, 'renewable': True})
+            self.assertTrue(self.failed.wait(timeout=5))
+
+        self.assertEqual(first=[('lease/0', None)], second=self.failures)
+        self.assertEqual(first=1, second=self.mock_client.sys.renew_lease.call_count)
+
+    def test_revoke_all(self):
+        manager = LeaseManager(client=self.mock_client)
+        for num in range(3):
+            manager.register({'lease_id': 'lease/%d' % num, 'lease_duration': 3600, 'renewable': True})
+        manager.revoke_all()
+
+        self.assertEqual(first=3, second=self.mock_client.sys.revoke_lease.call_count)
+        self.assertEqual(first=0, second=len(manager))
@@ -0,0 +1,94 @@
+from unittest import TestCase
+
+import requests
+import requests_mock
+
+from hvac import adapters, exceptions
+from hvac.middleware import Middleware
+
+MOCK_URL = '{}/v1/secret/foo'.format(adapters.DEFAULT_BASE_URI)
+
+
+class RecordingMiddleware(Middleware):
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def before_request(self, request):
+        self.calls.append('before {}'.format(self.name))
+
+    def after_response(self, request, response):
+        self.calls.append('after {}'.format(self.name))
+        return response
+
+
+class HeaderMiddleware(Middleware):
+
+    def before_request(self, request):
+        request.headers['X-Request-Id'] = 'abc123'
+
+
+class ShortCircuitMiddleware(Middleware):
+
+    def before_request(self, request):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"data": {"cached": true}}'
+        return response
+
+
+class RecoveringMiddleware(Middleware):
+
+    def on_error(self, request, error):
+        response = requests.Response()
+        response.status_code = 204
+        return response
+
+
+class TestMiddleware(TestCase):
+
+    @requests_mock.Mocker()
+    def test_order(self, requests_mocker):
+        requests_mocker.register_uri(method='GET', url=MOCK_URL, json={'data': {}})
+        calls = []
+        adapter = adapters.JSONAdapter(middleware=[RecordingMiddleware('outer', calls)])
+        adapter.add_middleware(RecordingMiddleware('inner', calls))
+        self.assertEqual(first={'data': {}}, second=adapter.get('/v1/secret/foo'))
+        self.assertEqual(
+            first=['before outer', 'before inner', 'after inner', 'after outer'],
+            second=calls,
+        )
+
+    @requests_mock.Mocker()
+    def test_modify_request(self, requests_mocker):
+        requests_mocker.register_uri(method='GET', url=MOCK_URL, json={'data': {}})
+        adapter = adapters.JSONAdapter(token='s.token', middleware=[HeaderMiddleware()])
+        adapter.get('//v1/secret//foo')
+        self.assertEqual(first='abc123', second=requests_mocker.last_request.headers['X-Request-Id'])
+        self.assertEqual(first='s.token', second=requests_mocker.last_request.headers['X-Vault-Token'])
+
+    @requests_mock.Mocker()
+    def test_short_circuit(self, requests_mocker):
+        adapter = adapters.JSONAdapter(middleware=[ShortCircuitMiddleware()])
+        self.assertEqual(first={'data': {'cached': True}}, second=adapter.get('/v1/secret/foo'))
+        self.assertFalse(requests_mocker.called)
+
+    @requests_mock.Mocker()
+    def test_on_error(self, requests_mocker):
+        requests_mocker.register_uri(method='POST', url=MOCK_URL, exc=requests.exceptions.ConnectionError)
+        adapter = adapters.RawAdapter(middleware=[RecoveringMiddleware()])
+        self.assertEqual(first=204, second=adapter.post('/v1/secret/foo').status_code)
+
+        adapter = adapters.RawAdapter(middleware=[Middleware()])
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            adapter.post('/v1/secret/foo')
+
+    @requests_mock.Mocker()
+    def test_error_status_raised_after_middleware(self, requests_mocker):
+        requests_mocker.register_uri(method='GET', url=MOCK_URL, status_code=404, json={'errors': []})
+        calls = []
+        adapter = adapters.JSONAdapter(middleware=[RecordingMiddleware('only', calls)])
+        with self.assertRaises(exceptions.InvalidPath):
+            adapter.get('/v1/secret/foo')
+        self.assertEqual(first=['before only', 'after only'], second=calls)
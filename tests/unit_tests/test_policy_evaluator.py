@@ -0,0 +1,129 @@
+from unittest import TestCase
+
+import requests_mock
+from parameterized import parameterized, param
+
+from hvac import Client, exceptions
+from hvac.policy_evaluator import PathRule, PolicyEvaluator
+
+APP_POLICY = '''
+path "secret/data/*" {
+  capabilities = ["read", "list"]
+}
+
+path "secret/data/app/*" {
+  capabilities = ["create", "read", "update", "delete", "list"]
+}
+
+path "secret/data/app/admin" {
+  capabilities = ["deny"]
+}
+
+path "secret/data/+/config" {
+  capabilities = ["read"]
+}
+
+path "secret/data/+/+/config" {
+  capabilities = ["update"]
+}
+
+path "auth/token/lookup-self" {
+  capabilities = ["read"]
+}
+'''
+
+OPS_POLICY = '''
+path "secret/data/*" {
+  capabilities = ["update"]
+}
+
+path "sys/mounts" {
+  policy = "sudo"
+}
+
+path "secret/data/app/admin" {
+  capabilities = ["read"]
+}
+'''
+
+
+class TestPolicyEvaluator(TestCase):
+
+    def setUp(self):
+        self.evaluator = PolicyEvaluator(policies={
+            'app': APP_POLICY,
+            'ops': OPS_POLICY,
+            'json': {'path': {'kv/*': {'capabilities': ['list']}}},
+        })
+
+    @parameterized.expand([
+        param('exact', 'auth/token/lookup-self', ['app'], ['read']),
+        param('glob', 'secret/data/other', ['app'], ['list', 'read']),
+        param('longest glob', 'secret/data/app/db', ['app'], ['create', 'delete', 'list', 'read', 'update']),
+        param('exact over glob', 'secret/data/app/admin', ['app'], ['deny']),
+        param('segment wildcard', 'secret/data/web/config', ['app'], ['read']),
+        param('later wildcard wins', 'secret/data/app/config', ['app'], ['create', 'delete', 'list', 'read', 'update']),
+        param('segment wildcard over glob', 'secret/data/web/prod/config', ['app'], ['update']),
+        param('no match', 'sys/mounts', ['app'], ['deny']),
+        param('glob does not match parent', 'secret/data', ['app'], ['deny']),
+        param('merged policies', 'secret/data/other', ['app', 'ops'], ['list', 'read', 'update']),
+        param('deny wins when merged', 'secret/data/app/admin', ['app', 'ops'], ['deny']),
+        param('legacy policy', 'sys/mounts', ['ops'], ['create', 'delete', 'list', 'read', 'sudo', 'update']),
+        param('json policy', '/kv/foo', ['json'], ['list']),
+        param('unknown policy', 'kv/foo', ['missing'], ['deny']),
+        param('root', 'anything', ['root'], ['root']),
+    ])
+    def test_get_capabilities(self, label, path, policies, expected):
+        self.assertEqual(
+            first=expected,
+            second=self.evaluator.get_capabilities(path, policies),
+        )
+
+    def test_has_capability(self):
+        self.assertTrue(self.evaluator.has_capability('secret/data/app/db', 'update', ['app']))
+        self.assertFalse(self.evaluator.has_capability('secret/data/other', 'update', ['app']))
+        self.assertFalse(self.evaluator.has_capability('secret/data/app/admin', 'read', ['app', 'ops']))
+        self.assertTrue(self.evaluator.has_capability('sys/anything', 'sudo', ['root']))
+
+    def test_get_matching_rule(self):
+        self.assertEqual(
+            first='secret/data/+/config',
+            second=self.evaluator.get_matching_rule('secret/data/web/config', ['app']).pattern,
+        )
+        self.assertIsNone(self.evaluator.get_matching_rule('sys/mounts', ['app']))
+
+    def test_priority(self):
+        patterns = ['secret/*', 'secret/+/config', 'secret/a*', 'secret/+/+', 'secret/+/c*']
+        self.assertEqual(
+            first=['secret/+/c*', 'secret/*', 'secret/+/+', 'secret/+/config', 'secret/a*'],
+            second=sorted(patterns, key=PathRule.get_priority),
+        )
+
+    def test_policy_changes_recompile(self):
+        self.assertEqual(first=['deny'], second=self.evaluator.get_capabilities('kv/foo', ['app']))
+        self.evaluator.add_policy('app', 'path "kv/*" { capabilities = ["read"] }')
+        self.assertEqual(first=['read'], second=self.evaluator.get_capabilities('kv/foo', ['app']))
+        self.evaluator.remove_policy('app')
+        self.assertEqual(first=['deny'], second=self.evaluator.get_capabilities('kv/foo', ['app']))
+        self.assertEqual(first=['json', 'ops'], second=self.evaluator.policy_names)
+
+    def test_unsupported_legacy_policy(self):
+        with self.assertRaises(exceptions.ParamValidationError):
+            self.evaluator.add_policy('bad', 'path "kv/*" { policy = "admin" }')
+
+    @requests_mock.Mocker()
+    def test_load_policies(self, requests_mocker):
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/sys/policy',
+            json={'data': {'policies': ['app', 'root']}},
+        )
+        requests_mocker.register_uri(
+            method='GET',
+            url='http://localhost:8200/v1/sys/policy/app',
+            json={'data': {'name': 'app', 'rules': APP_POLICY}},
+        )
+        evaluator = PolicyEvaluator()
+        evaluator.load_policies(Client(url='http://localhost:8200'))
+        self.assertEqual(first=['app'], second=evaluator.policy_names)
+        self.assertEqual(first=['read'], second=evaluator.get_capabilities('auth/token/lookup-self', ['app']))
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+import mock
+import requests
+from parameterized import parameterized, param
+
+from hvac.retry import RetryPolicy
+
+
+class TestRetryPolicy(TestCase):
+
+    @parameterized.expand([
+        param('safe method', method='get', idempotent=False, expected=True),
+        param('list', method='LIST', idempotent=False, expected=True),
+        param('write', method='POST', idempotent=False, expected=False),
+        param('idempotent write', method='PUT', idempotent=True, expected=True),
+    ])
+    def test_allows(self, label, method, idempotent, expected):
+        self.assertEqual(
+            first=expected,
+            second=RetryPolicy().allows(method, idempotent=idempotent),
+        )
+
+    @parameterized.expand([
+        param('seconds', value='3', expected=3),
+        param('negative seconds', value='-1', expected=0),
+        param('missing', value=None, expected=None),
+        param('invalid', value='soon', expected=None),
+        param('past http date', value='Wed, 21 Oct 2015 07:28:00 GMT', expected=0),
+    ])
+    def test_parse_retry_after(self, label, value, expected):
+        self.assertEqual(
+            first=expected,
+            second=RetryPolicy.parse_retry_after(value),
+        )
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(max_attempts=10, backoff_factor=1, max_backoff=5)
+        response = mock.Mock(status_code=503, headers={})
+        with mock.patch('hvac.retry.random.uniform', side_effect=lambda low, high: high) as mock_uniform:
+            delays = [policy.get_retry_delay(attempt, started_at=0, response=response) for attempt in range(1, 5)]
+        self.assertEqual(first=[2, 4, 5, 5], second=delays)
+        self.assertTrue(all(call[0][0] == 0 for call in mock_uniform.call_args_list))
+
+    @parameterized.expand([
+        param('non-retryable status', attempt=1, status_code=400, error=None, expected=None),
+        param('attempts exhausted', attempt=3, status_code=503, error=None, expected=None),
+        param('connection error', attempt=1, status_code=None, error=requests.exceptions.ConnectionError(), expected=0.2),
+        param('other error', attempt=1, status_code=None, error=ValueError(), expected=None),
+    ])
+    def test_get_retry_delay(self, label, attempt, status_code, error, expected):
+        policy = RetryPolicy(max_attempts=3)
+        response = None if status_code is None else mock.Mock(status_code=status_code, headers={})
+        with mock.patch('hvac.retry.random.uniform', side_effect=lambda low, high: high):
+            delay = policy.get_retry_delay(attempt, started_at=0, response=response, error=error)
+        self.assertEqual(first=expected, second=delay)
+
+    def test_retry_after_beyond_budget(self):
+        policy = RetryPolicy(budget=5)
+        response = mock.Mock(status_code=429, headers={'Retry-After': '30'})
+        with mock.patch('hvac.retry.time.time', return_value=100):
+            self.assertIsNone(policy.get_retry_delay(1, started_at=99, response=response))
+            response.headers['Retry-After'] = '1'
+            self.assertEqual(first=1, second=policy.get_retry_delay(1, started_at=99, response=response))
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import io
+from base64 import b64encode
+from unittest import TestCase, skipIf
+
+from mock import MagicMock
+from parameterized import parameterized, param
+
+from hvac import exceptions
+from hvac.transit_utils import EnvelopeEncryptor, TransitBatcher, decrypt_stream, encrypt_stream, has_cryptography
+
+
+def mock_encrypt_data(name, plaintext, batch_input, mount_point, key_version=None):
+    batch_results = []
+    for item in batch_input:
+        if item['plaintext'] == 'bad':
+            batch_results.append({'error': 'invalid plaintext'})
+        else:
+            batch_results.append({'ciphertext': 'vault:v1:{plaintext}'.format(**item)})
+    return {'data': {'batch_results': batch_results}}
+
+
+class TestTransitBatcher(TestCase):
+
+    def setUp(self):
+        self.mock_transit = MagicMock()
+        self.mock_transit.encrypt_data.side_effect = mock_encrypt_data
+
+    def test_full_batch_sent_immediately(self):
+        with TransitBatcher(transit=self.mock_transit, max_batch_size=3, max_delay=60) as batcher:
+            futures = [batcher.encrypt(name='hvac', plaintext=str(i)) for i in range(3)]
+            results = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(first=['vault:v1:0', 'vault:v1:1', 'vault:v1:2'], second=results)
+        self.assertEqual(first=1, second=self.mock_transit.encrypt_data.call_count)
+
+    def test_partial_batch_sent_after_delay(self):
+        with TransitBatcher(transit=self.mock_transit, max_batch_size=100, max_delay=0.01) as batcher:
+            futures = [
+                batcher.encrypt(name='hvac', plaintext='a', context='Y3R4'),
+                batcher.encrypt(name='hvac', plaintext='b'),
+                batcher.encrypt(name='other', plaintext='c'),
+            ]
+            results = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(first=['vault:v1:a', 'vault:v1:b', 'vault:v1:c'], second=results)
+        self.assertEqual(first=2, second=self.mock_transit.encrypt_data.call_count)
+        first_call_kwargs = self.mock_transit.encrypt_data.call_args_list[0][1]
+        self.assertEqual(
+            first=[{'plaintext': 'a', 'context': 'Y3R4'}, {'plaintext': 'b'}],
+            second=first_call_kwargs['batch_input'],
+        )
+
+    def test_errors(self):
+        self.mock_transit.decrypt_data.side_effect = exceptions.Forbidden('permission denied')
+        with TransitBatcher(transit=self.mock_transit, max_delay=60) as batcher:
+            good = batcher.encrypt(name='hvac', plaintext='good')
+            bad = batcher.encrypt(name='hvac', plaintext='bad')
+            denied = batcher.decrypt(name='hvac', ciphertext='vault:v1:abc')
+            batcher.flush()
+
+            self.assertEqual(first='vault:v1:good', second=good.result(timeout=5))
+            with self.assertRaises(exceptions.InvalidRequest):
+                bad.result(timeout=5)
+            with self.assertRaises(exceptions.Forbidden):
+                denied.result(timeout=5)
+
+        with self.assertRaises(RuntimeError):
+            batcher.encrypt(name='hvac', plaintext='closed')
+
+
+def mock_decrypt_data(name, ciphertext, batch_input, mount_point):
+    batch_results = []
+    for item in batch_input:
+        if item['ciphertext'].startswith('vault:v1:'):
+            batch_results.append({'plaintext': item['ciphertext'][len('vault:v1:'):]})
+        else:
+            batch_results.append({'error': 'invalid ciphertext'})
+    return {'data': {'batch_results': batch_results}}
+
+
+class TestStreams(TestCase):
+
+    def setUp(self):
+        self.mock_transit = MagicMock()
+        self.mock_transit.encrypt_data.side_effect = mock_encrypt_data
+        self.mock_transit.decrypt_data.side_effect = mock_decrypt_data
+
+    @parameterized.expand([
+        param('file-like source', io.BytesIO(b'0123456789' * 10)),
+        param('iterator source', iter([b'0123456789'] * 10)),
+    ])
+    def test_round_trip(self, label, source):
+        encrypted = io.BytesIO()
+        records = encrypt_stream(
+            transit=self.mock_transit,
+            name='hvac',
+            source=source,
+            destination=encrypted,
+            chunk_size=7,
+            chunks_per_request=3,
+            max_in_flight=2,
+        )
+
+        self.assertEqual(first=15, second=records)
+        self.assertEqual(first=5, second=self.mock_transit.encrypt_data.call_count)
+        self.assertEqual(first=15, second=len(encrypted.getvalue().splitlines()))
+
+        encrypted.seek(0)
+        decrypted = io.BytesIO()
+        decrypt_stream(
+            transit=self.mock_transit,
+            name='hvac',
+            source=encrypted,
+            destination=decrypted,
+            chunks_per_request=4,
+        )
+        self.assertEqual(first=b'0123456789' * 10, second=decrypted.getvalue())
+
+    def encrypt_records(self, data, chunk_size=7):
+        encrypted = io.BytesIO()
+        encrypt_stream(transit=self.mock_transit, name='hvac', source=io.BytesIO(data), destination=encrypted,
+                       chunk_size=chunk_size)
+        return encrypted.getvalue().splitlines()
+
+    def test_empty_stream_round_trip(self):
+        records = self.encrypt_records(b'')
+        decrypted = io.BytesIO()
+        decrypt_stream(transit=self.mock_transit, name='hvac', source=records, destination=decrypted)
+
+        self.assertEqual(first=1, second=len(records))
+        self.assertEqual(first=b'', second=decrypted.getvalue())
+
+    @parameterized.expand([
+        param('truncated', lambda records, other: records[:-1]),
+        param('empty', lambda records, other: []),
+        param('record dropped', lambda records, other: records[:2] + records[3:]),
+        param('records reordered', lambda records, other: [records[1], records[0]] + records[2:]),
+        param('record duplicated', lambda records, other: records[:3] + records[2:]),
+        param('record appended', lambda records, other: records + records[-1:]),
+        param('record from another stream', lambda records, other: records[:2] + other[2:3] + records[3:]),
+    ])
+    def test_tampered_stream_raises(self, label, tamper):
+        records = self.encrypt_records(b'0123456789' * 10)
+        other_records = self.encrypt_records(b'0123456789' * 10)
+        with self.assertRaises(exceptions.ParamValidationError):
+            decrypt_stream(
+                transit=self.mock_transit,
+                name='hvac',
+                source=tamper(records, other_records),
+                destination=io.BytesIO(),
+            )
+
+    def test_item_error_raises(self):
+        with self.assertRaises(exceptions.InvalidRequest):
+            decrypt_stream(
+                transit=self.mock_transit,
+                name='hvac',
+                source=['vault:v1:dGVzdA==', 'not-a-ciphertext'],
+                destination=io.BytesIO(),
+            )
+
+
+@skipIf(not has_cryptography, 'cryptography not installed')
+class TestEnvelopeEncryptor(TestCase):
+
+    def setUp(self):
+        self.data_keys = {}
+        self.mock_transit = MagicMock()
+        self.mock_transit.generate_data_key.side_effect = self.mock_generate_data_key
+        self.mock_transit.decrypt_data.side_effect = self.mock_decrypt_data
+
+    def mock_generate_data_key(self, name, key_type, context, bits, mount_point):
+        wrapped_key = 'vault:v1:key{num}'.format(num=len(self.data_keys))
+        self.data_keys[wrapped_key] = b64encode(bytes(bytearray([len(self.data_keys)] * (bits // 8)))).decode()
+        return {'data': {'ciphertext': wrapped_key, 'plaintext': self.data_keys[wrapped_key]}}
+
+    def mock_decrypt_data(self, name, ciphertext, context, mount_point):
+        return {'data': {'plaintext': self.data_keys[ciphertext]}}
+
+    def test_round_trip(self):
+        encryptor = EnvelopeEncryptor(transit=self.mock_transit, name='hvac')
+        envelopes = [encryptor.encrypt(b'payload %d' % i, associated_data=b'aad') for i in range(10)]
+
+        self.assertTrue(envelopes[0].startswith('vault:v1:key0:'))
+        self.assertEqual(first=1, second=self.mock_transit.generate_data_key.call_count)
+        self.assertEqual(
+            first=[b'payload %d' % i for i in range(10)],
+            second=[encryptor.decrypt(envelope, associated_data=b'aad') for envelope in envelopes],
+        )
+        self.assertEqual(first=0, second=self.mock_transit.decrypt_data.call_count)
+
+        # A new instance (e.g. another process) must unwrap the data key via Vault, once.
+        other_encryptor = EnvelopeEncryptor(transit=self.mock_transit, name='hvac')
+        other_encryptor.decrypt(envelopes[0], associated_data=b'aad')
+        other_encryptor.decrypt(envelopes[1], associated_data=b'aad')
+        self.assertEqual(first=1, second=self.mock_transit.decrypt_data.call_count)
+
+    def test_data_key_rotation(self):
+        encryptor = EnvelopeEncryptor(transit=self.mock_transit, name='hvac', max_uses=2)
+        envelopes = [encryptor.encrypt(b'payload') for _ in range(5)]
+
+        self.assertEqual(first=3, second=self.mock_transit.generate_data_key.call_count)
+        self.assertEqual(
+            first=['vault:v1:key0', 'vault:v1:key0', 'vault:v1:key1', 'vault:v1:key1', 'vault:v1:key2'],
+            second=[envelope.rsplit(':', 1)[0] for envelope in envelopes],
+        )
+
+    def test_invalid_bits(self):
+        with self.assertRaises(exceptions.ParamValidationError):
+            EnvelopeEncryptor(transit=self.mock_transit, name='hvac', bits=512)